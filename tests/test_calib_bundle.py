@@ -0,0 +1,55 @@
+import gzip
+import os
+import shutil
+
+import numpy as np
+import pytest
+
+from xcalibu import Xcalibu, XCalibError
+from xcalibu.xcalibu import CalibBundle
+
+CALIB_FILES = ["hpz_ring_Ry.calib", "hpz_ring_Tz.calib", "poly.calib", "table.calib", "undu_table.calib"]
+
+
+def test_bundle_pack_load(demo_calib_path, tmp_path):
+    calib_files = [demo_calib_path(calib_file) for calib_file in CALIB_FILES]
+    bundle_file = str(tmp_path / "calibs.xcb")
+    bundle = CalibBundle.pack(bundle_file, calib_files)
+
+    assert len(bundle) == len(CALIB_FILES)
+    assert bundle.names() == ["HPZ_RING_RY", "HPZ_RING_TZ", "U42", "B52", "U32BC1G"]
+    assert "U42" in bundle
+
+    bundle = CalibBundle(bundle_file)
+    for calib_file, name in zip(calib_files, bundle.names()):
+        ref = Xcalibu(calib_file_name=calib_file, reconstruction_method="INTERPOLATION")
+        calib = bundle.load(name, reconstruction_method="INTERPOLATION")
+        assert calib.get_calib_name() == ref.get_calib_name()
+        np.testing.assert_array_equal(calib.x_raw, ref.x_raw)
+        np.testing.assert_array_equal(calib.y_raw, ref.y_raw)
+        assert calib.get_y(ref.min_x()) == ref.get_y(ref.min_x())
+
+    with pytest.raises(XCalibError):
+        bundle.read("NOT_IN_BUNDLE")
+    with pytest.raises(XCalibError):
+        CalibBundle(calib_files[0])
+
+
+def test_bundle_extract(demo_calib_path, tmp_path):
+    calib_files = [demo_calib_path(calib_file) for calib_file in CALIB_FILES]
+    # Compressed files are bundled decompressed.
+    compressed_file = str(tmp_path / "table.calib.gz")
+    with open(calib_files[3], "rb") as f_in, gzip.open(compressed_file, "wb") as f_out:
+        shutil.copyfileobj(f_in, f_out)
+    calib_files[3] = compressed_file
+
+    bundle = CalibBundle.pack(str(tmp_path / "calibs.xcb"), calib_files)
+    extracted = bundle.extract(str(tmp_path / "extracted"))
+    assert sorted(os.path.basename(file_name) for file_name in extracted) == sorted(CALIB_FILES)
+    for calib_file in CALIB_FILES:
+        with open(demo_calib_path(calib_file)) as f_ref, open(tmp_path / "extracted" / calib_file) as f:
+            assert f.read() == f_ref.read()
+
+    # Calibration names must be unique.
+    with pytest.raises(XCalibError):
+        CalibBundle.pack(str(tmp_path / "duplicates.xcb"), [demo_calib_path("table.calib"), compressed_file])
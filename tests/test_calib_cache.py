@@ -0,0 +1,115 @@
+import os
+import shutil
+
+import numpy as np
+
+from xcalibu import Xcalibu
+from xcalibu.xcalibu import CalibCache
+
+
+def test_cache_warm_load(demo_calib_path, tmp_path, monkeypatch):
+    calib_file = str(tmp_path / "undu_table.calib")
+    shutil.copy(demo_calib_path("undu_table.calib"), calib_file)
+    cache_dir = str(tmp_path / "cache")
+    monkeypatch.setattr(CalibCache, "MIN_FILE_SIZE", 0)
+
+    ref = Xcalibu(calib_file_name=calib_file, reconstruction_method="POLYFIT", fit_order=2)
+    cold = Xcalibu(calib_file_name=calib_file, reconstruction_method="POLYFIT", fit_order=2, cache_dir=cache_dir)
+    assert len(os.listdir(cache_dir)) == 1
+
+    # Warm load must not parse the file.
+    def _no_parsing(*args):
+        raise AssertionError("file parsed")
+
+    parse_table_block = Xcalibu._parse_table_block
+    monkeypatch.setattr(Xcalibu, "_parse_table_block", _no_parsing)
+    warm = Xcalibu(calib_file_name=calib_file, reconstruction_method="POLYFIT", fit_order=2, cache_dir=cache_dir)
+
+    for calib in (cold, warm):
+        np.testing.assert_array_equal(calib.x_raw, ref.x_raw)
+        np.testing.assert_array_equal(calib.y_raw, ref.y_raw)
+        assert calib.get_calib_name() == ref.get_calib_name()
+        assert calib._comments == ref._comments
+        assert calib.get_coeffs() == ref.get_coeffs()
+        assert (calib.Xmin, calib.Xmax, calib.Ymin, calib.Ymax) == (ref.Xmin, ref.Xmax, ref.Ymin, ref.Ymax)
+        assert calib.get_y(7.3) == ref.get_y(7.3)
+        assert calib.get_x(14.8) == ref.get_x(14.8)
+
+    # Other loading parameters: other entry.
+    monkeypatch.setattr(Xcalibu, "_parse_table_block", parse_table_block)
+    Xcalibu(calib_file_name=calib_file, reconstruction_method="INTERPOLATION", cache_dir=cache_dir)
+    assert len(os.listdir(cache_dir)) == 2
+
+
+def test_cache_invalidation(demo_calib_path, tmp_path, monkeypatch):
+    calib_file = str(tmp_path / "undu_table.calib")
+    shutil.copy(demo_calib_path("undu_table.calib"), calib_file)
+    cache = CalibCache(str(tmp_path / "cache"))
+    params = {"fit_order": 2}
+
+    assert cache.load(calib_file, params) is None
+    cache.store(calib_file, params, {"x_raw": np.arange(3.0)}, {"name": "U"})
+    arrays, metadata = cache.load(calib_file, params)
+    assert metadata == {"name": "U"}
+    np.testing.assert_array_equal(arrays["x_raw"], np.arange(3.0))
+
+    # touched: same content => still valid
+    os.utime(calib_file, ns=(0, 0))
+    assert cache.load(calib_file, params) is not None
+
+    # modified content => invalid
+    with open(calib_file, "a") as calib:
+        calib.write("U32BC1G[11.00]=19.5\n")
+    assert cache.load(calib_file, params) is None
+
+    monkeypatch.setattr(CalibCache, "MIN_FILE_SIZE", 0)
+    calib = Xcalibu(calib_file_name=calib_file, reconstruction_method="INTERPOLATION", cache_dir=cache.cache_dir)
+    assert calib.max_x() == 11.0
+
+
+def test_cache_file_changed_while_parsed(demo_calib_path, tmp_path, monkeypatch):
+    calib_file = str(tmp_path / "undu_table.calib")
+    shutil.copy(demo_calib_path("undu_table.calib"), calib_file)
+    cache_dir = str(tmp_path / "cache")
+    monkeypatch.setattr(CalibCache, "MIN_FILE_SIZE", 0)
+
+    # File rewritten between parsing and storing of the entry.
+    store_in_cache = Xcalibu._store_in_cache
+
+    def _store_after_change(self, *args):
+        with open(calib_file, "a") as calib:
+            calib.write("U32BC1G[11.00]=19.5\n")
+        store_in_cache(self, *args)
+
+    monkeypatch.setattr(Xcalibu, "_store_in_cache", _store_after_change)
+    calib = Xcalibu(calib_file_name=calib_file, reconstruction_method="INTERPOLATION", cache_dir=cache_dir)
+    assert calib.max_x() < 11.0
+    monkeypatch.setattr(Xcalibu, "_store_in_cache", store_in_cache)
+
+    # Entry of the previous content is not valid for the new content.
+    calib = Xcalibu(calib_file_name=calib_file, reconstruction_method="INTERPOLATION", cache_dir=cache_dir)
+    assert calib.max_x() == 11.0
+
+
+def test_cache_eviction(demo_calib_path, tmp_path):
+    cache = CalibCache(str(tmp_path / "cache"))
+    big = {"x_raw": np.zeros(10000)}
+
+    names = ["table.calib", "undu_table.calib", "hpz_ring_Ry.calib"]
+    for name in names:
+        cache.store(demo_calib_path(name), {}, big, {})
+        os.utime(cache.entry_path(demo_calib_path(name), {}), (1, 1))  # older than new entries
+    assert len(os.listdir(cache.cache_dir)) == 3
+
+    # Most recently used entry (table.calib) is kept.
+    kept = cache.entry_path(demo_calib_path("table.calib"), {})
+    os.utime(kept)
+    cache.max_size = os.path.getsize(kept)
+    cache.evict()
+    assert os.listdir(cache.cache_dir) == [os.path.basename(kept)]
+
+
+def test_cache_small_files(demo_calib_path, tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    Xcalibu(calib_file_name=demo_calib_path("undu_table.calib"), cache_dir=cache_dir)
+    assert os.listdir(cache_dir) == []
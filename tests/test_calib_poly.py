@@ -0,0 +1,164 @@
+import array
+
+import pytest
+import numpy as np
+from numpy.polynomial import Chebyshev, Polynomial
+
+from xcalibu import Xcalibu
+from xcalibu.xcalibu import poly_horner, poly_clenshaw
+
+
+def test_poly_horner():
+    coeffs = [28.78, -5.57, 0.56]
+    x_arr = np.linspace(5, 15, 11)
+    np.testing.assert_allclose(poly_horner(coeffs, x_arr), Polynomial(coeffs)(x_arr))
+    assert poly_horner(coeffs, 5) == pytest.approx(14.93)
+
+    out = np.empty(x_arr.shape)
+    assert poly_horner(coeffs, x_arr, out=out) is out
+    np.testing.assert_allclose(out, Polynomial(coeffs)(x_arr))
+
+    # In place.
+    x_copy = x_arr.copy()
+    assert poly_horner(coeffs, x_copy, out=x_copy) is x_copy
+    np.testing.assert_allclose(x_copy, Polynomial(coeffs)(x_arr))
+
+
+def test_poly_clenshaw():
+    coeffs = [0.3, -1.2, 0.7, 0.05, 2.0]
+    x_arr = np.linspace(14, 30, 17)
+    cheb = Chebyshev(coeffs, domain=[14, 30])
+    np.testing.assert_allclose(poly_clenshaw(coeffs, x_arr, domain=[14, 30]), cheb(x_arr))
+    assert poly_clenshaw(coeffs, 22.5, domain=[14, 30]) == pytest.approx(cheb(22.5))
+    assert poly_clenshaw([4.0], 1.0) == 4.0
+
+
+def test_poly_calc_value(demo_calib_path):
+    calib = Xcalibu(calib_file_name=demo_calib_path("qepro.calib"))
+    x_arr = np.linspace(0, 1024, 1025)
+    y_ref = Polynomial(calib.get_coeffs())(x_arr)
+    np.testing.assert_allclose(calib.calc_poly_value(x_arr), y_ref)
+
+    out = np.empty(x_arr.shape)
+    calib.calc_poly_value(x_arr, out=out)
+    np.testing.assert_allclose(out, y_ref)
+
+    # In place conversion of a frame.
+    frame = x_arr[:3].copy()
+    assert calib.get_y(frame, out=frame) is frame
+    np.testing.assert_allclose(frame, y_ref[:3])
+
+
+@pytest.mark.parametrize("calib_file", ["poly.calib", "qepro.calib", "u32a_poly.calib"])
+def test_poly_newton_reverse(demo_calib_path, calib_file):
+    calib = Xcalibu(calib_file_name=demo_calib_path(calib_file), samp_nbp=5)
+    assert calib.is_monotonic
+    assert calib.get_poly_reverse_method() == "NEWTON"
+
+    x_arr = np.linspace(calib.Xmin, calib.Xmax, 10001)
+    x_calc, iterations = calib.calc_newton_reverse_value(
+        calib.get_y(x_arr), return_iterations=True
+    )
+    np.testing.assert_allclose(x_calc, x_arr, rtol=1e-12, atol=1e-12)
+    assert iterations.max() < 20
+
+    x_mid = (calib.Xmin + calib.Xmax) / 2
+    assert calib.get_x(calib.get_y(x_mid)) == pytest.approx(x_mid, rel=1e-12)
+
+    # Y value out of calibration.
+    assert np.isnan(calib.get_x(2 * calib.get_y(calib.Xmax) - calib.get_y(calib.Xmin)))
+
+
+@pytest.mark.parametrize("kind", ["linear", "cubic"])
+def test_poly_adaptive_sampling(demo_calib_path, kind):
+    calib = Xcalibu(
+        calib_file_name=demo_calib_path("u32a_poly.calib"),
+        reconstruction_method="INTERPOLATION",
+        interpol_kind=kind,
+        samp_tolerance=1e-6,
+    )
+    calib.set_poly_reverse_method("INTERPOLATION")
+    assert calib.get_sampling_max_error() <= 1e-6
+
+    x_arr = np.linspace(calib.Xmin, calib.Xmax, 100001)
+    assert np.max(np.abs(calib.get_x(calib.get_y(x_arr)) - x_arr)) <= 1e-6
+
+    # Fewer points than an equally spaced table with same max error.
+    assert len(calib.x_raw) < 4000
+
+
+def test_poly_nd_input(demo_calib_path):
+    """
+    Detector frames: output has the shape of the input, and can be a preallocated buffer.
+    """
+    calib = Xcalibu(calib_file_name=demo_calib_path("qepro.calib"))
+    frame = np.arange(1024.0 * 6).reshape(6, 1024) % 1024
+
+    y_frame = calib.get_y(frame)
+    assert y_frame.shape == frame.shape
+    np.testing.assert_array_equal(y_frame[2], calib.get_y(frame[2]))
+
+    out = np.empty((6, 1024))
+    assert calib.get_y(frame, out=out) is out
+    np.testing.assert_array_equal(out, y_frame)
+
+    y_0d = calib.get_y(np.array(512.0))
+    assert y_0d.shape == ()
+    assert y_0d == calib.get_y(512.0)
+
+    with pytest.raises(ValueError):
+        calib.get_y(frame, out=np.empty(10))
+
+
+def test_poly_buffer_inputs(demo_calib_path):
+    """
+    Sequences and buffer-protocol objects are accepted and given back in the same kind of container.
+    """
+    calib = Xcalibu(calib_file_name=demo_calib_path("qepro.calib"))
+    x_values = [1.0, 2.5, 512.0]
+    y_ref = calib.get_y(np.array(x_values))
+
+    assert calib.get_y(x_values) == y_ref.tolist()
+    assert calib.get_y(tuple(x_values)) == tuple(y_ref.tolist())
+
+    x_buf = array.array("d", x_values)
+    y_buf = calib.get_y(x_buf)
+    assert isinstance(y_buf, array.array) and y_buf.typecode == "d"
+    assert y_buf.tolist() == y_ref.tolist()
+
+    np.testing.assert_array_equal(calib.get_y(memoryview(x_buf)), y_ref)
+    assert calib.get_y(np.float64(2.5)) == y_ref[1]
+
+    # writable buffer as output
+    out = array.array("d", bytes(8 * len(x_values)))
+    assert calib.get_y(memoryview(x_buf), out=out) is out
+    assert out.tolist() == y_ref.tolist()
+
+    # outputs which cannot be written in place
+    readonly = np.zeros(len(x_values))
+    readonly.setflags(write=False)
+    for out in ([0.0] * len(x_values), (0.0,) * len(x_values), memoryview(bytes(8 * len(x_values))), readonly):
+        with pytest.raises(TypeError):
+            calib.get_y(x_values, out=out)
+        with pytest.raises(TypeError):
+            calib.get_x(x_values, out=out)
+
+    with pytest.raises(TypeError):
+        calib.get_y("1.0")
+
+
+def test_poly_preserve_float32(demo_calib_path):
+    calib = Xcalibu(calib_file_name=demo_calib_path("qepro.calib"))
+    x_32 = np.linspace(0, 1023, 11, dtype=np.float32)
+
+    # calculation in float64 whatever the input type
+    assert calib.get_y(x_32).dtype == np.float64
+    assert calib.get_y(np.float32(3)) == calib.get_y(3.0)
+
+    calib.set_preserve_float32(True)
+    y_32 = calib.get_y(x_32)
+    assert y_32.dtype == np.float32
+    np.testing.assert_array_equal(y_32, calib.get_y(x_32.astype(float)).astype(np.float32))
+    assert isinstance(calib.get_y(np.float32(3)), np.float32)
+    assert calib.get_y(array.array("f", [1.0, 2.0])).typecode == "f"
+    assert calib.get_y(x_32.astype(float)).dtype == np.float64
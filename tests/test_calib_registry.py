@@ -0,0 +1,50 @@
+import os
+import shutil
+
+import numpy as np
+import pytest
+
+from xcalibu import Xcalibu, XCalibError
+from xcalibu.xcalibu import CalibRegistry
+
+EXAMPLES = ["hpz_ring_Ry.calib", "poly.calib", "table.calib", "undu_table.calib", "unsorted_table.calib"]
+
+
+@pytest.fixture
+def calib_dir(demo_calib_path, tmp_path):
+    for calib_file in EXAMPLES:
+        shutil.copy(demo_calib_path(calib_file), tmp_path / calib_file)
+    # Same calibration name as table.calib.
+    shutil.copy(demo_calib_path("table_2_col.calib"), tmp_path / "table_2_col.calib")
+    (tmp_path / "notes.txt").write_text("not a calibration")
+    return str(tmp_path)
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_registry_load_directory(calib_dir, executor):
+    registry = CalibRegistry(calib_dir, max_workers=2, executor=executor, reconstruction_method="INTERPOLATION")
+
+    assert registry.names() == ["HPZ_RING_RY", "U42", "B52", "U32BC1G"]
+    assert len(registry) == 4
+    assert "B52" in registry
+    with pytest.raises(XCalibError):
+        registry["NOT_LOADED"]
+
+    ref = Xcalibu(calib_file_name=os.path.join(calib_dir, "hpz_ring_Ry.calib"), reconstruction_method="INTERPOLATION")
+    x = np.linspace(ref.min_x(), ref.max_x(), 50)
+    np.testing.assert_array_equal(registry["HPZ_RING_RY"].get_y(x), ref.get_y(x))
+
+    # Errors are reported file by file, without stopping the loading.
+    report = registry.report()
+    assert [os.path.basename(entry["file"]) for entry in report] == sorted(EXAMPLES + ["table_2_col.calib"])
+    assert all(entry["time"] >= 0 for entry in report)
+    errors = {os.path.basename(entry["file"]): entry["error"] for entry in registry.errors()}
+    assert sorted(errors) == ["table_2_col.calib", "unsorted_table.calib"]
+    assert "duplicate" in errors["table_2_col.calib"]
+
+
+def test_registry_lazy(calib_dir):
+    registry = CalibRegistry([calib_dir], lazy=True, reconstruction_method="INTERPOLATION")
+    assert not registry["B52"].is_loaded()
+    ref = Xcalibu(calib_file_name=os.path.join(calib_dir, "table.calib"), reconstruction_method="INTERPOLATION")
+    assert registry["B52"].get_y(10) == ref.get_y(10)
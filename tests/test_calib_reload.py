@@ -0,0 +1,103 @@
+import os
+import threading
+import time
+
+import numpy as np
+
+from xcalibu import Xcalibu
+
+
+def _write_table(file_name, slope, nb_points):
+    """
+    Write (atomically) a TABLE calibration y = slope * x on [0, 10].
+    """
+    x = np.linspace(0, 10, nb_points)
+    lines = ["CALIB_NAME = RELOAD", "CALIB_TYPE = TABLE", f"CALIB_DESC = slope {slope}"]
+    lines += ["%r %r" % (xx, slope * xx) for xx in x.tolist()]
+    with open(file_name + ".tmp", "w") as calib_file:
+        calib_file.write("\n".join(lines) + "\n")
+    os.replace(file_name + ".tmp", file_name)
+
+
+def test_reload(tmp_path):
+    file_name = str(tmp_path / "reload.calib")
+    _write_table(file_name, 1, 11)
+    calib = Xcalibu(calib_file_name=file_name, reconstruction_method="INTERPOLATION")
+    assert calib.get_y(5.0) == 5.0
+
+    _write_table(file_name, 2, 21)
+    assert calib.reload()
+    assert calib.get_y(5.0) == 10.0
+    assert calib.dataset_size() == 21
+    assert calib.get_calib_description() == "slope 2"
+
+    # Invalid file: previous calibration is kept.
+    with open(file_name, "w") as calib_file:
+        calib_file.write("CALIB_NAME = RELOAD\nCALIB_TYPE = TABLE\n")
+    assert not calib.reload()
+    assert calib.get_y(5.0) == 10.0
+
+
+def test_watch(tmp_path):
+    file_name = str(tmp_path / "reload.calib")
+    _write_table(file_name, 1, 11)
+    calib = Xcalibu(calib_file_name=file_name, reconstruction_method="INTERPOLATION")
+    calib.watch(interval=0.01)
+    assert calib.is_watched()
+
+    _write_table(file_name, 3, 31)
+    deadline = time.time() + 5
+    while calib.get_y(5.0) != 15.0 and time.time() < deadline:
+        time.sleep(0.01)
+    assert calib.get_y(5.0) == 15.0
+    assert calib.is_watched()
+
+    calib.unwatch()
+    _write_table(file_name, 4, 41)
+    time.sleep(0.1)
+    assert calib.get_y(5.0) == 15.0
+
+
+def test_reload_stress(tmp_path):
+    """
+    Readers evaluate arrays and scalars while the file is rewritten and reloaded:
+    each result must come entirely from one version of the calibration.
+    """
+    file_name = str(tmp_path / "reload.calib")
+    _write_table(file_name, 1, 11)
+    calib = Xcalibu(calib_file_name=file_name, reconstruction_method="INTERPOLATION")
+    calib.watch(interval=0.002)
+
+    x = np.linspace(0.5, 9.5, 50)
+    stop = threading.Event()
+    errors = []
+    slopes_seen = set()
+
+    def _reader():
+        try:
+            while not stop.is_set():
+                slopes = calib.get_y(x) / x
+                np.testing.assert_allclose(slopes, slopes[0], rtol=1e-12)
+                slope = round(slopes[0])
+                assert slope in (1, 2, 3, 4)
+                assert calib.get_y(5.0) / 5.0 in (1, 2, 3, 4)
+                slopes_seen.add(slope)
+        except Exception as err:
+            errors.append(err)
+
+    readers = [threading.Thread(target=_reader) for _ in range(4)]
+    for reader in readers:
+        reader.start()
+    for ii in range(40):
+        slope = 1 + ii % 4
+        _write_table(file_name, slope, 11 + 10 * slope)
+        if ii % 2:
+            calib.reload()
+        time.sleep(0.005)
+    stop.set()
+    for reader in readers:
+        reader.join()
+    calib.unwatch()
+
+    assert errors == []
+    assert len(slopes_seen) > 1
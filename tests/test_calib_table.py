@@ -1,3 +1,4 @@
+import os
 import pytest
 import numpy as np
 import time
@@ -94,7 +95,7 @@ def test_poly(xcalib_demo):
     assert poly_calib.get_y(15) == pytest.approx(71.23)
 
     # Reverse calculation
-    # assert poly_calib.get_x(71.23) == pytest.approx(15.00)
+    assert poly_calib.get_x(71.23) == pytest.approx(15.00)
 
 
 def test_table_fit(xcalib_demo):
@@ -145,3 +146,712 @@ def test_input_invalid_array(xcalib_demo):
 
     with pytest.raises(XCalibError):
         calib.get_y(invalid_input_array)
+
+
+def test_input_array_same_as_scalar(demo_calib_path):
+    """
+    Whole-array evaluation must give the same results as the scalar path.
+    """
+    from xcalibu import Xcalibu
+
+    calib = Xcalibu(
+        calib_file_name=demo_calib_path("table.calib"),
+        reconstruction_method="INTERPOLATION",
+    )  # X:[0.008;50]
+    x_arr = np.array([-1.0, 0.008, 0.5, 6.25, 23.05, 49.9, 50.0, 51.0])
+    y_arr = calib.get_y(x_arr)
+    y_ref = np.array([calib.get_y_scalar(x) for x in x_arr], dtype=float)
+    np.testing.assert_array_equal(y_arr, y_ref)
+    assert np.isnan(y_arr[0]) and np.isnan(y_arr[-1])
+
+    calib = Xcalibu(
+        calib_file_name=demo_calib_path("cubic.calib"),
+        fit_order=3,
+        reconstruction_method="POLYFIT",
+    )
+    x_arr = np.linspace(-5, 5, 33)
+    np.testing.assert_allclose(
+        calib.get_y(x_arr), np.array([calib.get_y_scalar(x) for x in x_arr]), rtol=1e-12
+    )
+    y_arr = np.linspace(calib.Ymin, calib.Ymax, 33)
+    np.testing.assert_allclose(
+        calib.get_x(y_arr), np.array([calib.get_x_scalar(y) for y in y_arr]), rtol=1e-12
+    )
+
+
+def test_table_uniform_grid(demo_calib_path):
+    """
+    Equally spaced tables use the uniform grid engine with same results as interp1d.
+    """
+    from scipy.interpolate import interp1d
+    from xcalibu import Xcalibu
+
+    calib = Xcalibu(
+        calib_file_name=demo_calib_path("hpz_ring_Ry.calib"),
+        reconstruction_method="INTERPOLATION",
+    )
+    assert calib.get_interpol_engine() == "uniform grid"
+
+    ref = interp1d(calib.x_raw, calib.y_raw, bounds_error=False)
+    x_arr = np.concatenate(
+        [calib.x_raw, np.linspace(calib.Xmin - 1, calib.Xmax + 1, 1001)]
+    )
+    np.testing.assert_array_equal(calib.ifunc(x_arr), ref(x_arr))
+    for x in x_arr[::37]:
+        np.testing.assert_array_equal(calib.ifunc(x), ref(x))
+
+    # Not exactly uniform grid (arithmetic index shifted by one segment), nan and inf.
+    from xcalibu.xcalibu import UniformGridInterpolator
+
+    rng = np.random.default_rng(0)
+    x_grid = np.arange(100.0) + rng.uniform(-0.3, 0.3, 100)
+    y_grid = rng.standard_normal(100)
+    x_arr = np.concatenate(
+        [x_grid, np.nextafter(x_grid, -np.inf), np.nextafter(x_grid, np.inf),
+         np.linspace(-2, 102, 10001), [np.nan, np.inf, -np.inf]]
+    )
+    np.testing.assert_array_equal(
+        UniformGridInterpolator(x_grid, y_grid)(x_arr), interp1d(x_grid, y_grid, bounds_error=False)(x_arr)
+    )
+
+    calib.set_uniform_grid_tolerance(None)
+    calib.compute_interpolation()
+    assert calib.get_interpol_engine() == "segment hint"
+
+    calib = Xcalibu(
+        calib_file_name=demo_calib_path("table.calib"),
+        reconstruction_method="INTERPOLATION",
+    )
+    assert calib.get_interpol_engine() == "segment hint"
+
+
+def test_table_segment_hint(demo_calib_path):
+    """
+    Scalar lookups on non equally spaced tables (any order, several threads)
+    give same results as interp1d.
+    """
+    import threading
+    from scipy.interpolate import interp1d
+    from xcalibu import Xcalibu
+
+    calib = Xcalibu(
+        calib_file_name=demo_calib_path("table.calib"),
+        reconstruction_method="INTERPOLATION",
+    )
+    assert calib.get_interpol_engine() == "segment hint"
+
+    ref = interp1d(calib.x_raw, calib.y_raw, bounds_error=False)
+    sweep = np.linspace(calib.Xmin, calib.Xmax, 2001)
+    scan = np.concatenate([sweep, sweep[::-1], np.random.default_rng(0).permutation(sweep)])
+    errors = []
+
+    def _lookups():
+        for x in scan:
+            if calib.get_y(x) != ref(x):
+                errors.append(x)
+
+    threads = [threading.Thread(target=_lookups) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+
+
+@pytest.mark.parametrize("kind", ["quadratic", "cubic"])
+def test_table_piecewise_poly(demo_calib_path, kind):
+    """
+    Spline interpolation kinds are compiled into per-segment polynomials.
+    """
+    from scipy.interpolate import interp1d
+    from xcalibu import Xcalibu
+
+    calib = Xcalibu(
+        calib_file_name=demo_calib_path("undu_table.calib"),
+        reconstruction_method="INTERPOLATION",
+        interpol_kind=kind,
+    )
+    assert calib.get_interpol_engine() == "piecewise poly"
+    assert calib._interpol_engineR == "piecewise poly"
+
+    ref = interp1d(calib.x_raw, calib.y_raw, kind=kind, bounds_error=False)
+    x_arr = np.linspace(calib.Xmin - 1, calib.Xmax + 1, 501)
+    np.testing.assert_allclose(calib.get_y(x_arr), ref(x_arr), rtol=1e-12)
+    for x in x_arr[::25]:
+        np.testing.assert_allclose(calib.ifunc(x), ref(x), rtol=1e-12)
+
+    refR = interp1d(calib.y_raw, calib.x_raw, kind=kind, bounds_error=False)
+    y_arr = np.linspace(calib.Ymin, calib.Ymax, 101)
+    np.testing.assert_allclose(calib.get_x(y_arr), refR(y_arr), rtol=1e-12)
+
+
+def test_out_of_range_policy(demo_calib_path):
+    from xcalibu import Xcalibu
+
+    calib = Xcalibu(
+        calib_file_name=demo_calib_path("table.calib"),
+        reconstruction_method="INTERPOLATION",
+    )  # X:[0.008;50] Y:[-12;72]
+    x_arr = np.array([-1.0, 1.0, 2.0, 51.0])
+
+    np.testing.assert_array_equal(calib.get_y(x_arr), [np.nan, 1.0, 1.5, np.nan])
+    assert np.isnan(calib.get_y(-1.0))
+
+    calib.set_out_of_range_policy("CLIP")
+    np.testing.assert_allclose(calib.get_y(x_arr), [-0.0083, 1.0, 1.5, 53.0])
+
+    calib.set_out_of_range_policy("FILL", fill_value=-99)
+    np.testing.assert_array_equal(calib.get_y(x_arr), [-99, 1.0, 1.5, -99])
+    assert calib.get_y(51.0) == -99
+
+    calib.set_out_of_range_policy("EXTRAPOLATE")
+    slope = (1 + 0.0083) / (1 - 0.008)
+    np.testing.assert_allclose(
+        calib.get_y(x_arr), [-0.0083 - slope * 1.008, 1.0, 1.5, 53.0 - 9.0 / 18.0], rtol=1e-6
+    )
+
+    # In place conversion (out is the input array).
+    for policy in ("NAN", "CLIP", "FILL", "EXTRAPOLATE"):
+        calib.set_out_of_range_policy(policy, fill_value=-99)
+        x_inplace = x_arr.copy()
+        assert calib.get_y(x_inplace, out=x_inplace) is x_inplace
+        np.testing.assert_array_equal(x_inplace, calib.get_y(x_arr))
+
+    calib.set_out_of_range_policy("RAISE")
+    with pytest.raises(XCalibError, match=r"2 value\(s\) out of range .* indices \[0, 3\]"):
+        calib.get_y(x_arr)
+    with pytest.raises(XCalibError):
+        calib.get_x(np.array([0.0, 100.0]))
+
+
+def test_range_masks(demo_calib_path):
+    from xcalibu import Xcalibu
+
+    calib = Xcalibu(
+        calib_file_name=demo_calib_path("table.calib"),
+        reconstruction_method="INTERPOLATION",
+    )  # X:[0.008;50] Y:[-12;72]
+    x_arr = np.array([0.0, 0.008, 50.0, 50.001])
+    np.testing.assert_array_equal(calib.valid_x_range_mask(x_arr), [False, True, True, False])
+    np.testing.assert_array_equal(
+        calib.valid_x_range_mask(x_arr, tolerance=0.01), [True, True, True, True]
+    )
+    calib.set_range_tolerance(0.01)
+    assert calib.is_in_valid_x_range(50.001)
+    np.testing.assert_array_equal(
+        calib.valid_y_range_mask(np.array([-12.1, -12.0, 72.0, 72.005])), [False, True, True, True]
+    )
+
+
+def test_table_nd_input(demo_calib_path):
+    from xcalibu import Xcalibu
+
+    calib = Xcalibu(
+        calib_file_name=demo_calib_path("undu_table.calib"),
+        reconstruction_method="INTERPOLATION",
+    )
+    x_cube = np.linspace(calib.Xmin - 1, calib.Xmax + 1, 60).reshape(3, 4, 5)
+    y_cube = calib.get_y(x_cube)
+    assert y_cube.shape == (3, 4, 5)
+    np.testing.assert_array_equal(y_cube.ravel(), calib.get_y(x_cube.ravel()))
+
+    # non contiguous output buffer
+    out = np.empty((5, 4, 3)).T
+    calib.get_y(x_cube, out=out)
+    np.testing.assert_array_equal(out, y_cube)
+
+    x_back = calib.get_x(calib.get_y(x_cube[1:2, 1:3, 1:4]))
+    assert x_back.shape == (1, 2, 3)
+    np.testing.assert_allclose(x_back, x_cube[1:2, 1:3, 1:4])
+
+    calib.set_out_of_range_policy("RAISE")
+    with pytest.raises(XCalibError, match=r"indices \[\(0, 0, 0\)"):
+        calib.get_y(x_cube)
+
+
+@pytest.mark.parametrize(
+    "data_lines, file_format",
+    [
+        (["0.470157", "0.475166", "", "0.51492", "# comment", "5.e-1"], "ONE_COL"),
+        (["4.9399 0.470157", "5.00000\t+0.475166", "# comment", "  5.5 0.51492  ", "1e1 -3E-2"], "TWO_COLS"),
+        (["ENC[0.8e-2] = -0.83e-02", "ENC [1]=1", "# comment", " ENC[3]=\t2  ", "ENC[5]=-12"], "XCALIBU"),
+    ],
+)
+def test_table_bulk_parsing(data_lines, file_format):
+    """
+    Data block parsed at once must give the same result as line by line parsing
+    (forced here by a "#CALIB_" comment line at the end of the data block).
+    """
+    from xcalibu import Xcalibu
+
+    header = "# test\nCALIB_NAME = ENC\nCALIB_TYPE = TABLE\n\n"
+    calibs = [
+        Xcalibu(calib_string=header + "\n".join(data_lines + tail), reconstruction_method="INTERPOLATION")
+        for tail in [[], ["#CALIB_NOTE"]]
+    ]
+    bulk, by_line = calibs
+
+    assert bulk._calib_file_format == by_line._calib_file_format == file_format
+    np.testing.assert_array_equal(bulk.x_raw, by_line.x_raw)
+    np.testing.assert_array_equal(bulk.y_raw, by_line.y_raw)
+    assert bulk.x_raw.dtype == by_line.x_raw.dtype
+    assert bulk._comments == ["# test", "# comment"]
+    assert by_line._comments == bulk._comments + ["#CALIB_NOTE"]
+    assert (bulk.Xmin, bulk.Xmax, bulk.Ymin, bulk.Ymax) == (by_line.Xmin, by_line.Xmax, by_line.Ymin, by_line.Ymax)
+    assert bulk.dataset_size() == by_line.dataset_size() == 4
+
+
+def test_table_binary_file(demo_calib_path, tmp_path):
+    from xcalibu import Xcalibu
+    from xcalibu.xcalibu import is_binary_calib_file
+
+    text_calib = Xcalibu(calib_file_name=demo_calib_path("hpz_ring_Ry.calib"), reconstruction_method="INTERPOLATION")
+
+    binary_file = str(tmp_path / "hpz_ring_Ry.bcalib")
+    text_calib.set_calib_file_name(binary_file)
+    text_calib.set_calib_file_format("BINARY")
+    text_calib.save()
+    assert is_binary_calib_file(binary_file)
+    assert not is_binary_calib_file(demo_calib_path("hpz_ring_Ry.calib"))
+
+    calib = Xcalibu(calib_file_name=binary_file, reconstruction_method="INTERPOLATION")
+    assert calib.get_calib_file_format() == "BINARY"
+    assert calib.get_calib_name() == "HPZ_RING_RY"
+    assert calib.get_calib_time() == text_calib.get_calib_time()
+    assert calib._comments == text_calib._comments
+    np.testing.assert_array_equal(calib.x_raw, text_calib.x_raw)
+    np.testing.assert_array_equal(calib.y_raw, text_calib.y_raw)
+    assert (calib.Xmin, calib.Xmax, calib.Ymin, calib.Ymax) == (
+        text_calib.Xmin, text_calib.Xmax, text_calib.Ymin, text_calib.Ymax
+    )
+
+    # Data are memory-mapped (read-only) and not copied by interpolation.
+    assert isinstance(calib.x_raw.base, np.memmap)
+    assert not calib.x_raw.flags.writeable
+    assert calib.ifunc.x is calib.x_raw
+    assert calib.get_y(123.4) == text_calib.get_y(123.4)
+
+    # Saving over the mapped file keeps loaded data valid.
+    calib.insert(x=400, y=0.0)
+    calib.save()
+    np.testing.assert_array_equal(calib.x_raw[:-1], text_calib.x_raw)
+    reloaded = Xcalibu(calib_file_name=binary_file, reconstruction_method="INTERPOLATION")
+    assert reloaded.max_x() == 400
+    assert len(reloaded.x_raw) == len(text_calib.x_raw) + 1
+
+    poly = Xcalibu(calib_file_name=demo_calib_path("poly.calib"))
+    poly.set_calib_file_name(str(tmp_path / "poly.bcalib"))
+    poly.set_calib_file_format("BINARY")
+    with pytest.raises(XCalibError):
+        poly.save()
+
+
+@pytest.mark.parametrize("calib_file", ["hpz_ring_Ry.calib", "table.calib", "table_2_col.calib", "poly.calib"])
+def test_calib_sources(demo_calib_path, tmp_path, monkeypatch, calib_file):
+    import bz2
+    import gzip
+    import io
+    import lzma
+
+    import xcalibu.xcalibu as xcalibu_module
+    from xcalibu import Xcalibu
+
+    def _loaded(**kwargs):
+        calib = Xcalibu(reconstruction_method="INTERPOLATION", **kwargs)
+        return calib.x_raw, calib.y_raw, calib.get_calib_name()
+
+    file_name = demo_calib_path(calib_file)
+    with open(file_name) as f:
+        text = f.read()
+    x_ref, y_ref, name_ref = _loaded(calib_file_name=file_name)
+
+    sources = [
+        io.StringIO(text),
+        io.BytesIO(text.encode()),
+        iter(text.splitlines(keepends=True)),
+        (line.encode() for line in text.splitlines()),
+    ]
+    for source in sources:
+        x, y, name = _loaded(calib_source=source)
+        np.testing.assert_array_equal(x, x_ref)
+        np.testing.assert_array_equal(y, y_ref)
+        assert name == name_ref
+
+    for ext, module in [("gz", gzip), ("bz2", bz2), ("xz", lzma)]:
+        compressed = str(tmp_path / f"{calib_file}.{ext}")
+        with module.open(compressed, "wt") as f:
+            f.write(text)
+        x, y, name = _loaded(calib_file_name=compressed)
+        np.testing.assert_array_equal(x, x_ref)
+        np.testing.assert_array_equal(y, y_ref)
+
+        # Saved back compressed.
+        calib = Xcalibu(calib_file_name=compressed, reconstruction_method="INTERPOLATION")
+        calib.set_save_precision("ROUND_TRIP")
+        calib.save()
+        with module.open(compressed, "rt") as f:
+            assert f.read(1)
+        x, y, name = _loaded(calib_file_name=compressed)
+        np.testing.assert_array_equal(x, x_ref)
+        np.testing.assert_array_equal(y, y_ref)
+
+    # Small chunks: data blocks and lines are split across chunks.
+    monkeypatch.setattr(xcalibu_module, "LOAD_CHUNK_SIZE", 37)
+    monkeypatch.setattr(xcalibu_module, "LOAD_CHUNK_LINES", 3)
+    for kwargs in (
+        {"calib_file_name": file_name},
+        {"calib_string": text},
+        {"calib_source": io.BytesIO(text.encode())},
+        {"calib_source": iter(text.splitlines())},
+    ):
+        x, y, name = _loaded(**kwargs)
+        np.testing.assert_array_equal(x, x_ref)
+        np.testing.assert_array_equal(y, y_ref)
+
+
+def test_lazy_loading(demo_calib_path, monkeypatch):
+    import threading
+
+    from xcalibu import Xcalibu
+
+    file_name = demo_calib_path("hpz_ring_Ry.calib")
+    eager = Xcalibu(calib_file_name=file_name, reconstruction_method="INTERPOLATION")
+
+    nb_loads = []
+    _load_calib = Xcalibu.load_calib
+    monkeypatch.setattr(Xcalibu, "load_calib", lambda self: (nb_loads.append(1), _load_calib(self)))
+
+    calib = Xcalibu(calib_file_name=file_name, reconstruction_method="INTERPOLATION", lazy=True)
+
+    # Header only.
+    assert not calib.is_loaded()
+    assert nb_loads == []
+    assert calib.x_raw is None
+    assert calib.get_calib_name() == "HPZ_RING_RY"
+
+    # Data are read once at first use, by any thread.
+    results = []
+    barrier = threading.Barrier(8)
+
+    def _get_y():
+        barrier.wait()
+        results.append(calib.get_y(123.4))
+
+    threads = [threading.Thread(target=_get_y) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert nb_loads == [1]
+    assert calib.is_loaded()
+    assert results == [eager.get_y(123.4)] * 8
+    assert (calib.min_x(), calib.max_x()) == (eager.min_x(), eager.max_x())
+    np.testing.assert_array_equal(calib.get_raw_x(), eager.x_raw)
+    assert calib._comments == eager._comments
+    assert (calib.Ymin, calib.Ymax) == (eager.Ymin, eager.Ymax)
+
+    # Range checks load data first.
+    for check in (
+        lambda c: c.is_in_valid_x_range(1e9),
+        lambda c: bool(c.valid_x_range_mask(np.array([1e9]))[0]),
+        lambda c: c.is_in_valid_y_range(1e9),
+        lambda c: bool(c.valid_y_range_mask(np.array([1e9]))[0]),
+    ):
+        unloaded = Xcalibu(calib_file_name=file_name, reconstruction_method="INTERPOLATION", lazy=True)
+        assert not unloaded.is_loaded()
+        assert check(unloaded) is check(eager) is False
+        assert unloaded.is_loaded()
+
+    # POLY calibrations: coefficients are read, reverse interpolation is deferred.
+    poly = Xcalibu(calib_file_name=demo_calib_path("poly.calib"), lazy=True)
+    assert not poly.is_loaded()
+    assert poly.get_x(poly.get_y(7.0)) == pytest.approx(7.0)
+    assert poly.is_loaded()
+
+
+def test_lazy_loading_unsorted(demo_calib_path, tmp_path):
+    from xcalibu import Xcalibu
+
+    # unsorted_table.calib data lines are named "ST" (see test_table_load_file()).
+    with open(demo_calib_path("unsorted_table.calib")) as calib_file:
+        text = calib_file.read().replace("CALIB_NAME = Unsorted non monotonic data", "CALIB_NAME = ST")
+    text += "ST[3]=1.5\n"  # last line: not the end of the ranges
+    file_name = str(tmp_path / "unsorted_table.calib")
+    with open(file_name, "w") as calib_file:
+        calib_file.write(text)
+
+    eager = Xcalibu(calib_file_name=file_name, reconstruction_method="INTERPOLATION")
+    calib = Xcalibu(calib_file_name=file_name, reconstruction_method="INTERPOLATION", lazy=True)
+    assert not calib.is_loaded()
+
+    # Ranges are those of all data, not of first and last data lines.
+    assert (calib.min_x(), calib.max_x()) == (eager.min_x(), eager.max_x()) == (1.0, 10.0)
+    assert (calib.min_y(), calib.max_y()) == (eager.min_y(), eager.max_y()) == (1.0, 2.0)
+    assert calib.is_loaded()
+
+
+@pytest.mark.parametrize("file_format", ["XCALIBU", "TWO_COLS"])
+def test_table_save(tmp_path, monkeypatch, file_format):
+    import xcalibu.xcalibu as xcalibu_module
+    from xcalibu import Xcalibu
+
+    rng = np.random.default_rng(0)
+    x = np.sort(rng.uniform(-1e3, 1e3, 1000))
+    y = rng.standard_normal(1000) * 10.0 ** rng.integers(-12, 12, 1000)
+    calib = Xcalibu(calib_name="RND", calib_type="TABLE", reconstruction_method="INTERPOLATION")
+    calib.set_raw_x(x)
+    calib.set_raw_y(y)
+    calib.set_calib_file_format(file_format)
+    file_name = str(tmp_path / "rnd.calib")
+    calib.set_calib_file_name(file_name)
+
+    # Default precision: 6 decimals.
+    monkeypatch.setattr(xcalibu_module, "SAVE_CHUNK_POINTS", 300)
+    calib.save()
+    reloaded = Xcalibu(calib_file_name=file_name, reconstruction_method="INTERPOLATION")
+    np.testing.assert_allclose(reloaded.x_raw, x, atol=1e-6)
+    assert not np.array_equal(reloaded.y_raw, y)
+
+    # Shortest round trip representation: bit-identical reloading.
+    calib.set_save_precision("ROUND_TRIP")
+    calib.save(fsync=True)
+    reloaded = Xcalibu(calib_file_name=file_name, reconstruction_method="INTERPOLATION")
+    np.testing.assert_array_equal(reloaded.x_raw, x)
+    np.testing.assert_array_equal(reloaded.y_raw, y)
+
+    with pytest.raises(XCalibError):
+        calib.set_save_precision("EXACT")
+
+    # Interrupted save leaves previous file unchanged.
+    with open(file_name) as f:
+        content = f.read()
+
+    def _fail(values, precision=None):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(xcalibu_module, "format_numbers", _fail)
+    with pytest.raises(KeyboardInterrupt):
+        calib.save()
+    with open(file_name) as f:
+        assert f.read() == content
+    assert os.listdir(tmp_path) == ["rnd.calib"]
+
+
+def test_table_journal(demo_calib_path, tmp_path):
+    import shutil
+
+    from xcalibu import Xcalibu
+
+    file_name = str(tmp_path / "hpz_ring_Ry.calib")
+    shutil.copy(demo_calib_path("hpz_ring_Ry.calib"), file_name)
+    with open(file_name) as f:
+        content = f.read()
+
+    calib = Xcalibu(calib_file_name=file_name, reconstruction_method="INTERPOLATION")
+    calib.set_journal(True)
+    calib.insert(x=[400.125, 400.5], y=[0.1, 0.2])
+    calib.insert(x=1 / 3, y=2 / 3)
+    calib.delete(x=400.5)
+    x_edited, y_edited = calib.get_raw_x(), calib.get_raw_y()
+
+    # Edits are appended to the journal, calibration file is unchanged.
+    with open(file_name) as f:
+        assert f.read() == content
+    with open(calib.get_journal_file_name()) as f:
+        assert len(f.readlines()) == 4
+
+    # Journal is replayed on loading (exact values).
+    reloaded = Xcalibu(calib_file_name=file_name, reconstruction_method="INTERPOLATION")
+    np.testing.assert_array_equal(reloaded.x_raw, x_edited)
+    np.testing.assert_array_equal(reloaded.y_raw, y_edited)
+    assert reloaded.max_x() == 400.125
+    assert reloaded.dataset_size() == len(x_edited)
+
+    # Compaction: edits saved in calibration file (exact values, default save
+    # precision is not used), journal removed.
+    calib.compact_journal()
+    assert calib.get_save_precision() is None
+    assert not os.path.exists(calib.get_journal_file_name())
+    reloaded = Xcalibu(calib_file_name=file_name, reconstruction_method="INTERPOLATION")
+    np.testing.assert_array_equal(reloaded.x_raw, x_edited)
+
+    # Automatic compaction above journal size threshold.
+    calib.set_journal(True, max_size=40)
+    calib.insert(x=401, y=0.3)
+    assert os.path.exists(calib.get_journal_file_name())
+    calib.insert(x=402, y=0.4)
+    calib.insert(x=403 + 1 / 3, y=0.5 + 1e-9)
+    assert not os.path.exists(calib.get_journal_file_name())
+    reloaded = Xcalibu(calib_file_name=file_name, reconstruction_method="INTERPOLATION")
+    assert reloaded.max_x() == 403 + 1 / 3
+    np.testing.assert_array_equal(reloaded.x_raw, calib.get_raw_x())
+    np.testing.assert_array_equal(reloaded.y_raw, calib.get_raw_y())
+
+
+def test_table_incremental_fit(demo_calib_path, monkeypatch):
+    from xcalibu import Xcalibu
+
+    calib = Xcalibu(calib_file_name=demo_calib_path("hpz_ring_Ry.calib"), reconstruction_method="POLYFIT", fit_order=3)
+    rng = np.random.default_rng(0)
+    new_x = rng.uniform(calib.min_x(), calib.max_x(), 20)
+    calib.insert(new_x[0], calib.get_y(new_x[0]))  # first edit: full fit
+
+    nb_fits = []
+    _fit = Xcalibu.fit
+    monkeypatch.setattr(Xcalibu, "fit", lambda self: (nb_fits.append(1), _fit(self)))
+
+    # Updates without full fit.
+    for x in new_x[1:]:
+        calib.insert(x, calib.get_y(x) + rng.normal(0, 1e-3))
+    calib.insert(new_x[:3] + 0.5, [0.01, 0.02, 0.03])
+    for x in new_x[5:10]:
+        calib.delete(x=x)
+    assert nb_fits == []
+
+    ref = Xcalibu(calib_name="REF", calib_type="TABLE", reconstruction_method="POLYFIT", fit_order=3)
+    ref.set_raw_x(calib.get_raw_x().copy())
+    ref.set_raw_y(calib.get_raw_y().copy())
+    ref.fit()
+    x = np.linspace(calib.min_x(), calib.max_x(), 100)
+    np.testing.assert_allclose(calib.get_y(x), ref.get_y(x), rtol=1e-10, atol=1e-12)
+    y = np.linspace(calib.min_y(), calib.max_y(), 100)
+    np.testing.assert_allclose(calib.calc_reverse_value(y), ref.calc_reverse_value(y), rtol=1e-10, atol=1e-10)
+
+    # Point far out of the fitted range: full fit.
+    nb_fits.clear()
+    calib.insert(10 * calib.max_x(), 0.0)
+    assert nb_fits == [1]
+
+
+def test_table_auto_fit_order(monkeypatch):
+    from xcalibu import Xcalibu
+
+    rng = np.random.default_rng(0)
+    x = np.linspace(0, 10, 500)
+    y = 1 + 0.5 * x - 0.2 * x**2 + 0.01 * x**3 + rng.normal(0, 0.01, x.size)
+    calib = Xcalibu(calib_name="AUTO", calib_type="TABLE", reconstruction_method="POLYFIT", fit_order="AUTO")
+    calib.set_raw_x(x)
+    calib.set_raw_y(y)
+    calib.fit()
+    assert calib.is_fit_order_auto()
+    assert calib.get_fit_order() == 3
+    report = calib.get_fit_order_report()
+    assert [row["order"] for row in report] == list(range(1, 11))
+    assert all(row["rms"] < 0.011 for row in report[2:])
+
+    # Switching to an evaluated order reuses its fit.
+    monkeypatch.setattr(Xcalibu, "_fit_at_order", lambda self, order: pytest.fail("refit"))
+    calib.set_fit_order(6)
+    assert not calib.is_fit_order_auto()
+    assert len(calib._poly_coeffs) == 7
+    monkeypatch.undo()
+
+    ref = Xcalibu(calib_name="REF", calib_type="TABLE", reconstruction_method="POLYFIT", fit_order=6)
+    ref.set_raw_x(x)
+    ref.set_raw_y(y)
+    ref.fit()
+    np.testing.assert_array_equal(calib.get_y(x), ref.get_y(x))
+
+    with pytest.raises(XCalibError):
+        calib.select_fit_order(orders=[600])
+
+
+def test_fit_tables():
+    from xcalibu import Xcalibu
+    from xcalibu.xcalibu import fit_tables, polyfit_stack
+
+    rng = np.random.default_rng(0)
+    calibs = []
+    refs = []
+    for ii, (nb_points, order) in enumerate([(200, 5)] * 4 + [(50, 3)] * 3):
+        x = np.sort(rng.uniform(14, 30, nb_points))
+        y = 1 + 0.3 * x + 0.01 * x**2 + rng.normal(0, 1e-3, nb_points)
+        for calib_list in (calibs, refs):
+            calib = Xcalibu(calib_name=f"C{ii}", calib_type="TABLE", reconstruction_method="POLYFIT", fit_order=order)
+            calib.set_raw_x(x.copy())
+            calib.set_raw_y(y.copy())
+            calib_list.append(calib)
+
+    fit_tables(calibs)
+    for calib, ref in zip(calibs, refs):
+        ref.fit()
+        np.testing.assert_allclose(calib._polynomial(ref.x_raw), ref._polynomial(ref.x_raw), rtol=1e-12)
+        np.testing.assert_allclose(calib._poly_coeffs, ref._poly_coeffs, rtol=1e-6, atol=1e-12)
+        np.testing.assert_allclose(calib.get_y(ref.x_raw), ref.get_y(ref.x_raw), rtol=1e-12)
+        np.testing.assert_allclose(calib.coeffR, ref.coeffR, rtol=1e-6)
+
+    # Stacked arrays, shared x.
+    x = np.linspace(-1, 3, 20)
+    coeffs = polyfit_stack(x, np.stack([1 + 2 * x, x**2 - 1]), 2)
+    np.testing.assert_allclose(coeffs, [[1, 2, 0], [-1, 0, 1]], atol=1e-12)
+
+    with pytest.raises(XCalibError):
+        polyfit_stack(x[:2], x[:2], 2)
+    with pytest.raises(XCalibError):
+        fit_tables([Xcalibu(calib_name="P", calib_type="POLY", coeffs=[0, 1], calib_limits=(0, 1))])
+
+
+def test_table_reverse_fit_scaled():
+    from xcalibu import Xcalibu
+
+    # Undulator gap (mm) -> energy (keV) like table: large offsets.
+    x = np.linspace(14, 30, 1000)
+    y = 3 + 0.2 * x + 0.001 * x**2
+    calib = Xcalibu(calib_name="GAP", calib_type="TABLE", reconstruction_method="POLYFIT", fit_order=9)
+    calib.set_raw_x(x)
+    calib.set_raw_y(y)
+    calib.fit()
+
+    info = calib.get_reverse_fit_info()
+    assert info["condition"] < 10
+    assert info["raw_condition"] > 1e6
+    assert info["round_trip_error"] < 1e-6
+    np.testing.assert_allclose(calib.get_x(calib.get_y(x[1:-1])), x[1:-1], atol=1e-6)
+    assert isinstance(calib.calc_reverse_value(5.0), float)
+
+    # coeffR: same reverse polynomial of raw Y values.
+    np.testing.assert_allclose(np.polyval(calib.coeffR, y[::100]), calib.calc_reverse_value(y[::100]), rtol=1e-8)
+
+
+def test_chebyshev_conversions():
+    from numpy.polynomial import Chebyshev, Polynomial
+    from xcalibu.xcalibu import chebyshev_to_power, power_to_chebyshev
+
+    coeffs = np.array([[0.3, -1.2, 0.7, 0.05], [1.0, 0.0, 0.0, 2.0]])
+    np.testing.assert_allclose(
+        power_to_chebyshev(coeffs), [np.polynomial.chebyshev.poly2cheb(row) for row in coeffs], atol=1e-15
+    )
+    cheb = Chebyshev([0.3, -1.2, 0.7, 0.05], domain=[14, 30])
+    np.testing.assert_allclose(chebyshev_to_power(cheb.coef, cheb.domain), cheb.convert(kind=Polynomial).coef)
+
+
+def test_table_fitted_points(monkeypatch):
+    from xcalibu import Xcalibu
+
+    x = np.linspace(14, 30, 100)
+    calib = Xcalibu(calib_name="FITTED", calib_type="TABLE", reconstruction_method="POLYFIT", fit_order=3)
+    calib.set_raw_x(x)
+    calib.set_raw_y(3 + 0.2 * x + 0.001 * x**2)
+
+    nb_computations = []
+    _compute = Xcalibu._compute_fitted_points
+    monkeypatch.setattr(Xcalibu, "_compute_fitted_points", lambda self: (nb_computations.append(1), _compute(self))[1])
+
+    calib.fit()
+    assert nb_computations == []
+    assert len(calib.x_fitted) == 50
+    np.testing.assert_allclose(calib.y_fitted, calib.get_y(calib.x_fitted))
+    np.testing.assert_allclose(calib.y_fittedR, calib.calc_reverse_value(calib.x_fittedR))
+    assert nb_computations == [1]
+
+    # Invalidated by a change of resolution, data or fit.
+    calib.set_fitted_nb_points(200)
+    assert len(calib.y_fittedR) == 200
+    calib.insert(20.5, 3 + 0.2 * 20.5 + 0.001 * 20.5**2)
+    calib.y_fitted
+    calib.set_fit_order(2)
+    calib.fit()
+    calib.x_fitted
+    assert nb_computations == [1] * 4
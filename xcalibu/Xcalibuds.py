@@ -96,6 +96,11 @@ class Xcalibuds(PyTango.Device_4Impl):
         except:
             print('no "reconstruction_method" Tango propery found')
 
+        try:
+            self.watch_interval = float(self.device_property_list["watch_interval"][2][0])
+        except:
+            self.watch_interval = 0
+
         try:
             # Loads a calibration.
             self.calib = xcalibu.Xcalibu(
@@ -108,6 +113,11 @@ class Xcalibuds(PyTango.Device_4Impl):
                 self.info_stream("fits TABLE calib.")
                 # self.calib.fit()
 
+            # Hot reload of the calibration file when modified.
+            if self.watch_interval > 0:
+                self.calib.watch(self.watch_interval)
+                self.info_stream("watching %s every %gs" % (self.calib_file_name, self.watch_interval))
+
             print(
                 "Device "
                 + bcolors.PINK
@@ -342,6 +352,19 @@ class Xcalibuds(PyTango.Device_4Impl):
         :return: None
         :rtype: PyTango.DevVoid """
         self.debug_stream("In load_calibration()")
+
+        # New file is loaded with current parameters and swapped in at once:
+        # get_y / get_x requests in progress end with the previous calibration.
+        _previous_file_name = self.calib.get_calib_file_name()
+        self.calib.set_calib_file_name(argin)
+        if self.calib.reload():
+            self.calib_file_name = argin
+            if self.calib.is_watched():
+                self.calib.watch(self.watch_interval)
+        else:
+            self.calib.set_calib_file_name(_previous_file_name)
+            self.error_stream("unable to load calibration file %s" % argin)
+
         argout = [0]
 
         return argout
@@ -388,6 +411,11 @@ class XcalibudsClass(PyTango.DeviceClass):
             "data reconstruction method : INTERPOLATION or POLYFIT",
             ["INTERPOLATION"],
         ],
+        "watch_interval": [
+            PyTango.DevDouble,
+            "period (s) of check of calibration file modification for hot reload (0: no reload)",
+            [0],
+        ],
     }
 
     #    Command definitions
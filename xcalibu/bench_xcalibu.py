@@ -0,0 +1,919 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmarks of xcalibu calculations.
+
+usage: python -m xcalibu.bench_xcalibu [-b <bench name>]
+"""
+
+import array
+import glob
+import gzip
+import inspect
+import logging
+import os
+import tempfile
+import tracemalloc
+import time
+
+import numpy
+
+from xcalibu import Xcalibu
+from xcalibu.xcalibu import AUTO_FIT_MAX_ORDER, AUTO_FIT_NB_FOLDS, CalibBundle, CalibCache, CalibRegistry
+from xcalibu.xcalibu import fit_tables, poly_horner, PiecewisePolyInterpolator, UniformGridInterpolator
+from scipy.interpolate import interp1d
+
+XCALIBU_DIRBASE = os.path.dirname(os.path.realpath(__file__))
+
+log = logging.getLogger("BENCH_XCALIBU")
+
+
+def _duration(func, *args, repeat=3):
+    """
+    Return the best duration (in seconds) of <repeat> calls of func(*args).
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def _scalar_loop(calib, x_arr):
+    """
+    Reference: evaluation of an array value by value.
+    """
+    return numpy.array([calib.get_y_scalar(x) for x in x_arr])
+
+
+def bench_get_y_array(nb_values=100000):
+    """
+    Compare whole-array evaluation with value-by-value evaluation.
+    """
+    print(f"-------------- get_y_array() vs get_y_scalar() loop ({nb_values} values) --------------")
+
+    calibs = {
+        "TABLE INTERPOLATION": Xcalibu(
+            calib_file_name=os.path.join(XCALIBU_DIRBASE, "examples/hpz_ring_Ry.calib"),
+            reconstruction_method="INTERPOLATION",
+        ),
+        "TABLE POLYFIT": Xcalibu(
+            calib_file_name=os.path.join(XCALIBU_DIRBASE, "examples/cubic.calib"),
+            fit_order=3,
+            reconstruction_method="POLYFIT",
+        ),
+        "POLY": Xcalibu(
+            calib_file_name=os.path.join(XCALIBU_DIRBASE, "examples/qepro.calib")
+        ),
+    }
+
+    for name, calib in calibs.items():
+        x_arr = numpy.linspace(calib.min_x(), calib.max_x(), nb_values)
+
+        t_array = _duration(calib.get_y_array, x_arr)
+        t_loop = _duration(_scalar_loop, calib, x_arr, repeat=1)
+
+        numpy.testing.assert_allclose(calib.get_y_array(x_arr), _scalar_loop(calib, x_arr), rtol=1e-12)
+
+        print(
+            f"{name:>20s}: array={t_array:.6f}s  loop={t_loop:.6f}s  speedup={t_loop / t_array:8.1f}"
+        )
+
+
+def _poly_pow_loop(coeffs, x):
+    """
+    Reference: term by term evaluation of a polynomial (former calc_poly_value()).
+    """
+    y = 0
+    for ii in range(len(coeffs)):
+        y = y + coeffs[ii] * pow(x, ii)
+    return y
+
+
+def bench_poly_kernel(orders=range(1, 13), sizes=(1, 1000, 100000, 10000000)):
+    """
+    Compare Horner kernel with term by term evaluation.
+    """
+    print("-------------- poly_horner() vs pow() loop --------------")
+    rng = numpy.random.default_rng(0)
+
+    for size in sizes:
+        x = 0.5 if size == 1 else numpy.linspace(-1, 1, size)
+        out = None if size == 1 else numpy.empty(size)
+        repeat = 1 if size > 100000 else 5
+        for order in orders:
+            coeffs = rng.uniform(-1, 1, order + 1)
+
+            t_horner = _duration(poly_horner, coeffs, x, out, repeat=repeat)
+            t_loop = _duration(_poly_pow_loop, coeffs, x, repeat=repeat)
+
+            print(
+                f"size={size:>9d} order={order:>2d}: horner={t_horner:.6f}s  "
+                f"loop={t_loop:.6f}s  speedup={t_loop / t_horner:6.1f}"
+            )
+
+
+def bench_uniform_grid(sizes=(10, 1000, 100000, 1000000), nb_values=100000):
+    """
+    Compare uniform grid engine with scipy interp1d on equally spaced tables.
+    """
+    print(f"-------------- uniform grid vs interp1d ({nb_values} values) --------------")
+    rng = numpy.random.default_rng(0)
+
+    for size in sizes:
+        x_raw = numpy.linspace(0, 100, size)
+        y_raw = rng.normal(size=size)
+        uniform = UniformGridInterpolator(x_raw, y_raw)
+        scipy_func = interp1d(x_raw, y_raw, bounds_error=False)
+
+        x_arr = rng.uniform(0, 100, nb_values)
+        x_scalars = list(x_arr[:1000])
+
+        t_uni = _duration(uniform, x_arr)
+        t_scipy = _duration(scipy_func, x_arr)
+        t_uni_s = _duration(lambda: [uniform(x) for x in x_scalars])
+        t_scipy_s = _duration(lambda: [scipy_func(x) for x in x_scalars])
+
+        print(
+            f"size={size:>8d}: array: uniform={t_uni:.6f}s interp1d={t_scipy:.6f}s "
+            f"speedup={t_scipy / t_uni:5.1f} | 1000 scalars: uniform={t_uni_s:.6f}s "
+            f"interp1d={t_scipy_s:.6f}s speedup={t_scipy_s / t_uni_s:5.1f}"
+        )
+
+
+def bench_segment_hint(size=100000, nb_values=20000):
+    """
+    Replay scans of scalar lookups on a non equally spaced table: compare
+    segment hint engine with interp1d.
+    """
+    print(f"-------------- scan replay on a {size} points table ({nb_values} get_y() calls) --------------")
+    rng = numpy.random.default_rng(0)
+
+    calib = Xcalibu()
+    calib.set_calib_name("SCAN")
+    calib.set_calib_type("TABLE")
+    calib.set_reconstruction_method("INTERPOLATION")
+    calib.set_raw_x(numpy.sort(rng.uniform(0, 100, size)))
+    calib.set_raw_y(numpy.cumsum(rng.uniform(0, 1, size)))
+    calib.compute_interpolation()
+    hint_func = calib.ifunc
+    scipy_func = interp1d(calib.x_raw, calib.y_raw, bounds_error=False)
+
+    sweep = numpy.linspace(1, 99, nb_values)
+    scans = {
+        "fine step scan": numpy.linspace(50, 51, nb_values),
+        "monotonic sweep": sweep,
+        "back-and-forth": numpy.concatenate([sweep[::2], sweep[::-2]]),
+        "random access": rng.permutation(sweep),
+    }
+
+    def _scan(values):
+        for x in values:
+            calib.get_y(x)
+
+    for name, values in scans.items():
+        calib.ifunc = hint_func
+        t_hint = _duration(_scan, values)
+        calib.ifunc = scipy_func
+        t_scipy = _duration(_scan, values)
+        print(
+            f"{name:>16s}: segment hint={len(values) / t_hint:10.0f} lookups/s  "
+            f"interp1d={len(values) / t_scipy:10.0f} lookups/s  speedup={t_scipy / t_hint:5.1f}"
+        )
+
+    calib.ifunc = hint_func
+
+
+def bench_piecewise_poly(sizes=(10, 1000, 100000, 1000000), nb_values=100000, kind="cubic"):
+    """
+    Compare compiled piecewise polynomials with scipy interp1d.
+    """
+    print(f"-------------- piecewise poly vs interp1d ({kind}, {nb_values} values) --------------")
+    rng = numpy.random.default_rng(0)
+
+    for size in sizes:
+        x_raw = numpy.sort(rng.uniform(0, 100, size))
+        y_raw = numpy.cumsum(rng.uniform(0, 1, size))
+
+        t_build_pp = _duration(PiecewisePolyInterpolator, x_raw, y_raw, kind, repeat=1)
+        t_build_scipy = _duration(interp1d, x_raw, y_raw, kind, repeat=1)
+        compiled = PiecewisePolyInterpolator(x_raw, y_raw, kind=kind)
+        scipy_func = interp1d(x_raw, y_raw, kind=kind, bounds_error=False)
+
+        x_arr = rng.uniform(x_raw[0], x_raw[-1], nb_values)
+        x_scalars = list(x_arr[:1000])
+
+        t_pp = _duration(compiled, x_arr)
+        t_scipy = _duration(scipy_func, x_arr)
+        t_pp_s = _duration(lambda: [compiled(x) for x in x_scalars])
+        t_scipy_s = _duration(lambda: [scipy_func(x) for x in x_scalars])
+
+        print(
+            f"size={size:>8d}: build: pp={t_build_pp:.4f}s interp1d={t_build_scipy:.4f}s | "
+            f"array: pp={t_pp:.6f}s interp1d={t_scipy:.6f}s speedup={t_scipy / t_pp:5.1f} | "
+            f"1000 scalars: pp={t_pp_s:.6f}s interp1d={t_scipy_s:.6f}s speedup={t_scipy_s / t_pp_s:5.1f}"
+        )
+
+
+def bench_poly_reverse(nb_values=100000):
+    """
+    Compare NEWTON reverse calculation of a POLY calibration with interpolation
+    of sampled tables of increasing size.
+    """
+    print(f"-------------- POLY reverse: NEWTON vs sampled table ({nb_values} values) --------------")
+
+    calib_file = os.path.join(XCALIBU_DIRBASE, "examples/u32a_poly.calib")
+    x_arr = None
+
+    for nb_points in (20, 400, 4000):
+        calib = Xcalibu(
+            calib_file_name=calib_file, reconstruction_method="INTERPOLATION", samp_nbp=nb_points
+        )
+        if x_arr is None:
+            x_arr = numpy.linspace(calib.min_x(), calib.max_x(), nb_values)
+            y_arr = calib.get_y(x_arr)
+
+        calib.set_poly_reverse_method("INTERPOLATION")
+        t_interp = _duration(calib.get_x, y_arr)
+        err_interp = numpy.nanmax(numpy.abs(calib.get_x(y_arr) - x_arr))
+
+        calib.set_poly_reverse_method("NEWTON")
+        t_newton = _duration(calib.get_x, y_arr)
+        x_newton, iterations = calib.calc_newton_reverse_value(y_arr, return_iterations=True)
+        err_newton = numpy.max(numpy.abs(x_newton - x_arr))
+
+        print(
+            f"{nb_points:>5d} points: INTERPOLATION {t_interp:.6f}s max err={err_interp:.3g} | "
+            f"NEWTON {t_newton:.6f}s max err={err_newton:.3g} "
+            f"iterations max={iterations.max()} mean={iterations.mean():.2f}"
+        )
+
+
+def bench_adaptive_sampling(tolerances=(1e-3, 1e-6, 1e-9), kind="linear"):
+    """
+    Number of points and build time of reverse POLY tables sampled for a max error,
+    compared with the equally spaced table giving the same max error.
+    """
+    print(f"-------------- adaptive sampling of reverse POLY tables ({kind}) --------------")
+
+    for calib_file in ("qepro.calib", "u32a_poly.calib", "poly.calib"):
+        calib_path = os.path.join(XCALIBU_DIRBASE, "examples", calib_file)
+        for tolerance in tolerances:
+            t0 = time.perf_counter()
+            calib = Xcalibu(
+                calib_file_name=calib_path,
+                reconstruction_method="INTERPOLATION",
+                interpol_kind=kind,
+                samp_tolerance=tolerance,
+            )
+            t_build = time.perf_counter() - t0
+            calib.set_poly_reverse_method("INTERPOLATION")
+            nb_adaptive = len(calib.x_raw)
+
+            x_arr = numpy.linspace(calib.min_x(), calib.max_x(), 1000001)
+            y_arr = calib.get_y(x_arr)
+            err = numpy.max(numpy.abs(calib.get_x(y_arr) - x_arr))
+
+            # Equally spaced table with same max error.
+            calib.set_sampling_tolerance(None)
+            nb_points = 5
+            while True:
+                calib.set_sampling_nb_points(nb_points)
+                calib.compute_interpolation()
+                if numpy.max(numpy.abs(calib.get_x(y_arr) - x_arr)) <= err or nb_points > 2**22:
+                    break
+                nb_points *= 2
+
+            print(
+                f"{calib_file:>16s} tolerance={tolerance:.0e}: adaptive={nb_adaptive:>7d} points "
+                f"(max err={err:.3g}, built in {t_build:.4f}s)  equally spaced={nb_points:>8d} points"
+            )
+
+
+def bench_frames(shape=(2048, 2048), nb_frames=10):
+    """
+    Calibration of detector frames (pixel -> wavelength poly, per pixel gain table),
+    with and without a reused output buffer.
+    """
+    print(f"-------------- {nb_frames} frames of {shape[0]}x{shape[1]} pixels --------------")
+    rng = numpy.random.default_rng(0)
+
+    calibs = {
+        "POLY (qepro)": Xcalibu(
+            calib_file_name=os.path.join(XCALIBU_DIRBASE, "examples/qepro.calib")
+        ),
+        "TABLE (hpz_ring_Ry)": Xcalibu(
+            calib_file_name=os.path.join(XCALIBU_DIRBASE, "examples/hpz_ring_Ry.calib"),
+            reconstruction_method="INTERPOLATION",
+        ),
+    }
+
+    for name, calib in calibs.items():
+        frames = [
+            rng.uniform(calib.min_x(), calib.max_x(), shape) for _ in range(nb_frames)
+        ]
+        out = numpy.empty(shape)
+
+        t_new = _duration(lambda: [calib.get_y(frame) for frame in frames])
+        t_out = _duration(lambda: [calib.get_y(frame, out=out) for frame in frames])
+
+        print(
+            f"{name:>20s}: {nb_frames / t_new:7.1f} frames/s  "
+            f"with out= buffer: {nb_frames / t_out:7.1f} frames/s"
+        )
+
+
+def bench_buffers(nb_points=1_000_000):
+    """
+    get_y() on buffers coming from drivers (array.array, memoryview) vs numpy
+    arrays: contiguous float64 buffers are wrapped without copy.
+    """
+    print(f"-------------- get_y() on buffer inputs ({nb_points} values) --------------")
+    calib = Xcalibu(calib_file_name=os.path.join(XCALIBU_DIRBASE, "examples/qepro.calib"))
+
+    x_arr = numpy.linspace(0, 1023, nb_points)
+    x_buf = array.array("d", x_arr.tobytes())
+    out_arr = numpy.empty(nb_points)
+    out_buf = array.array("d", bytes(8 * nb_points))
+
+    wrapped = numpy.asarray(memoryview(x_buf))
+    print(f"memoryview wrapped without copy: {numpy.shares_memory(wrapped, numpy.frombuffer(x_buf))}")
+
+    t_ref = _duration(calib.get_y, x_arr)
+    t_copy = _duration(lambda: calib.get_y(numpy.array(x_buf)))
+    for name, func in [
+        ("ndarray", lambda: calib.get_y(x_arr)),
+        ("ndarray + explicit copy", lambda: calib.get_y(numpy.array(x_buf))),
+        ("memoryview", lambda: calib.get_y(memoryview(x_buf))),
+        ("array.array (returned as is)", lambda: calib.get_y(x_buf)),
+        ("ndarray out=ndarray", lambda: calib.get_y(x_arr, out=out_arr)),
+        ("memoryview out=array.array", lambda: calib.get_y(memoryview(x_buf), out=out_buf)),
+    ]:
+        _t = _duration(func)
+        print(f"{name:>30s}: {_t:.6f}s  ({_t / t_ref:4.2f} x ndarray)")
+    print(f"(explicit copy alone costs {t_copy - t_ref:.6f}s)")
+
+
+def _write_synthetic_table(file_name, nb_lines, file_format):
+    """
+    Write a TABLE calibration file of <nb_lines> data lines in <file_format> format.
+    """
+    x = numpy.linspace(0, 100, nb_lines)
+    y = numpy.sin(x)
+    with open(file_name, "w") as calib_file:
+        calib_file.write("# synthetic encoder table\n")
+        calib_file.write("CALIB_NAME = ENC\nCALIB_TYPE = TABLE\n\n")
+        if file_format == "ONE_COL":
+            numpy.savetxt(calib_file, y, fmt="%.9f")
+        elif file_format == "TWO_COLS":
+            numpy.savetxt(calib_file, numpy.column_stack((x, y)), fmt="%.6f %.9f")
+        else:
+            numpy.savetxt(calib_file, numpy.column_stack((x, y)), fmt="ENC[%.6f] = %.9f")
+
+
+def bench_load(max_lines=10**6):
+    """
+    load_calib() of the bundled examples and of synthetic TABLE files of
+    10^4 to <max_lines> lines in the 3 TABLE formats.
+    """
+    print("-------------- load_calib() of examples --------------")
+    for file_name in sorted(glob.glob(os.path.join(XCALIBU_DIRBASE, "examples", "*.calib"))):
+        # INTERPOLATION: no fit, only parsing is measured.
+        try:
+            _t = _duration(
+                lambda: Xcalibu(calib_file_name=file_name, reconstruction_method="INTERPOLATION")
+            )
+        except Exception as exc:
+            print(f"{os.path.basename(file_name):>30s}: not loadable ({exc!r})")
+            continue
+        print(f"{os.path.basename(file_name):>30s}: {_t * 1000:8.3f}ms")
+
+    print(f"-------------- load_calib() of synthetic tables (up to {max_lines} lines) --------------")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        nb_lines = 10**4
+        while nb_lines <= max_lines:
+            for file_format in ["ONE_COL", "TWO_COLS", "XCALIBU"]:
+                file_name = os.path.join(tmp_dir, f"{file_format}_{nb_lines}.calib")
+                _write_synthetic_table(file_name, nb_lines, file_format)
+                _t = _duration(
+                    lambda: Xcalibu(calib_file_name=file_name, reconstruction_method="INTERPOLATION"),
+                    repeat=1 if nb_lines >= 10**6 else 3,
+                )
+                print(
+                    f"{file_format:>10s} {nb_lines:>9d} lines: {_t:8.4f}s "
+                    f"({_t / nb_lines * 1e9:6.0f}ns/line)"
+                )
+                os.remove(file_name)
+            nb_lines *= 10
+
+
+def bench_cache(max_lines=10**6):
+    """
+    Construction of Xcalibu(calib_file_name=...) without cache, with a cold
+    cache (parsing + entry writing) and with a warm cache.
+    """
+    print(f"-------------- Xcalibu() construction: no cache / cold / warm (up to {max_lines} lines) --------------")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache = CalibCache(os.path.join(tmp_dir, "cache"))
+
+        files = [
+            (os.path.basename(file_name), file_name)
+            for file_name in sorted(glob.glob(os.path.join(XCALIBU_DIRBASE, "examples", "*.calib")))
+            if "unsorted" not in file_name
+        ]
+        nb_lines = 10**4
+        while nb_lines <= max_lines:
+            file_name = os.path.join(tmp_dir, f"TWO_COLS_{nb_lines}.calib")
+            _write_synthetic_table(file_name, nb_lines, "TWO_COLS")
+            files.append((f"TWO_COLS {nb_lines} lines", file_name))
+            nb_lines *= 10
+
+        for name, file_name in files:
+            for rec_method in ["INTERPOLATION", "POLYFIT"]:
+
+                def _construct(cache_dir=None):
+                    return Xcalibu(
+                        calib_file_name=file_name, reconstruction_method=rec_method, fit_order=3, cache_dir=cache_dir
+                    )
+
+                t_none = _duration(_construct)
+                t_cold = _duration(lambda: (cache.clear(), _construct(cache.cache_dir)))
+                t_warm = _duration(lambda: _construct(cache.cache_dir))
+                print(
+                    f"{name:>26s} {rec_method:>13s}: no cache={t_none * 1000:9.3f}ms  "
+                    f"cold={t_cold * 1000:9.3f}ms  warm={t_warm * 1000:9.3f}ms  ({t_none / t_warm:6.1f} x)"
+                )
+
+
+def bench_binary(max_lines=10**6):
+    """
+    Load time and peak of allocated memory (tracemalloc) of TABLE calibrations
+    in text (TWO_COLS) and binary (memory-mapped) formats.
+    """
+    print(f"-------------- text vs binary calibration files (up to {max_lines} points) --------------")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        nb_points = 10**4
+        while nb_points <= max_lines:
+            text_file = os.path.join(tmp_dir, f"table_{nb_points}.calib")
+            binary_file = os.path.join(tmp_dir, f"table_{nb_points}.bcalib")
+            _write_synthetic_table(text_file, nb_points, "TWO_COLS")
+            calib = Xcalibu(calib_file_name=text_file, reconstruction_method="INTERPOLATION")
+            calib.set_calib_file_name(binary_file)
+            calib.set_calib_file_format("BINARY")
+            _t_save = _duration(calib.save, repeat=1)
+            del calib
+
+            print(f"{nb_points:>9d} points (binary save: {_t_save:.4f}s)")
+            for name, file_name in [("text", text_file), ("binary", binary_file)]:
+                _size = os.path.getsize(file_name)
+
+                def _load():
+                    return Xcalibu(calib_file_name=file_name, reconstruction_method="INTERPOLATION")
+
+                _t = _duration(_load, repeat=1 if nb_points >= 10**6 else 3)
+                tracemalloc.start()
+                calib = _load()
+                _, _peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                _t_eval = _duration(calib.get_y, numpy.linspace(calib.min_x(), calib.max_x(), 10**5))
+                del calib
+                print(
+                    f"{name:>16s}: file={_size / 2**20:8.2f}MB  load={_t:8.4f}s  "
+                    f"peak alloc={_peak / 2**20:8.2f}MB  get_y(1e5 values)={_t_eval:.4f}s"
+                )
+            nb_points *= 10
+
+
+def bench_stream(max_lines=10**6):
+    """
+    Load time and peak of allocated memory (tracemalloc) of a TWO_COLS TABLE
+    calibration read from a file, a gzip compressed file and a string.
+    """
+    print(f"-------------- streamed loading (up to {max_lines} points) --------------")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        nb_points = 10**4
+        while nb_points <= max_lines:
+            text_file = os.path.join(tmp_dir, f"table_{nb_points}.calib")
+            _write_synthetic_table(text_file, nb_points, "TWO_COLS")
+            with open(text_file) as f:
+                text = f.read()
+            with gzip.open(text_file + ".gz", "wt") as f:
+                f.write(text)
+
+            print(f"{nb_points:>9d} points (text size: {len(text) / 2**20:.2f}MB)")
+            for name, kwargs in [
+                ("file", {"calib_file_name": text_file}),
+                ("gzip file", {"calib_file_name": text_file + ".gz"}),
+                ("string", {"calib_string": text}),
+            ]:
+
+                def _load():
+                    return Xcalibu(reconstruction_method="INTERPOLATION", **kwargs)
+
+                _t = _duration(_load, repeat=1 if nb_points >= 10**6 else 3)
+                tracemalloc.start()
+                _load()
+                _, _peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                print(f"{name:>16s}: load={_t:8.4f}s  peak alloc={_peak / 2**20:8.2f}MB")
+            del text
+            nb_points *= 10
+
+
+def bench_lazy(max_lines=10**5, nb_calibs=100):
+    """
+    Construction time of <nb_calibs> TABLE calibrations with eager and lazy loading.
+    """
+    print(f"-------------- eager vs lazy loading ({nb_calibs} calibrations of {max_lines} points) --------------")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_names = []
+        for ii in range(nb_calibs):
+            file_names.append(os.path.join(tmp_dir, f"table_{ii}.calib"))
+            _write_synthetic_table(file_names[-1], max_lines, "TWO_COLS")
+
+        for lazy in (False, True):
+            t0 = time.perf_counter()
+            calibs = [
+                Xcalibu(calib_file_name=file_name, reconstruction_method="INTERPOLATION", lazy=lazy)
+                for file_name in file_names
+            ]
+            _t_construct = time.perf_counter() - t0
+            t0 = time.perf_counter()
+            calibs[0].get_y(calibs[0].min_x())
+            _t_first = time.perf_counter() - t0
+            print(
+                f"{'lazy' if lazy else 'eager':>16s}: construction={_t_construct:8.4f}s "
+                f"({_t_construct / nb_calibs * 1000:.3f}ms per calib)  first get_y={_t_first * 1000:.3f}ms"
+            )
+
+
+def bench_save(max_lines=10**6):
+    """
+    Save throughput of TABLE calibrations in XCALIBU and TWO_COLS formats:
+    point by point formatting (previous writer) vs bulk formatting with
+    default ("%f") and ROUND_TRIP precisions.
+    """
+    print(f"-------------- save (up to {max_lines} points) --------------")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        nb_points = 10**3
+        while nb_points <= max_lines:
+            x = numpy.linspace(0, 100, nb_points)
+            calib = Xcalibu(calib_name="BENCH", calib_type="TABLE", reconstruction_method="INTERPOLATION")
+            calib.set_raw_x(x)
+            calib.set_raw_y(numpy.sin(x))
+            calib.set_calib_file_name(os.path.join(tmp_dir, "save.calib"))
+            _repeat = 1 if nb_points >= 10**6 else 3
+            for file_format in ("XCALIBU", "TWO_COLS"):
+                calib.set_calib_file_format(file_format)
+
+                def _save_point_by_point():
+                    with open(calib.get_calib_file_name(), "w") as _sf:
+                        if file_format == "XCALIBU":
+                            for ii in range(x.size):
+                                _sf.write("%s[%f] = %f\n" % ("BENCH", calib.x_raw[ii], calib.y_raw[ii]))
+                        else:
+                            for ii in range(x.size):
+                                _sf.write("%f %f\n" % (calib.x_raw[ii], calib.y_raw[ii]))
+
+                _t_old = _duration(_save_point_by_point, repeat=_repeat)
+                calib.set_save_precision(None)
+                _t_bulk = _duration(calib.save, repeat=_repeat)
+                calib.set_save_precision("ROUND_TRIP")
+                _t_round_trip = _duration(calib.save, repeat=_repeat)
+                print(
+                    f"{nb_points:>9d} points {file_format:>9s}: point by point={_t_old:8.4f}s  "
+                    f"bulk %f={_t_bulk:8.4f}s ({nb_points / _t_bulk / 1e6:5.2f} Mpts/s)  "
+                    f"bulk ROUND_TRIP={_t_round_trip:8.4f}s ({nb_points / _t_round_trip / 1e6:5.2f} Mpts/s)"
+                )
+            nb_points *= 10
+
+
+def bench_journal(max_lines=10**6, nb_edits=20):
+    """
+    Time to persist <nb_edits> point insertions in TABLE calibrations:
+    save() after each insert vs journal of edits.
+    """
+    print(f"-------------- persisted edits: save vs journal (up to {max_lines} points) --------------")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        nb_points = 10**3
+        while nb_points <= max_lines:
+            file_name = os.path.join(tmp_dir, f"table_{nb_points}.calib")
+            _write_synthetic_table(file_name, nb_points, "TWO_COLS")
+            calib = Xcalibu(calib_file_name=file_name, reconstruction_method="INTERPOLATION")
+            _new_x = numpy.linspace(calib.min_x(), calib.max_x(), nb_edits) + 1e-7
+
+            t0 = time.perf_counter()
+            for x in _new_x:
+                calib.insert(x, 0.0)
+                calib.save()
+            _t_save = time.perf_counter() - t0
+
+            calib.set_journal(True, max_size=float("inf"))
+            t0 = time.perf_counter()
+            for x in _new_x + 1e-7:
+                calib.insert(x, 0.0)
+            _t_journal = time.perf_counter() - t0
+            t0 = time.perf_counter()
+            calib.compact_journal()
+            _t_compact = time.perf_counter() - t0
+            print(
+                f"{nb_points:>9d} points: save per edit={_t_save / nb_edits * 1000:10.3f}ms  "
+                f"journal per edit={_t_journal / nb_edits * 1000:8.3f}ms  compaction={_t_compact * 1000:10.3f}ms"
+            )
+            nb_points *= 10
+
+
+def bench_bundle(max_lines=10**3, max_calibs=1000):
+    """
+    Time to open a bundle and load its last calibration (<max_lines> points TABLE)
+    vs number of calibrations in the bundle, compared to loading a single file.
+    """
+    print(f"-------------- bundle of up to {max_calibs} calibrations of {max_lines} points --------------")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_names = []
+        for ii in range(max_calibs):
+            file_names.append(os.path.join(tmp_dir, f"table_{ii}.calib"))
+            _write_synthetic_table(file_names[-1], max_lines, "TWO_COLS")
+            with open(file_names[-1]) as calib_file:
+                text = calib_file.read()
+            with open(file_names[-1], "w") as calib_file:
+                calib_file.write(text.replace("CALIB_NAME = ENC", f"CALIB_NAME = ENC_{ii}", 1))
+
+        _t_file = _duration(lambda: Xcalibu(calib_file_name=file_names[-1], reconstruction_method="INTERPOLATION"))
+        print(f"{'single file':>18s}: load={_t_file * 1000:8.3f}ms")
+
+        nb_calibs = 10
+        while nb_calibs <= max_calibs:
+            bundle_file = os.path.join(tmp_dir, f"bundle_{nb_calibs}.xcb")
+            t0 = time.perf_counter()
+            CalibBundle.pack(bundle_file, file_names[:nb_calibs])
+            _t_pack = time.perf_counter() - t0
+            _name = f"ENC_{nb_calibs - 1}"
+            _t_open = _duration(lambda: CalibBundle(bundle_file))
+            bundle = CalibBundle(bundle_file)
+            _t_load = _duration(lambda: bundle.load(_name, reconstruction_method="INTERPOLATION"))
+            print(
+                f"{nb_calibs:>7d} calibs: pack={_t_pack:8.4f}s  open bundle={_t_open * 1000:8.3f}ms  "
+                f"load last calib={_t_load * 1000:8.3f}ms"
+            )
+            nb_calibs *= 10
+
+
+def bench_registry(max_lines=10**4, nb_calibs=500):
+    """
+    Loading time of a directory of <nb_calibs> TABLE calibrations (<max_lines> points,
+    POLYFIT) by CalibRegistry with thread and process pools of 1 to cpu_count() workers.
+    """
+    print(f"-------------- registry of {nb_calibs} calibrations of {max_lines} points --------------")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for ii in range(nb_calibs):
+            file_name = os.path.join(tmp_dir, f"table_{ii}.calib")
+            _write_synthetic_table(file_name, max_lines, "TWO_COLS")
+            with open(file_name) as calib_file:
+                text = calib_file.read()
+            with open(file_name, "w") as calib_file:
+                calib_file.write(text.replace("CALIB_NAME = ENC", f"CALIB_NAME = ENC_{ii}", 1))
+
+        nb_workers_list = sorted({1, 2, 4, os.cpu_count() or 1})
+        for executor in ("thread", "process"):
+            for nb_workers in nb_workers_list:
+                t0 = time.perf_counter()
+                registry = CalibRegistry(
+                    tmp_dir, max_workers=nb_workers, executor=executor,
+                    reconstruction_method="POLYFIT", fit_order=3,
+                )
+                _t = time.perf_counter() - t0
+                assert len(registry) == nb_calibs and not registry.errors()
+                print(f"{executor:>8s} pool, {nb_workers:>3d} workers: {_t:8.4f}s")
+
+
+def bench_incremental_fit(max_lines=10**6, nb_edits=100, fit_order=3):
+    """
+    Time of insert() + delete() of points in POLYFIT TABLE calibrations:
+    full fit after each edit vs incremental update of the fits.
+    """
+    print(f"-------------- POLYFIT edits: full vs incremental fit (up to {max_lines} points) --------------")
+    nb_points = 10**3
+    while nb_points <= max_lines:
+        x = numpy.linspace(0, 100, nb_points)
+        calib = Xcalibu(calib_name="BENCH", calib_type="TABLE", reconstruction_method="POLYFIT", fit_order=fit_order)
+        calib.set_raw_x(x)
+        calib.set_raw_y(0.01 * x**2 + numpy.sin(x))
+        calib.fit()
+        _new_x = numpy.linspace(1, 99, nb_edits) + 1e-6
+
+        def _edit():
+            for xx in _new_x:
+                calib.insert(xx, 0.01 * xx**2)
+            for xx in _new_x:
+                calib.delete(x=xx)
+
+        _edit()  # builds incremental fit state
+        _t_incremental = _duration(_edit, repeat=1)
+
+        def _full_fit(self=calib):
+            Xcalibu.fit(self)
+            self._incremental_fit = None
+
+        calib._update_fit = lambda added=(), removed=(): _full_fit()
+        _t_full = _duration(_edit, repeat=1)
+        print(
+            f"{nb_points:>9d} points: full fit per edit={_t_full / (2 * nb_edits) * 1000:9.3f}ms  "
+            f"incremental per edit={_t_incremental / (2 * nb_edits) * 1000:9.3f}ms"
+        )
+        nb_points *= 10
+
+
+def bench_auto_fit_order(max_lines=10**6, max_workers=(1, None)):
+    """
+    Time of the automatic selection of the fit order (select_fit_order()) in a
+    pool of 1 thread vs default pool ; time of set_fit_order() + fit() afterwards
+    (fits reused) vs fit() of a new order.
+    """
+    print(f"-------------- automatic fit order selection (up to {max_lines} points) --------------")
+    nb_points = 10**3
+    while nb_points <= max_lines:
+        x = numpy.linspace(0, 100, nb_points)
+        calib = Xcalibu(calib_name="BENCH", calib_type="TABLE", reconstruction_method="POLYFIT", fit_order=3)
+        calib.set_raw_x(x)
+        calib.set_raw_y(0.01 * x**2 + 0.001 * numpy.sin(x))
+        _times = []
+        for workers in max_workers:
+            calib._order_fits = {}
+            _times.append(_duration(calib.select_fit_order, None, AUTO_FIT_NB_FOLDS, workers, repeat=1))
+        _order = calib.get_fit_order()
+        calib.fit()
+        _t_switch = _duration(calib.set_fit_order, AUTO_FIT_MAX_ORDER, repeat=1)
+        calib._order_fits = {}
+
+        def _refit():
+            calib.set_fit_order(AUTO_FIT_MAX_ORDER - 1)
+            calib.fit()
+
+        _t_refit = _duration(_refit, repeat=1)
+        print(
+            f"{nb_points:>9d} points: select (1 thread)={_times[0] * 1000:9.3f}ms  "
+            f"select (pool)={_times[1] * 1000:9.3f}ms  order={_order}  "
+            f"switch order={_t_switch * 1000:7.3f}ms  new order fit={_t_refit * 1000:9.3f}ms"
+        )
+        nb_points *= 10
+
+
+def bench_fit_tables(nb_tables=(10, 100, 1000, 10000), nb_points=100, fit_order=5):
+    """
+    Time of fitting <nb_tables> TABLE + POLYFIT calibrations of <nb_points> points:
+    loop of Xcalibu.fit() vs one fit_tables() call (batched least squares and
+    coefficient conversions). Measured: 3.5x faster for 10 tables, 7 to 11x for
+    100 to 10000 tables.
+    """
+    print(f"-------------- fit of tables of {nb_points} points: fit() loop vs fit_tables() --------------")
+    x = numpy.linspace(14, 30, nb_points)
+    rng = numpy.random.default_rng(0)
+    for nb in nb_tables:
+        calibs = []
+        for ii in range(nb):
+            calib = Xcalibu(calib_name=f"BENCH_{ii}", calib_type="TABLE", reconstruction_method="POLYFIT", fit_order=fit_order)
+            calib.set_raw_x(x)
+            calib.set_raw_y(0.01 * x**2 + rng.normal(0, 1e-3, nb_points))
+            calibs.append(calib)
+
+        def _loop():
+            for calib in calibs:
+                calib._order_fits = {}
+                calib.fit()
+
+        _t_loop = _duration(_loop, repeat=1)
+        _t_batch = _duration(fit_tables, calibs, repeat=1)
+        print(
+            f"{nb:>6d} tables: fit() loop={_t_loop * 1000:10.3f}ms  fit_tables()={_t_batch * 1000:10.3f}ms  "
+            f"speedup={_t_loop / _t_batch:6.1f}"
+        )
+
+
+def bench_reverse_fit(orders=(3, 6, 9, 12), nb_points=10000, nb_values=1000000):
+    """
+    Reverse fit of a gap (mm) -> energy (keV) like table: numpy.polyfit of raw Y values
+    (former reverse fit, evaluated by Horner scheme) vs Chebyshev fit of scaled Y
+    (evaluated by Clenshaw recurrence): conditioning, max round trip error, evaluation time.
+    """
+    print(f"-------------- reverse fit: raw polyfit vs scaled Chebyshev fit ({nb_values} values) --------------")
+    x = numpy.linspace(14, 30, nb_points)
+    y = 3 + 0.2 * x + 0.001 * x**2
+    y_values = numpy.linspace(y[0], y[-1], nb_values)
+    for order in orders:
+        calib = Xcalibu(calib_name="BENCH", calib_type="TABLE", reconstruction_method="POLYFIT", fit_order=order)
+        calib.set_raw_x(x)
+        calib.set_raw_y(y)
+        calib.fit()
+        info = calib.get_reverse_fit_info()
+        _raw_coeffs = numpy.polyfit(y, x, order)[::-1]
+        _raw_error = numpy.max(numpy.abs(poly_horner(_raw_coeffs, calib.calc_poly_value(x)) - x))
+        _t_raw = _duration(poly_horner, _raw_coeffs, y_values)
+        _t_scaled = _duration(calib.calc_reverse_value, y_values)
+        print(
+            f"order {order:2d}: condition raw={info['raw_condition']:9.3g} scaled={info['condition']:6.3g}  "
+            f"round trip error raw={_raw_error:9.3g} scaled={info['round_trip_error']:9.3g}  "
+            f"eval raw={_t_raw * 1000:7.3f}ms scaled={_t_scaled * 1000:7.3f}ms"
+        )
+
+
+def bench_fit_diagnostics(max_lines=10**6, nb_fitted=(50, 1000), fit_order=5):
+    """
+    Time of fit() of a POLYFIT table: fit only (fitted points computed when
+    needed) vs fit + fitted points (x_fitted ...) of <nb_fitted> points vs fit +
+    former eager computation of 50 fitted points (scalar calls).
+    """
+    print(f"-------------- fit() with and without fitted points (up to {max_lines} points) --------------")
+    nb_points = 10**3
+    while nb_points <= max_lines:
+        x = numpy.linspace(14, 30, nb_points)
+        calib = Xcalibu(calib_name="BENCH", calib_type="TABLE", reconstruction_method="POLYFIT", fit_order=fit_order)
+        calib.set_raw_x(x)
+        calib.set_raw_y(3 + 0.2 * x + 0.001 * x**2)
+
+        def _fit():
+            calib._order_fits = {}
+            calib.fit()
+
+        def _fit_eager():
+            _fit()
+            list(map(calib.calc_poly_value, numpy.linspace(calib.Xmin, calib.Xmax, 50)))
+            list(map(calib.calc_reverse_value, numpy.linspace(calib.Ymin, calib.Ymax, 50)))
+
+        _t_fit = _duration(_fit)
+        _line = f"{nb_points:>9d} points: fit={_t_fit * 1000:9.3f}ms  "
+        for nb in nb_fitted:
+            calib.set_fitted_nb_points(nb)
+            _t_fitted = _duration(lambda: (_fit(), calib.y_fitted))
+            _line += f"fit+{nb} fitted points={_t_fitted * 1000:9.3f}ms  "
+        _t_eager = _duration(_fit_eager)
+        print(_line + f"fit+former eager points={_t_eager * 1000:9.3f}ms")
+        nb_points *= 10
+
+
+BENCHMARKS = {
+    "get_y_array": bench_get_y_array,
+    "poly_kernel": bench_poly_kernel,
+    "uniform_grid": bench_uniform_grid,
+    "segment_hint": bench_segment_hint,
+    "piecewise_poly": bench_piecewise_poly,
+    "poly_reverse": bench_poly_reverse,
+    "adaptive_sampling": bench_adaptive_sampling,
+    "frames": bench_frames,
+    "buffers": bench_buffers,
+    "load": bench_load,
+    "cache": bench_cache,
+    "binary": bench_binary,
+    "stream": bench_stream,
+    "lazy": bench_lazy,
+    "save": bench_save,
+    "journal": bench_journal,
+    "bundle": bench_bundle,
+    "registry": bench_registry,
+    "incremental_fit": bench_incremental_fit,
+    "auto_fit_order": bench_auto_fit_order,
+    "fit_tables": bench_fit_tables,
+    "reverse_fit": bench_reverse_fit,
+    "fit_diagnostics": bench_fit_diagnostics,
+}
+
+
+def main():
+    from optparse import OptionParser
+
+    parser = OptionParser("bench_xcalibu.py")
+    parser.add_option(
+        "-b",
+        "--bench",
+        dest="bench",
+        type="string",
+        default=None,
+        help="Benchmark to run (default: all): %s" % ", ".join(BENCHMARKS),
+    )
+
+    parser.add_option(
+        "-n",
+        "--max-lines",
+        dest="max_lines",
+        type="int",
+        default=None,
+        help="Maximum number of lines of synthetic files for loading benchmarks (default: 10^6)",
+    )
+
+    # Gather options and arguments.
+    (options, args) = parser.parse_args()
+
+    logging.basicConfig(format="%(name)s - %(levelname)s - %(message)s", level=logging.ERROR)
+
+    benches = BENCHMARKS.values() if options.bench is None else [BENCHMARKS[options.bench]]
+    for bench in benches:
+        if options.max_lines is not None and "max_lines" in inspect.signature(bench).parameters:
+            bench(max_lines=options.max_lines)
+        else:
+            bench()
+
+
+if __name__ == "__main__":
+    main()
@@ -46,14 +46,30 @@ Ndp: https://www.desmos.com/calculator?lang=fr
 """
 
 
+import array
+import bz2
+import codecs
+import concurrent.futures
+import contextlib
+import glob
+import gzip
+import hashlib
+import io
+import itertools
+import json
 import logging
+import lzma
+import math
 import numbers
 import os
 import re
 import sys
+import threading
 import time
+import weakref
 
 import numpy
+from numpy.polynomial.chebyshev import Chebyshev
 from numpy.polynomial.polynomial import Polynomial
 from scipy import interpolate
 
@@ -63,7 +79,264 @@ LOG_FORMAT = "%(name)s - %(levelname)s - %(message)s"
 
 XCALIBU_DIRBASE = os.path.dirname(os.path.realpath(__file__))
 
-__all__ = ["Xcalibu", "XCalibError"]
+__all__ = [
+    "Xcalibu",
+    "XCalibError",
+    "CalibCache",
+    "CalibBundle",
+    "CalibRegistry",
+    "LinearInterpolator",
+    "PiecewisePolyInterpolator",
+    "SegmentLocator",
+    "UniformGridInterpolator",
+    "poly_horner",
+    "poly_clenshaw",
+    "polyfit_stack",
+    "polyfit_stack_scaled",
+    "scaled_to_power",
+    "power_to_chebyshev",
+    "chebyshev_to_power",
+    "fit_tables",
+]
+
+
+# Calibration file patterns (see load_calib()).
+# Number as written in calibration files: 13.123000  -0.83e-02
+_NUMBER = r"[+-]?\d+\.?\d*[eE]?[+-]*\d*"
+# CALIB_<info> = <value>
+_CALIB_INFO_RE = re.compile(r"CALIB_(\w+)(?: )*=(?: )*(.+)")
+# 13.123000  (1 column format)
+_ONE_COL_RE = re.compile(r"^(%s)$" % _NUMBER)
+# 13.000000 15.941000  (2 columns format)
+_TWO_COLS_RE = re.compile(r"^(%s)(?:\s+)(%s)$" % (_NUMBER, _NUMBER))
+# C3 = 8.93556e-10  (POLY coefficient)
+_POLY_COEF_RE = re.compile(r"\s*C(\d+)\s*=\s*(%s)" % _NUMBER, re.M | re.I)
+# XCALIBU format pattern: U35M [13.000000] = 15.941000 (built with the name of the calib)
+_XCALIBU_PATTERN = r"%s(?:\s*)\[(.+)\](?:\s*)=(?:\s*)(.+)"
+# Whole line comment in a block of lines.
+_COMMENT_LINE_RE = re.compile(r"^[^\S\n]*(#[^\n]*?)[^\S\n]*$", re.M)
+# Empty line in a block of lines.
+_EMPTY_LINE_RE = re.compile(r"^[^\S\n]*$", re.M)
+# Characters allowed in a block of ONE_COL / TWO_COLS numbers (deleted by str.translate()).
+_NUMERIC_CHARS = str.maketrans("", "", "0123456789eE.+- \t\n\r\f\v")
+# Dot not preceded by a digit (.5 -.5 are not recognized by _NUMBER).
+_LEADING_DOT_RE = re.compile(r"\.(?<=[^0-9]\.)")
+
+
+# Binary calibration files (see Xcalibu._read_binary_calib()).
+BINARY_CALIB_MAGIC = b"# XCALIBU BINARY CALIBRATION 1"
+BINARY_CALIB_ALIGNMENT = 4096  # data columns start on page boundaries
+
+
+def is_binary_calib_file(file_name):
+    """
+    Return True if <file_name> is a binary calibration file.
+    """
+    try:
+        with open(file_name, "rb") as calib_file:
+            return calib_file.read(len(BINARY_CALIB_MAGIC)) == BINARY_CALIB_MAGIC
+    except OSError:
+        return False
+
+
+# Size of the chunks of calibration text parsed at once when loading (characters / lines).
+LOAD_CHUNK_SIZE = 2**20
+LOAD_CHUNK_LINES = 2**15
+
+# Magic numbers of compressed calibration files.
+_COMPRESSIONS = [(b"\x1f\x8b", gzip), (b"BZh", bz2), (b"\xfd7zXZ\x00", lzma)]
+# Compression of saved text calibration files, by file name extension.
+_COMPRESSION_EXTENSIONS = {".gz": gzip, ".bz2": bz2, ".xz": lzma}
+
+
+def open_calib_file(file_name):
+    """
+    Open text calibration file <file_name> for reading.
+    gzip, bzip2 and xz compressed files are decompressed on the fly.
+    """
+    with open(file_name, "rb") as calib_file:
+        _magic = calib_file.read(6)
+    for magic, module in _COMPRESSIONS:
+        if _magic.startswith(magic):
+            return module.open(file_name, mode="rt")
+    return open(file_name, mode="r")
+
+
+def iter_line_chunks(source, chunk_size=None, chunk_lines=None):
+    """
+    Yield lists of lines (without end of line characters) of <source>:
+    * string: split by chunks of about <chunk_size> characters (default: LOAD_CHUNK_SIZE)
+    * file-like object: read by chunks of <chunk_size> characters (or bytes, decoded as utf-8)
+    * iterable of lines (str or bytes): grouped by <chunk_lines> lines (default: LOAD_CHUNK_LINES)
+    Only a chunk of the source is in memory at a time.
+    """
+    chunk_size = chunk_size or LOAD_CHUNK_SIZE
+    chunk_lines = chunk_lines or LOAD_CHUNK_LINES
+    if isinstance(source, str):
+        start = 0
+        while start < len(source):
+            end = source.find("\n", start + chunk_size)
+            if end == -1:
+                end = len(source)
+            yield source[start:end].split("\n")
+            start = end + 1
+
+    elif hasattr(source, "read"):
+        decoder = None
+        rest = ""
+        while True:
+            data = source.read(chunk_size)
+            if not data:
+                break
+            if isinstance(data, bytes):
+                if decoder is None:
+                    decoder = codecs.getincrementaldecoder("utf-8")()
+                data = decoder.decode(data)
+            data = rest + data
+            end = data.rfind("\n")
+            if end == -1:
+                rest = data
+                continue
+            rest = data[end + 1:]
+            yield data[:end].split("\n")
+        if decoder is not None:
+            rest += decoder.decode(b"", final=True)
+        if rest:
+            yield [rest]
+
+    else:
+        lines = iter(source)
+        while True:
+            chunk = list(itertools.islice(lines, chunk_lines))
+            if not chunk:
+                break
+            yield [
+                (line.decode() if isinstance(line, bytes) else line).rstrip("\r\n") for line in chunk
+            ]
+
+
+# Journal of insert / delete edits of a TABLE calibration file: <calib file name>.journal
+JOURNAL_SUFFIX = ".journal"
+JOURNAL_MAX_SIZE = 2**20  # default size (bytes) above which journal is compacted into the calib file
+
+# Number of points formatted at once when saving a calibration.
+SAVE_CHUNK_POINTS = 2**16
+
+
+def format_numbers(values, precision=None):
+    """
+    Return the list of strings of float <values> (formatted all at once).
+    <precision>:
+    * None: 6 decimals ("%f")
+    * "ROUND_TRIP": shortest strings read back as the same floats
+    * int: number of significant digits ("%.<precision>g")
+    """
+    values = numpy.asarray(values, dtype=float).ravel().tolist()
+    if precision is None:
+        return list(map("%f".__mod__, values))
+    if precision == "ROUND_TRIP":
+        return list(map(float.__repr__, values))
+    return list(map(("%%.%dg" % precision).__mod__, values))
+
+
+@contextlib.contextmanager
+def atomic_open(file_name, mode="w", fsync=False):
+    """
+    Open a temporary file to write <file_name> with: it replaces <file_name> only
+    once completely written (and flushed to disk if <fsync>), else it is removed.
+    """
+    _tmp_file_name = f"{file_name}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(_tmp_file_name, mode=mode) as _file:
+            yield _file
+            if fsync:
+                _file.flush()
+                os.fsync(_file.fileno())
+        os.replace(_tmp_file_name, file_name)
+    except BaseException:
+        try:
+            os.remove(_tmp_file_name)
+        except OSError:
+            pass
+        raise
+
+    if fsync and hasattr(os, "O_DIRECTORY"):
+        # Rename itself is on disk once the directory is synced.
+        _dir_fd = os.open(os.path.dirname(os.path.abspath(file_name)), os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(_dir_fd)
+        finally:
+            os.close(_dir_fd)
+
+
+def _json_number(value):
+    """
+    Return <value> (python or numpy number or None) as a json compatible number.
+    """
+    return None if value is None else value.item() if isinstance(value, numpy.generic) else value
+
+
+def _as_input_array(values):
+    """
+    Wrap <values> into a numpy array to be evaluated as a whole.
+    <values>: numpy array, buffer-protocol object (array.array, memoryview, ...)
+              or sequence of numbers (list, tuple).
+
+    Buffers are wrapped without copy (a copy is only done if a conversion to float is needed).
+    Return the array and a function converting a result array back into the
+    kind of container of <values> (list, tuple, array.array ; numpy array otherwise).
+    """
+    if isinstance(values, numpy.ndarray):
+        return values, None
+
+    if isinstance(values, (str, bytes, bytearray)):
+        raise TypeError(f"Type of input is invalid: {type(values)}")
+
+    try:
+        arr = numpy.asarray(values)
+    except (TypeError, ValueError):
+        raise TypeError(f"Type of input is invalid: {type(values)}")
+
+    if arr.dtype.kind not in "biuf":
+        raise TypeError(f"Type of input is invalid: {type(values)} of {arr.dtype}")
+
+    if isinstance(values, list):
+        restore = numpy.ndarray.tolist
+    elif isinstance(values, tuple):
+        def restore(result):
+            return tuple(result.tolist())
+    elif isinstance(values, array.array):
+        def restore(result):
+            _typecode = "f" if result.dtype == numpy.float32 else "d"
+            _restored = array.array(_typecode)
+            _restored.frombytes(memoryview(numpy.ascontiguousarray(result, dtype=_typecode)).cast("B"))
+            return _restored
+    else:
+        restore = None
+
+    return arr, restore
+
+
+def _as_output_array(out):
+    """
+    Wrap <out> into a numpy array the result is written in, without copy.
+    <out>: writable numpy array or writable buffer-protocol object (array.array, bytearray, ...).
+    Raise TypeError for any other <out> (list, read-only array or buffer...): a copy
+    would be written instead of <out>.
+    """
+    if isinstance(out, numpy.ndarray):
+        if not out.flags.writeable:
+            raise TypeError("out array is read-only")
+        return out
+
+    try:
+        _view = memoryview(out)
+    except TypeError:
+        raise TypeError(f"out must be a numpy array or a writable buffer, not {type(out)}")
+    if _view.readonly:
+        raise TypeError(f"out buffer is read-only: {type(out)}")
+
+    return numpy.asarray(_view)
 
 
 class XCalibError(Exception):
@@ -78,6 +351,988 @@ class XCalibError(Exception):
         return f"XCALIBU error: {self.message}"
 
 
+def poly_horner(coeffs, x, out=None):
+    """
+    Evaluate the polynomial  C0 + C1·x¹ + ... + CN·xᴺ  using Horner scheme.
+    <coeffs>: list or array: [C0, C1, .., CN] in order of increasing degree (numpy Polynomial rule)
+    <x>: float or numpy array of floats
+    <out>: optional numpy array (same shape as <x>) to store the result in ; can be <x>.
+
+    Return a float for a scalar <x> (and no <out>), a numpy array otherwise.
+    """
+    if out is None and not isinstance(x, numpy.ndarray):
+        y = coeffs[-1]
+        for coef in coeffs[-2::-1]:
+            y = y * x + coef
+        return y
+
+    x = numpy.asarray(x, dtype=float)
+    if out is None:
+        out = numpy.empty(x.shape)
+    elif numpy.shares_memory(out, x):
+        x = x.copy()  # out is initialized before x is read
+    out[...] = coeffs[-1]
+    for coef in coeffs[-2::-1]:
+        numpy.multiply(out, x, out=out)
+        numpy.add(out, coef, out=out)
+    return out
+
+
+def poly_clenshaw(coeffs, x, domain=None, out=None):
+    """
+    Evaluate the Chebyshev series  C0·T0(t) + C1·T1(t) + ... + CN·TN(t)  using Clenshaw recurrence.
+    <coeffs>: list or array: [C0, C1, .., CN] in order of increasing degree (numpy Chebyshev rule)
+    <x>: float or numpy array of floats
+    <domain>: [xmin, xmax]: interval mapped on [-1, 1] (t = x if None)
+    <out>: optional numpy array (same shape as <x>) to store the result in.
+
+    Return a float for a scalar <x> (and no <out>), a numpy array otherwise.
+    """
+    scalar = out is None and not isinstance(x, numpy.ndarray)
+    x = numpy.asarray(x, dtype=float)
+
+    if domain is not None:
+        _off, _scl = numpy.polynomial.polyutils.mapparms(domain, [-1, 1])
+        t = _off + _scl * x
+    else:
+        t = x
+
+    if out is None:
+        out = numpy.empty(x.shape)
+
+    if len(coeffs) == 1:
+        out[...] = coeffs[0]
+    else:
+        # b_k = c_k + 2·t·b_(k+1) - b_(k+2)
+        t2 = 2 * t
+        b1 = numpy.full(x.shape, coeffs[-1], dtype=float)
+        b2 = numpy.zeros(x.shape)
+        tmp = numpy.empty(x.shape)
+        for coef in coeffs[-2:0:-1]:
+            numpy.multiply(t2, b1, out=tmp)
+            numpy.subtract(tmp, b2, out=b2)
+            numpy.add(b2, coef, out=b2)
+            b1, b2 = b2, b1
+        # y = c_0 + t·b_1 - b_2
+        numpy.multiply(b1, t, out=out)
+        numpy.subtract(out, b2, out=out)
+        numpy.add(out, coeffs[0], out=out)
+
+    if scalar:
+        return float(out)
+    return out
+
+
+def _sorted_xy(x, y):
+    """
+    Return <x> and <y> as float arrays sorted by <x> (stable sort).
+    Already sorted arrays are not copied (memory-mapped data stay mapped).
+    """
+    x = numpy.asarray(x, dtype=float)
+    y = numpy.asarray(y, dtype=float)
+    if numpy.all(x[1:] >= x[:-1]):
+        return x, y
+    _order = numpy.argsort(x, kind="mergesort")
+    return x[_order], y[_order]
+
+
+class SegmentLocator:
+    """
+    Search of the segment [x[i] ; x[i+1][ of sorted breakpoints containing a value.
+
+    The segment found by the previous search (one per thread) is checked first,
+    then its 2 neighbours, before falling back to a bisection: sequential lookups
+    (scans) are found in constant time.
+    """
+
+    def __init__(self, x):
+        self.x = x
+        self.last_index = len(x) - 2  # index of the last segment
+        self._hint = threading.local()
+
+    def __getstate__(self):
+        # Hints are per thread: not pickled.
+        return {"x": self.x, "last_index": self.last_index}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._hint = threading.local()
+
+    def locate(self, x_new):
+        """
+        Return index i of the segment such as x[i] <= <x_new> < x[i+1]
+        (clipped to first and last segments).
+        """
+        _x = self.x
+        idx = getattr(self._hint, "index", 0)
+
+        if _x[idx] <= x_new:
+            if x_new < _x[idx + 1]:
+                return idx
+            if idx < self.last_index and x_new < _x[idx + 2]:
+                idx += 1
+                self._hint.index = idx
+                return idx
+        elif idx > 0 and _x[idx - 1] <= x_new:
+            idx -= 1
+            self._hint.index = idx
+            return idx
+
+        idx = int(numpy.searchsorted(_x, x_new, side="right")) - 1
+        idx = min(max(idx, 0), self.last_index)
+        self._hint.index = idx
+        return idx
+
+
+class LinearInterpolator:
+    """
+    Linear interpolation of points with any spacing.
+
+    Scalar lookups use a SegmentLocator, array lookups use numpy.interp.
+    Results are the same as the ones of scipy interp1d(kind="linear", bounds_error=False).
+    """
+
+    def __init__(self, x, y, fill_value=None):
+        self.x, self.y = _sorted_xy(x, y)
+        self.x0 = self.x[0]
+        self.x_last = self.x[-1]
+        with numpy.errstate(divide="ignore", invalid="ignore"):
+            self.slopes = numpy.diff(self.y) / numpy.diff(self.x)
+        self.fill_value = numpy.nan if fill_value is None else fill_value
+        self.locator = SegmentLocator(self.x)
+
+    def __call__(self, x_new):
+        if not isinstance(x_new, numpy.ndarray):
+            return self._call_scalar(x_new)
+
+        x_new = numpy.asarray(x_new, dtype=float)
+        y_new = numpy.interp(x_new, self.x, self.y)
+        y_new[(x_new < self.x0) | (x_new > self.x_last)] = self.fill_value
+        return y_new
+
+    def _call_scalar(self, x_new):
+        if x_new < self.x0 or x_new > self.x_last:
+            return self.fill_value
+        if x_new != x_new:  # nan
+            return numpy.nan
+        if x_new == self.x_last:
+            return self.y[-1]
+
+        idx = self.locator.locate(x_new)
+        if x_new == self.x[idx]:
+            return self.y[idx]
+        return self.slopes[idx] * (x_new - self.x[idx]) + self.y[idx]
+
+
+class PiecewisePolyInterpolator:
+    """
+    Spline interpolation ('zero', 'slinear', 'quadratic', 'cubic' kinds) compiled into
+    breakpoints and a matrix of per-segment polynomial coefficients.
+
+    A value is calculated by locating its segment (searchsorted for arrays,
+    SegmentLocator for scalars) and by evaluating the polynomial of the segment
+    in local coordinate (x - breakpoint) with poly_horner().
+    Results are the ones of scipy interp1d(kind=<kind>, bounds_error=False)
+    up to rounding errors.
+    """
+
+    SPLINE_ORDERS = {"zero": 0, "slinear": 1, "quadratic": 2, "cubic": 3}
+
+    def __init__(self, x, y, kind="cubic", fill_value=None):
+        x, y = _sorted_xy(x, y)
+
+        spline = interpolate.make_interp_spline(x, y, k=self.SPLINE_ORDERS[kind])
+        ppoly = interpolate.PPoly.from_spline(spline)
+
+        # Remove zero-length segments (repeated knots at spline ends).
+        _segments = numpy.flatnonzero(numpy.diff(ppoly.x) > 0)
+        self.breakpoints = ppoly.x[numpy.append(_segments, _segments[-1] + 1)]
+
+        # coeffs[i] : coefficients of segment i in increasing degree order.
+        self.coeffs = numpy.ascontiguousarray(ppoly.c[::-1, _segments].T)
+
+        self.x0 = x[0]
+        self.x_last = x[-1]
+        self.y_last = float(spline(self.x_last))  # spline can be discontinuous at last point ('zero')
+        self.last_index = len(self.coeffs) - 1
+        self.fill_value = numpy.nan if fill_value is None else fill_value
+        self.locator = SegmentLocator(self.breakpoints)
+
+    def __call__(self, x_new):
+        if not isinstance(x_new, numpy.ndarray):
+            return self._call_scalar(x_new)
+
+        x_new = numpy.asarray(x_new, dtype=float)
+        idx = numpy.searchsorted(self.breakpoints, x_new, side="right") - 1
+        idx = idx.clip(0, self.last_index)
+
+        y_new = poly_horner(self.coeffs[idx].T, x_new - self.breakpoints[idx])
+        y_new[x_new == self.x_last] = self.y_last
+        y_new[numpy.isnan(x_new)] = numpy.nan
+        y_new[(x_new < self.x0) | (x_new > self.x_last)] = self.fill_value
+        return y_new
+
+    def _call_scalar(self, x_new):
+        if x_new < self.x0 or x_new > self.x_last:
+            return self.fill_value
+        if x_new != x_new:  # nan
+            return numpy.nan
+        if x_new == self.x_last:
+            return self.y_last
+
+        idx = self.locator.locate(x_new)
+        return poly_horner(self.coeffs[idx].tolist(), x_new - self.breakpoints[idx])
+
+
+class UniformGridInterpolator:
+    """
+    Linear interpolation of points with equally spaced X values.
+
+    The segment of a query value is calculated arithmetically from the grid
+    step instead of being searched in the table. Results are the same as the
+    ones of scipy interp1d(kind="linear", bounds_error=False).
+    """
+
+    def __init__(self, x, y, fill_value=None):
+        self.x, self.y = _sorted_xy(x, y)
+        self.x0 = self.x[0]
+        self.x_last = self.x[-1]
+        self.last_index = len(self.x) - 2  # index of the last segment
+        self.step = (self.x_last - self.x0) / (len(self.x) - 1)
+        self.slopes = numpy.diff(self.y) / numpy.diff(self.x)
+        self.fill_value = numpy.nan if fill_value is None else fill_value
+
+        # Bounds of the segments to check the arithmetic index with: nan (comparisons
+        # always False) before the first segment and after the last one.
+        self._inv_step = 1.0 / self.step
+        self._x_low = self.x[:-1].copy()
+        self._x_low[0] = numpy.nan
+        self._x_high = self.x[1:].copy()
+        self._x_high[-1] = numpy.nan
+
+    @staticmethod
+    def is_uniform(x, tolerance):
+        """
+        Return True if <x> values (once sorted) are equally spaced: the distance of
+        each point to the ideal grid must be less than <tolerance> * grid step.
+        <tolerance> must be < 0.5 to ensure the arithmetic index is at most 1 segment away.
+        """
+        if len(x) < 3:
+            return False
+        x, _ = _sorted_xy(x, x)
+        step = (x[-1] - x[0]) / (len(x) - 1)
+        if not numpy.isfinite(step) or step <= 0:
+            return False
+        grid = x[0] + step * numpy.arange(len(x))
+        return bool(numpy.max(numpy.abs(x - grid)) <= tolerance * step)
+
+    def __call__(self, x_new):
+        if not isinstance(x_new, numpy.ndarray):
+            return self._call_scalar(x_new)
+
+        x_new = numpy.asarray(x_new, dtype=float)
+
+        # Arithmetic index of the segment (fmax / fmin: nan -> 0, inf are clipped).
+        # Buffer is reused for the result.
+        y_new = numpy.subtract(x_new, self.x0)
+        y_new *= self._inv_step
+        numpy.fmax(y_new, 0.0, out=y_new)
+        numpy.fmin(y_new, self.last_index, out=y_new)
+        idx = y_new.astype(numpy.intp)
+
+        # Shift by one segment if grid is not exactly uniform: x[idx] <= x_new < x[idx + 1]
+        shift = numpy.greater_equal(x_new, self._x_high.take(idx)).view(numpy.int8)
+        shift -= numpy.less(x_new, self._x_low.take(idx))
+        moved = numpy.flatnonzero(shift)
+        if moved.size:
+            idx[moved] += shift[moved]
+
+        numpy.subtract(x_new, self.x.take(idx), out=y_new)
+        y_new *= self.slopes.take(idx)
+        y_new += self.y.take(idx)
+        y_new[x_new == self.x_last] = self.y[-1]
+        y_new[(x_new < self.x0) | (x_new > self.x_last)] = self.fill_value
+
+        return y_new
+
+    def _call_scalar(self, x_new):
+        if x_new < self.x0 or x_new > self.x_last:
+            return self.fill_value
+        if x_new != x_new:  # nan
+            return numpy.nan
+        if x_new == self.x_last:
+            return self.y[-1]
+
+        idx = min(int((x_new - self.x0) / self.step), self.last_index)
+        if idx > 0 and x_new < self.x[idx]:
+            idx -= 1
+        elif idx < self.last_index and x_new >= self.x[idx + 1]:
+            idx += 1
+
+        return self.slopes[idx] * (x_new - self.x[idx]) + self.y[idx]
+
+
+class IncrementalPolyFit:
+    """
+    Least squares polynomial fit of (x, y) points updated point by point.
+
+    Normal equations are kept in the scaled variable t = (x - center) / half_width
+    (t in [-1 ; 1] for the points of the initial fit): the Gram matrix G = V^T.V,
+    V^T.y and the inverse of G are updated by rank-one (Sherman-Morrison) updates
+    when a point is added or removed, in O(order^2).
+    coefficients() returns None if the updated solution fails the stability checks
+    (residual of the normal equations, conditioning, points far out of the initial
+    range, not enough points): a full refit is then needed.
+    """
+
+    MAX_RESIDUAL = 1e-8  # relative residual of the normal equations
+    MAX_CONDITION = 1e12  # condition number of the Gram matrix
+    MAX_T = 2.0  # max |t| of added points
+
+    def __init__(self, x, y, order):
+        x = numpy.asarray(x, dtype=float)
+        y = numpy.asarray(y, dtype=float)
+        self.order = order
+        self.center = (x.max() + x.min()) / 2
+        self.half_width = (x.max() - x.min()) / 2 or 1.0
+        _vander = numpy.polynomial.polynomial.polyvander((x - self.center) / self.half_width, order)
+        self.gram = _vander.T @ _vander
+        self.rhs = _vander.T @ y
+        self.nb_points = len(x)
+        self.stable = numpy.linalg.cond(self.gram) < self.MAX_CONDITION
+        self.gram_inv = numpy.linalg.inv(self.gram) if self.stable else None
+
+        # Column k: coefficients (in x) of t^k.
+        _domain = [self.center - self.half_width, self.center + self.half_width]
+        self._to_x = numpy.zeros((order + 1, order + 1))
+        for k in range(order + 1):
+            _coeffs = Polynomial(numpy.eye(order + 1)[k], domain=_domain).convert().coef
+            self._to_x[: len(_coeffs), k] = _coeffs
+
+    def _update(self, x, y, sign):
+        t = (x - self.center) / self.half_width
+        vect = t ** numpy.arange(self.order + 1)
+        self.gram += sign * numpy.outer(vect, vect)
+        self.rhs += sign * y * vect
+        self.nb_points += sign
+        if abs(t) > self.MAX_T:
+            self.stable = False
+        if not self.stable:
+            return
+        _g_vect = self.gram_inv @ vect
+        _denom = 1 + sign * (vect @ _g_vect)
+        if _denom <= 0:  # singular (or not positive) updated matrix
+            self.stable = False
+            return
+        self.gram_inv -= (sign / _denom) * numpy.outer(_g_vect, _g_vect)
+
+    def add(self, x, y):
+        self._update(float(x), float(y), 1)
+
+    def remove(self, x, y):
+        self._update(float(x), float(y), -1)
+
+    def scaled_coefficients(self):
+        """
+        Return coefficients of the fit polynomial of t = (x - center) / half_width
+        (increasing degrees), None if a full refit is needed.
+        """
+        if not self.stable or self.nb_points <= self.order:
+            return None
+        coeffs = self.gram_inv @ self.rhs
+        _residual = numpy.linalg.norm(self.gram @ coeffs - self.rhs)
+        if _residual > self.MAX_RESIDUAL * numpy.linalg.norm(self.rhs):
+            return None
+        return coeffs
+
+    def coefficients(self):
+        """
+        Return coefficients of the fit polynomial of x (increasing degrees),
+        None if a full refit is needed.
+        """
+        coeffs = self.scaled_coefficients()
+        if coeffs is None:
+            return None
+        # Coefficients of the polynomial of t = (x - center) / half_width converted to x.
+        return self._to_x @ coeffs
+
+    def chebyshev(self):
+        """
+        Return the fit as (coefficients, domain) of a Chebyshev series on
+        [center - half_width ; center + half_width] (see Xcalibu.calc_reverse_value()),
+        None if a full refit is needed.
+        """
+        coeffs = self.scaled_coefficients()
+        if coeffs is None:
+            return None
+        return (
+            numpy.polynomial.chebyshev.poly2cheb(coeffs),
+            numpy.array([self.center - self.half_width, self.center + self.half_width]),
+        )
+
+
+# Automatic selection of the fit order (see Xcalibu.select_fit_order()).
+AUTO_FIT_MAX_ORDER = 10
+AUTO_FIT_NB_FOLDS = 5
+AUTO_FIT_RMS_TOLERANCE = 0.05  # relative margin on the best cross-validation RMS
+
+
+def cross_validate_fit(x, y, order, nb_folds=AUTO_FIT_NB_FOLDS):
+    """
+    <nb_folds>-fold cross-validation of the least squares polynomial fit of
+    order <order> of (x, y): fold k is made of every <nb_folds>th point from
+    the kth one, and is predicted by the fit of the other folds.
+    Return (RMS, max) of the absolute prediction errors, (inf, inf) if a fit
+    is rank deficient (not enough points or numerically degenerated).
+    """
+    x = numpy.asarray(x, dtype=float)
+    y = numpy.asarray(y, dtype=float)
+    _index = numpy.arange(len(x))
+    _errors = []
+    for fold in range(nb_folds):
+        _test = _index % nb_folds == fold
+        if not _test.any():
+            continue
+        _train = ~_test
+        if _train.sum() <= order + 1:
+            return numpy.inf, numpy.inf
+        # full=True: rank returned instead of a RankWarning.
+        _poly, (_resid, _rank, _sv, _rcond) = Polynomial.fit(x[_train], y[_train], order, full=True)
+        if _rank <= order:
+            return numpy.inf, numpy.inf
+        _errors.append(_poly(x[_test]) - y[_test])
+    _errors = numpy.abs(numpy.concatenate(_errors))
+    if not numpy.all(numpy.isfinite(_errors)):
+        return numpy.inf, numpy.inf
+    return float(numpy.sqrt(numpy.mean(_errors**2))), float(_errors.max())
+
+
+def polyfit_stack_scaled(x, y, order):
+    """
+    Least squares polynomial fits of order <order> of a stack of tables in one
+    batched solve.
+    <x>, <y>: arrays of shape (nb_tables, nb_points) (or broadcastable to it, ie: x
+    shared by all tables).
+    Each table is fitted in its scaled variable t = (x - center) / half_width (t in
+    [-1 ; 1]) by QR decompositions of the stacked Vandermonde matrices.
+    Return (coefficients of the polynomials of t (increasing degrees) of shape
+    (nb_tables, order + 1), centers, half widths).
+    """
+    x, y = numpy.broadcast_arrays(numpy.asarray(x, dtype=float), numpy.asarray(y, dtype=float))
+    if x.ndim == 1:
+        x, y = x[numpy.newaxis], y[numpy.newaxis]
+    if x.shape[-1] <= order:
+        raise XCalibError("polyfit_stack: not enough points (%d) to fit order %d" % (x.shape[-1], order))
+
+    _min = x.min(axis=-1)
+    _max = x.max(axis=-1)
+    center = (_max + _min) / 2
+    half_width = numpy.where(_max > _min, (_max - _min) / 2, 1.0)
+    _vander = numpy.polynomial.polynomial.polyvander((x - center[:, None]) / half_width[:, None], order)
+    _q, _r = numpy.linalg.qr(_vander)
+    if numpy.any(numpy.abs(numpy.diagonal(_r, axis1=-2, axis2=-1)) < 1e-12 * numpy.sqrt(x.shape[-1])):
+        raise XCalibError("polyfit_stack: rank deficient fit (not enough distinct points)")
+    _coeffs_t = numpy.linalg.solve(_r, numpy.matmul(_q.swapaxes(-1, -2), y[..., None]))[..., 0]
+    return _coeffs_t, center, half_width
+
+
+def scaled_to_power(coeffs_t, center, half_width):
+    """
+    Convert coefficients (increasing degrees) of polynomials of t = (x - center) / half_width
+    to coefficients of polynomials of x, for a stack of polynomials in one matrix product.
+    <coeffs_t>: array of shape (nb_polynomials, order + 1)
+    <center>, <half_width>: arrays of shape (nb_polynomials,)
+    """
+    _order = coeffs_t.shape[-1] - 1
+    # t^k = sum_j C(k, j) . x^j . (-center)^(k-j) / half_width^k  (j <= k)
+    _j = numpy.arange(_order + 1)[:, None]
+    _k = numpy.arange(_order + 1)[None, :]
+    _binom = numpy.array([[math.comb(k, j) for k in range(_order + 1)] for j in range(_order + 1)], dtype=float)
+    _to_x = (
+        _binom
+        * numpy.power(-center[:, None, None], numpy.maximum(_k - _j, 0))
+        / numpy.power(half_width[:, None, None], _k)
+    )
+    return numpy.einsum("bjk,bk->bj", _to_x, coeffs_t)
+
+
+def power_to_chebyshev(coeffs):
+    """
+    Convert coefficients (increasing degrees) of a stack of polynomials (array of shape
+    (nb_polynomials, order + 1)) to Chebyshev series coefficients in one matrix product.
+    """
+    _order = coeffs.shape[-1] - 1
+    _to_cheb = numpy.zeros((_order + 1, _order + 1))  # row k: Chebyshev coefficients of t^k
+    for k in range(_order + 1):
+        _to_cheb[k, : k + 1] = numpy.polynomial.chebyshev.poly2cheb(numpy.eye(_order + 1)[k])[: k + 1]
+    return coeffs @ _to_cheb
+
+
+def chebyshev_to_power(coeffs, domain):
+    """
+    Return coefficients (increasing degrees) of the polynomial of x equal to the
+    Chebyshev series <coeffs> on <domain> ([xmin, xmax] mapped on [-1, 1]).
+    """
+    _center = (domain[1] + domain[0]) / 2
+    _half_width = (domain[1] - domain[0]) / 2
+    _coeffs_t = numpy.polynomial.chebyshev.cheb2poly(coeffs)
+    _coeffs = numpy.zeros(len(coeffs))
+    _coeffs[: len(_coeffs_t)] = _coeffs_t
+    return scaled_to_power(_coeffs[numpy.newaxis], numpy.array([_center]), numpy.array([_half_width]))[0]
+
+
+def polyfit_stack(x, y, order):
+    """
+    Least squares polynomial fits of order <order> of a stack of tables (see
+    polyfit_stack_scaled()) converted to polynomials of x.
+    Return array of shape (nb_tables, order + 1) of coefficients (increasing degrees).
+    """
+    return scaled_to_power(*polyfit_stack_scaled(x, y, order))
+
+
+def fit_tables(calibs):
+    """
+    Fit (direct and reverse) TABLE + POLYFIT calibrations <calibs> at their fit
+    order, like Xcalibu.fit() but with one polyfit_stack_scaled() call per group of
+    tables of same size and fit order (and direction) instead of one solve per table.
+    Coefficient conversions are done for the whole group too: rows of coefficients
+    are then written back into each calibration.
+    Calibrations with an automatic fit order are fitted one by one.
+    """
+    _groups = {}
+    for calib in calibs:
+        if calib._load_pending:
+            calib.ensure_loaded()
+        if calib.get_calib_type() != "TABLE" or calib.get_reconstruction_method() != "POLYFIT":
+            raise XCalibError("fit_tables: not a TABLE + POLYFIT calibration", calib)
+        if calib.is_fit_order_auto():
+            calib.fit()
+            continue
+        _groups.setdefault((len(calib.x_raw), calib.get_fit_order()), []).append(calib)
+
+    for (_nb_points, _order), _calibs in _groups.items():
+        log.info("fit_tables: %d tables of %d points at order %d", len(_calibs), _nb_points, _order)
+        _x = numpy.stack([calib.x_raw for calib in _calibs])
+        _y = numpy.stack([calib.y_raw for calib in _calibs])
+        _coeffs = polyfit_stack(_x, _y, _order)
+        _coeffs_t, _centersR, _half_widthsR = polyfit_stack_scaled(_y, _x, _order)
+        _chebyshevR = power_to_chebyshev(_coeffs_t)
+        _domainsR = numpy.stack([_centersR - _half_widthsR, _centersR + _half_widthsR], axis=-1)
+        _coeffsR = scaled_to_power(_coeffs_t, _centersR, _half_widthsR)[:, ::-1]  # numpy.polyfit order
+        for calib, coeffs, chebyshevR, domainR, coeffsR in zip(_calibs, _coeffs, _chebyshevR, _domainsR, _coeffsR):
+            calib._set_fit(coeffs, (chebyshevR, domainR), coeffsR)
+
+
+class CalibCache:
+    """
+    On-disk cache of parsed calibration files.
+
+    An entry stores, in a numpy .npz file (no pickle), the raw data arrays and
+    the metadata / fit coefficients produced by Xcalibu.load_calib() for a
+    calibration file and the loading parameters (name, type, limits,
+    reconstruction method, fit order) set before loading.
+
+    An entry is valid if the file has the same mtime and size as when it has
+    been parsed, or else the same content hash (the entry is then refreshed).
+    Total size of the cache directory is bounded: least recently used
+    entries are removed first.
+    Files smaller than MIN_FILE_SIZE are not cached: they are parsed faster
+    than a cache entry is read.
+    """
+
+    VERSION = 1
+    DEFAULT_MAX_SIZE = 256 * 2**20  # bytes
+    MIN_FILE_SIZE = 16 * 2**10  # bytes
+
+    def __init__(self, cache_dir, max_size=None):
+        self.cache_dir = os.path.abspath(os.path.expanduser(cache_dir))
+        self.max_size = self.DEFAULT_MAX_SIZE if max_size is None else max_size
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def is_cached(self, file_name):
+        """
+        Return True if <file_name> is big enough to be cached.
+        """
+        try:
+            return os.path.getsize(file_name) >= self.MIN_FILE_SIZE
+        except OSError:
+            return False
+
+    @staticmethod
+    def file_hash(file_name):
+        """
+        Return blake2b hash of the content of <file_name>.
+        """
+        _hash = hashlib.blake2b(digest_size=20)
+        with open(file_name, "rb") as calib_file:
+            for chunk in iter(lambda: calib_file.read(2**20), b""):
+                _hash.update(chunk)
+        return _hash.hexdigest()
+
+    def source_signature(self, file_name):
+        """
+        Return signature (path, mtime, size and content hash) of <file_name> to
+        store with an entry, or None if the file changes while it is hashed.
+        To be taken before parsing: an entry must not pair data parsed from
+        a file with the signature of a later version of this file.
+        """
+        _stat = os.stat(file_name)
+        _hash = self.file_hash(file_name)
+        _stat_after = os.stat(file_name)
+        if (_stat.st_mtime_ns, _stat.st_size) != (_stat_after.st_mtime_ns, _stat_after.st_size):
+            return None
+        return {
+            "file_name": os.path.abspath(file_name),
+            "mtime_ns": _stat.st_mtime_ns,
+            "size": _stat.st_size,
+            "hash": _hash,
+        }
+
+    def entry_path(self, file_name, params):
+        """
+        Return path of the cache entry of <file_name> loaded with <params> (dict).
+        """
+        _key = json.dumps([os.path.abspath(file_name), params, self.VERSION], sort_keys=True)
+        return os.path.join(self.cache_dir, hashlib.blake2b(_key.encode(), digest_size=16).hexdigest() + ".npz")
+
+    def load(self, file_name, params):
+        """
+        Return (arrays, metadata) of the valid entry of <file_name> or None.
+        """
+        _entry = self.entry_path(file_name, params)
+        try:
+            _stat = os.stat(file_name)
+            with numpy.load(_entry, allow_pickle=False) as entry:
+                arrays = {name: entry[name] for name in entry.files if name != "_metadata"}
+                metadata = json.loads(str(entry["_metadata"]))
+        except FileNotFoundError:
+            return None
+        except Exception as exc:
+            log.warning("invalid calibration cache entry %s: %r", _entry, exc)
+            return None
+
+        _source = metadata["source"]
+        if (_source["mtime_ns"], _source["size"]) != (_stat.st_mtime_ns, _stat.st_size):
+            if _source["size"] != _stat.st_size or _source["hash"] != self.file_hash(file_name):
+                log.info("calibration cache: %s has changed", file_name)
+                return None
+            # Same content (file touched or copied): refresh entry.
+            _source = dict(_source, mtime_ns=_stat.st_mtime_ns)
+            self.store(file_name, params, arrays, metadata["calib"], _source)
+        else:
+            os.utime(_entry)  # most recently used
+
+        log.info("calibration cache: %s loaded from %s", file_name, _entry)
+        return arrays, metadata["calib"]
+
+    def store(self, file_name, params, arrays, calib_metadata, source=None):
+        """
+        Store <arrays> (dict of numpy arrays) and <calib_metadata> (json compatible dict)
+        as the entry of <file_name> loaded with <params>.
+        <source>: signature of <file_name> taken before parsing (see source_signature())
+        default: signature of <file_name> now.
+        """
+        _entry = self.entry_path(file_name, params)
+        _source = source or self.source_signature(file_name)
+        if _source is None:
+            return
+        _metadata = json.dumps({"source": _source, "params": params, "calib": calib_metadata})
+
+        # Write to a temporary file and rename: readers never see a partial entry.
+        _tmp = f"{_entry}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(_tmp, "wb") as entry:
+                numpy.savez(entry, _metadata=numpy.array(_metadata), **arrays)
+            os.replace(_tmp, _entry)
+        except OSError as exc:
+            log.warning("cannot write calibration cache entry %s: %r", _entry, exc)
+            if os.path.exists(_tmp):
+                os.remove(_tmp)
+            return
+
+        self.evict()
+
+    def evict(self):
+        """
+        Remove least recently used entries while cache size is above max size.
+        """
+        entries = []
+        for dir_entry in os.scandir(self.cache_dir):
+            if dir_entry.name.endswith(".npz"):
+                _stat = dir_entry.stat()
+                entries.append((_stat.st_mtime, _stat.st_size, dir_entry.path))
+
+        _total = sum(_size for _, _size, _ in entries)
+        for _, _size, _path in sorted(entries):
+            if _total <= self.max_size:
+                break
+            try:
+                os.remove(_path)
+                _total -= _size
+                log.info("calibration cache: %s evicted", _path)
+            except OSError:
+                pass
+
+    def clear(self):
+        """
+        Remove all entries.
+        """
+        for dir_entry in os.scandir(self.cache_dir):
+            if dir_entry.name.endswith(".npz"):
+                os.remove(dir_entry.path)
+
+    def size(self):
+        """
+        Return total size of the entries (bytes).
+        """
+        return sum(
+            dir_entry.stat().st_size for dir_entry in os.scandir(self.cache_dir) if dir_entry.name.endswith(".npz")
+        )
+
+
+class CalibBundle:
+    """
+    File of many text calibrations with a name -> (offset, size) index at its head:
+    one calibration is read with a seek, without scanning the others.
+
+        # XCALIBU BUNDLE 1
+        BUNDLE_INDEX_SIZE=<size in bytes of the index lines>
+        <offset>\t<size>\t<file name>\t<calib name>      (one index line per calibration)
+        <calibration texts (utf-8)>
+
+    Offsets and sizes are written with a fixed width: the index size does not depend on them.
+    """
+
+    MAGIC = b"# XCALIBU BUNDLE 1"
+
+    def __init__(self, file_name):
+        self.file_name = file_name
+        self._index = {}  # calib name -> (offset, size, file name)
+        self._read_index()
+
+    def _read_index(self):
+        with open(self.file_name, "rb") as bundle_file:
+            if bundle_file.readline().rstrip(b"\r\n") != self.MAGIC:
+                raise XCalibError(f"{self.file_name} is not a calibration bundle file")
+            _info = bundle_file.readline().decode().strip()
+            if not _info.startswith("BUNDLE_INDEX_SIZE="):
+                raise XCalibError(f"{self.file_name}: invalid bundle index")
+            _index_lines = bundle_file.read(int(_info.split("=")[1])).decode().splitlines()
+
+        for line in _index_lines:
+            offset, size, file_name, name = line.split("\t", 3)
+            self._index[name] = (int(offset), int(size), file_name)
+
+    def names(self):
+        return list(self._index)
+
+    def __len__(self):
+        return len(self._index)
+
+    def __contains__(self, name):
+        return name in self._index
+
+    def read(self, name):
+        """
+        Return text of calibration <name>.
+        """
+        try:
+            offset, size, _ = self._index[name]
+        except KeyError:
+            raise XCalibError(f"no calibration '{name}' in bundle {self.file_name}")
+        with open(self.file_name, "rb") as bundle_file:
+            bundle_file.seek(offset)
+            return bundle_file.read(size).decode()
+
+    def load(self, name, **kwargs):
+        """
+        Return Xcalibu object of calibration <name>.
+        <kwargs>: other Xcalibu constructor arguments (reconstruction_method...).
+        """
+        return Xcalibu(calib_string=self.read(name), **kwargs)
+
+    def extract(self, directory, names=None):
+        """
+        Write calibrations <names> (default: all) in <directory> with their original
+        file names. Return list of written files.
+        """
+        os.makedirs(directory, exist_ok=True)
+        file_names = []
+        for name in self.names() if names is None else names:
+            file_name = os.path.join(directory, self._index[name][2])
+            with atomic_open(file_name, mode="w") as calib_file:
+                calib_file.write(self.read(name))
+            file_names.append(file_name)
+        return file_names
+
+    @classmethod
+    def pack(cls, file_name, calib_file_names, fsync=False):
+        """
+        Write text calibration files <calib_file_names> (possibly compressed) in bundle <file_name>.
+        Calibrations are indexed by CALIB_NAME (file name without extension if not defined).
+        Return the CalibBundle.
+        """
+        entries = []
+        names = set()
+        for calib_file_name in calib_file_names:
+            if is_binary_calib_file(calib_file_name):
+                raise XCalibError(f"binary calibration file {calib_file_name} can not be bundled")
+            with open_calib_file(calib_file_name) as calib_file:
+                text = calib_file.read()
+            name = Xcalibu(calib_string=text, lazy=True).get_calib_name()
+            base_name = os.path.basename(calib_file_name)
+            for ext in (".gz", ".bz2", ".xz"):
+                if base_name.endswith(ext):
+                    base_name = base_name[: -len(ext)]
+            if not name:
+                name = os.path.splitext(base_name)[0]
+            if name in names:
+                raise XCalibError(f"duplicate calibration name '{name}' ({calib_file_name})")
+            names.add(name)
+            entries.append((name, base_name, text.encode()))
+
+        _index_size = sum(len(("%020d\t%020d\t%s\t%s\n" % (0, 0, base_name, name)).encode())
+                          for name, base_name, _ in entries)
+        _info = b"BUNDLE_INDEX_SIZE=%020d\n" % _index_size
+        offset = len(cls.MAGIC) + 1 + len(_info) + _index_size
+        _index = []
+        for name, base_name, data in entries:
+            _index.append("%020d\t%020d\t%s\t%s\n" % (offset, len(data), base_name, name))
+            offset += len(data)
+
+        with atomic_open(file_name, mode="wb", fsync=fsync) as bundle_file:
+            bundle_file.write(cls.MAGIC + b"\n" + _info + "".join(_index).encode())
+            for _, _, data in entries:
+                bundle_file.write(data)
+        log.info(f"{len(entries)} calibrations packed in {file_name}")
+        return cls(file_name)
+
+
+def _load_registry_file(file_name, calib_kwargs):
+    """
+    Load calibration file <file_name> for CalibRegistry (in a worker thread or process).
+    Return (Xcalibu object or None, load duration, error message or None).
+    """
+    _t0 = time.perf_counter()
+    try:
+        calib = Xcalibu(calib_file_name=file_name, **calib_kwargs)
+        if calib.get_calib_name() is None:
+            raise XCalibError("no calibration name", calib)
+        if calib.get_calib_type() == "TABLE" and calib.is_loaded() and calib.dataset_size() == 0:
+            raise XCalibError("no data line read", calib)
+        return calib, time.perf_counter() - _t0, None
+    except Exception as err:
+        return None, time.perf_counter() - _t0, f"{type(err).__name__}: {err}"
+
+
+class CalibRegistry:
+    """
+    Calibrations of one or several directories, loaded in parallel and accessed by CALIB_NAME.
+
+    Files matching <patterns> are loaded by a pool of <max_workers> threads or processes
+    (<executor>: "thread" or "process"); <calib_kwargs> are passed to Xcalibu constructor.
+    A file which can not be loaded is reported (see report()) without stopping the loading
+    of the others.
+    """
+
+    DEFAULT_PATTERNS = ("*.calib", "*.calib.gz", "*.calib.bz2", "*.calib.xz", "*.bcalib")
+
+    def __init__(self, directories=(), patterns=None, max_workers=None, executor="thread", **calib_kwargs):
+        if executor not in ("thread", "process"):
+            raise ValueError(f"unknown executor: {executor} (thread or process)")
+        self.patterns = self.DEFAULT_PATTERNS if patterns is None else tuple(patterns)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.executor = executor
+        self.calib_kwargs = calib_kwargs
+        self._calibs = {}  # calib name -> Xcalibu
+        self._report = []  # per file: {"file", "name", "time", "error"}
+        if isinstance(directories, str):
+            directories = [directories]
+        for directory in directories:
+            self.load_directory(directory)
+
+    def discover(self, directory):
+        """
+        Return sorted list of calibration files of <directory>.
+        """
+        file_names = set()
+        for pattern in self.patterns:
+            file_names.update(glob.glob(os.path.join(directory, pattern)))
+        return sorted(file_names)
+
+    def load_directory(self, directory):
+        """
+        Load calibration files of <directory> in parallel.
+        Return the report of these files.
+        """
+        return self.load_files(self.discover(directory))
+
+    def load_files(self, file_names):
+        """
+        Load calibration files <file_names> in parallel.
+        Return the report of these files.
+        """
+        _t0 = time.perf_counter()
+        _pool_class = (
+            concurrent.futures.ThreadPoolExecutor
+            if self.executor == "thread"
+            else concurrent.futures.ProcessPoolExecutor
+        )
+        _nb_workers = max(1, min(self.max_workers, len(file_names)))
+        with _pool_class(max_workers=_nb_workers) as pool:
+            results = list(pool.map(_load_registry_file, file_names, [self.calib_kwargs] * len(file_names)))
+
+        report = []
+        for file_name, (calib, duration, error) in zip(file_names, results):
+            name = None if calib is None else calib.get_calib_name()
+            if name is not None and name in self._calibs:
+                error = f"duplicate calibration name '{name}'"
+            elif name is not None:
+                self._calibs[name] = calib
+            if error is not None:
+                log.error(f"{file_name}: {error}")
+            report.append({"file": file_name, "name": name, "time": duration, "error": error})
+        self._report.extend(report)
+
+        log.info(
+            f"{len(file_names)} files loaded in {time.perf_counter() - _t0:g}s "
+            f"({self.executor} pool of {_nb_workers}), {sum(r['error'] is not None for r in report)} errors"
+        )
+        return report
+
+    def report(self):
+        """
+        Return list of loaded files: {"file", "name", "time", "error"} dicts.
+        """
+        return list(self._report)
+
+    def errors(self):
+        return [entry for entry in self._report if entry["error"] is not None]
+
+    def print_report(self):
+        for entry in self._report:
+            _status = "OK" if entry["error"] is None else f"ERROR: {entry['error']}"
+            print(f"{entry['time'] * 1000:10.3f}ms  {str(entry['name']):>20s}  {entry['file']}  {_status}")
+
+    def names(self):
+        return list(self._calibs)
+
+    def get(self, name, default=None):
+        return self._calibs.get(name, default)
+
+    def __getitem__(self, name):
+        try:
+            return self._calibs[name]
+        except KeyError:
+            raise XCalibError(f"no calibration '{name}' in registry")
+
+    def __contains__(self, name):
+        return name in self._calibs
+
+    def __len__(self):
+        return len(self._calibs)
+
+
 class Xcalibu:
     """
     Main class to create a calibration.
@@ -96,27 +1351,55 @@ class Xcalibu:
         description=None,
         samp_nbp=20,
         calib_limits=None,
+        samp_tolerance=None,
+        cache_dir=None,
+        calib_source=None,
+        lazy=False,
     ):
 
         # Default parameters (accessible via constructor)
         self._calib_name = calib_name
         self._calib_string = None
         self._calib_file_name = None
+        self._calib_source = None
         self._calib_type = None
         self._fit_order = 0
+        self._fit_order_auto = False  # fit order selected by select_fit_order() at each fit()
+        self._order_fits = {}  # order -> (direct Polynomial, reverse fit) fits of current raw data
+        self._fit_order_report = None  # selection table of select_fit_order()
         self._poly_coeffs = coeffs  # list of Polynomial coefficients (increasing degree: numpy Polynomial rule)
-        self._polynomial = None  # numpy Polynomial object
+        self._polynomial = None  # numpy Polynomial object (built when needed after fit_tables())
         self._rec_method = None
         self._interpol_kind = "linear"
         self._sampling_nb_points = 20
+        self._sampling_tolerance = None
+        self._sampling_max_error = None  # reverse error reached by adaptive sampling
+        self._range_tolerance = 0.00001
+        self._out_of_range_policy = "NAN"
+        self._out_of_range_fill_value = numpy.nan
+        self._preserve_float32 = False
+        self._cache = None  # CalibCache of parsed calibration files
 
         # internal parameters
         self._calib_time = None
         self._description = description
         self._calib_order = 0  # Order of the polynom used for POLY calibrations.
         self._calib_file_format = "XCALIBU"  # "TWO_COLS" | "ONE_COL"
+        self._save_precision = None  # None ("%f") | "ROUND_TRIP" | nb of significant digits
+        self._journal = False  # insert / delete edits appended to journal file
+        self._journal_max_size = JOURNAL_MAX_SIZE
+        self._replaying_journal = False
         self._fill_value = None
-        self.coeffR = None
+        self._uniform_grid_tolerance = 1e-3
+        self._interpol_engine = None  # engines used by ifunc and ifuncR
+        self._interpol_engineR = None
+        self._poly_reverse_method = "NEWTON"
+        self._reverse_seed = None  # (key, x samples, y samples) for NEWTON reverse of POLY
+        self.coeffR = None  # reverse fit polynomial (decreasing degrees), see _set_reverse_fit()
+        self._reverse_fit = None  # (coefficients, domain) of reverse fit Chebyshev series
+        self._incremental_fit = None  # IncrementalPolyFit of direct and reverse POLYFIT
+        self._fitted_points = None  # (x_fitted, y_fitted, x_fittedR, y_fittedR) computed when needed
+        self._fitted_nb_points = 50
 
         self.is_monotonic = None
         self.is_increasing = None
@@ -132,6 +1415,17 @@ class Xcalibu:
         self._data_lines = 0
         self._comments = []
 
+        # Lazy loading: data, fit and interpolation are built at first use.
+        self._load_pending = False  # data / interpolation not built yet
+        self._header_only = False  # only header has been parsed (data still to be read)
+        self._header_comments = 0  # number of comments before header parsing
+        self._loading = False
+        self._load_lock = threading.RLock()
+
+        # Hot reload (see watch()).
+        self._watched = False  # evaluations done on a snapshot of the state
+        self._watcher = None  # (thread, stop event) polling the calib file
+
         """
         Constructor parameters recording
         """
@@ -148,6 +1442,10 @@ class Xcalibu:
         if calib_file_name is not None:
             self.set_calib_file_name(calib_file_name)
 
+        # Calib source: file-like object or iterable of lines.
+        if calib_source is not None:
+            self.set_calib_source(calib_source)
+
         # Calib Type
         if calib_type is not None:
             self.set_calib_type(calib_type)
@@ -172,19 +1470,49 @@ class Xcalibu:
         if samp_nbp is not None:
             self.set_sampling_nb_points(samp_nbp)
 
+        if samp_tolerance is not None:
+            self.set_sampling_tolerance(samp_tolerance)
+
         # Description
         if description is not None:
             self.set_calib_description(description)
 
+        # Cache of parsed calibration files (default: XCALIBU_CACHE_DIR environment variable).
+        if cache_dir is None:
+            cache_dir = os.environ.get("XCALIBU_CACHE_DIR")
+        if cache_dir:
+            self.set_cache_dir(cache_dir)
+
         # Load if data are available.
         if (
             self.get_calib_file_name() is not None
             or self.get_calib_string() is not None
+            or self.get_calib_source() is not None
         ):
             # A calib string or a file name is defined, try to load the calib.
-            self.load_calib()
-            self.check_monotonic()
-            self.compute_interpolation()
+            if lazy:
+                self.load_calib_header()
+                self._load_pending = True
+            else:
+                self.load_calib()
+                self.check_monotonic()
+                self.compute_interpolation()
+
+    def __getstate__(self):
+        """
+        Pickling (to pass calibrations between processes): lock is re-created,
+        calib source (stream already read) is not pickled.
+        """
+        state = self.__dict__.copy()
+        del state["_load_lock"]
+        state["_calib_source"] = None
+        state["_watched"] = False
+        state["_watcher"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._load_lock = threading.RLock()
 
     def print_info(self):
         """
@@ -197,16 +1525,44 @@ class Xcalibu:
         print(f"             coeffs: {self.get_coeffs()}")
         print(f"           rec meth: {self.get_reconstruction_method()}")
         print(f"        calib order: {self.get_calib_order()}")
-        print(f"          fit order: {self.get_fit_order()}")
+        print(f"          fit order: {self.get_fit_order()}{' (AUTO)' if self._fit_order_auto else ''}")
         print(f"          monotonic: {self.is_monotonic}")
         print(f"    calib file name: {self.get_calib_file_name()}")
+        if self.get_cache_dir() is not None:
+            print(f"          cache dir: {self.get_cache_dir()}")
         print(f"      interopl kind: {self.get_interpol_kind()}")
         print(f"interpol fill value: {self.get_interpol_fill_value()}")
+        print(f"    interpol engine: {self.get_interpol_engine()} (reverse: {self._interpol_engineR})")
+        print(f"       out of range: {self.get_out_of_range_policy()} (tolerance: {self.get_range_tolerance()})")
         print(f" sampling nb points: {self.get_sampling_nb_points()}")
+        if self.get_sampling_tolerance() is not None:
+            print(f" sampling tolerance: {self.get_sampling_tolerance()} (max error: "
+                  f"{self._sampling_max_error} with {len(self.x_raw) if self.x_raw is not None else 0} points)")
+        if self.get_calib_type() == "POLY":
+            print(f"poly reverse method: {self.get_poly_reverse_method()}")
         print(f"          min/max X: [{self.min_x()} ; {self.max_x()}]")
         print(f"          min/max Y: [{self.min_y()} ; {self.max_y()}]")
         if self.get_calib_type() == "TABLE":
-            print(f"          data size: {len(self.x_raw)}")
+            if self._header_only:
+                print("          data size: (not loaded)")
+            else:
+                print(f"          data size: {len(self.x_raw)}")
+        _reverse_info = self.get_reverse_fit_info()
+        if _reverse_info is not None:
+            print(
+                "        reverse fit: condition=%(condition).3g (raw Y fit: %(raw_condition).3g)  "
+                "max round trip error=%(round_trip_error).3g" % _reverse_info
+            )
+        if self._fit_order_report is not None:
+            print("  fit order selection: (cross-validation RMS / max error, BIC, fit time)")
+            for row in self._fit_order_report:
+                print(
+                    "    %s order %2d: RMS=%-12.6g max=%-12.6g BIC=%-12.6g %.3f ms"
+                    % (
+                        "*" if row["order"] == self.get_fit_order() else " ",
+                        row["order"], row["rms"], row["max"], row["bic"], row["time"] * 1000,
+                    )
+                )
         print("----------------------------------------------------------------")
 
     def compute_interpolation(self):
@@ -220,40 +1576,111 @@ class Xcalibu:
 
             # raw data arrays must be filled for POLY.
             if self.get_calib_type() == "POLY":
-                self.x_raw = numpy.linspace(
-                    self.Xmin, self.Xmax, self.get_sampling_nb_points()
-                )
-                self.y_raw = self.calc_poly_value(self.x_raw)
+                if self.get_sampling_tolerance() is not None and self.is_monotonic:
+                    self._sample_poly_adaptive(self.get_sampling_tolerance())
+                else:
+                    self.x_raw = numpy.linspace(
+                        self.Xmin, self.Xmax, self.get_sampling_nb_points()
+                    )
+                    self.y_raw = self.calc_poly_value(self.x_raw)
 
             # print("========================================")
             # print(self.x_raw)
             # print(self.y_raw)
             # print(self.get_interpol_kind())
             # print("========================================")
-            self.ifunc = interpolate.interp1d(
-                self.x_raw,
-                self.y_raw,
-                kind=self.get_interpol_kind(),
-                bounds_error=False,
-                fill_value=self.get_interpol_fill_value(),
+            self.ifunc, self._interpol_engine = self._build_interpolator(
+                self.x_raw, self.y_raw
             )
             if self.is_monotonic:
                 log.info("compute_interpolation() reverse")
 
-                self.ifuncR = interpolate.interp1d(
-                    self.y_raw,
-                    self.x_raw,
-                    kind=self.get_interpol_kind(),
-                    bounds_error=False,
-                    fill_value=self.get_interpol_fill_value(),
+                self.ifuncR, self._interpol_engineR = self._build_interpolator(
+                    self.y_raw, self.x_raw
                 )
             else:
                 self.ifuncR = None
+                self._interpol_engineR = None
         else:
             log.info(
                 f"cannot compute_interpolation() (rec method = {self.get_reconstruction_method()}"
             )
 
+    def _sample_poly_adaptive(self, tolerance, max_nb_points=2**20):
+        """
+        Fill x_raw / y_raw with points sampled on a monotonic POLY calibration such
+        that the reverse interpolation error (|ifuncR(poly(x)) - x|) is below <tolerance>.
+
+        Sampling starts with 5 points; the error is measured on 15 points inside each
+        segment and the segments above 90% of <tolerance> (margin for the error between
+        measurement points) are split in 2 until there is no more such segment
+        (or <max_nb_points> is reached).
+        Reached max error is stored in '_sampling_max_error'.
+        """
+        _fractions = numpy.arange(1, 16) / 16
+        x_samp = numpy.linspace(self.Xmin, self.Xmax, 5)
+
+        while True:
+            y_samp = self.calc_poly_value(x_samp)
+            funcR, _ = self._build_interpolator(y_samp, x_samp)
+
+            # Probe points inside each segment.
+            x_probe = x_samp[:-1, None] + numpy.diff(x_samp)[:, None] * _fractions
+            errors = numpy.abs(funcR(self.calc_poly_value(x_probe.ravel())) - x_probe.ravel())
+            seg_errors = errors.reshape(x_probe.shape).max(axis=1)
+            max_error = seg_errors.max()
+
+            to_split = numpy.flatnonzero(seg_errors > 0.9 * tolerance)
+            if len(to_split) == 0 or len(x_samp) + len(to_split) > max_nb_points:
+                break
+
+            x_samp = numpy.insert(x_samp, to_split + 1, 0.5 * (x_samp[to_split] + x_samp[to_split + 1]))
+
+        if max_error > tolerance:
+            log.warning(
+                f"adaptive sampling: tolerance {tolerance} not reached "
+                f"(max error={max_error} with {len(x_samp)} points)"
+            )
+        else:
+            log.info(f"adaptive sampling: max error={max_error} with {len(x_samp)} points")
+
+        self.x_raw = x_samp
+        self.y_raw = y_samp
+        self._sampling_max_error = max_error
+
+    def _build_interpolator(self, x, y):
+        """
+        Return interpolation function of <y> vs <x> and the name of the engine used:
+        * "uniform grid": linear interpolation on equally spaced <x> (direct index calculation)
+        * "segment hint": linear interpolation, scalar lookups start from previous segment
+        * "piecewise poly": spline kinds compiled into per-segment polynomial coefficients
+        * "interp1d": scipy interpolation (other kinds or fill values)
+        """
+        _kind = self.get_interpol_kind()
+        _tolerance = self.get_uniform_grid_tolerance()
+        _fill_value = self.get_interpol_fill_value()
+
+        if _fill_value is None or isinstance(_fill_value, numbers.Number):
+            if _kind == "linear":
+                if _tolerance is not None and UniformGridInterpolator.is_uniform(x, _tolerance):
+                    log.info("uniform grid detected: use direct index interpolation")
+                    return UniformGridInterpolator(x, y, fill_value=_fill_value), "uniform grid"
+
+                return LinearInterpolator(x, y, fill_value=_fill_value), "segment hint"
+
+            if _kind in PiecewisePolyInterpolator.SPLINE_ORDERS:
+                func = PiecewisePolyInterpolator(x, y, kind=_kind, fill_value=_fill_value)
+                return func, "piecewise poly"
+
+        func = interpolate.interp1d(
+            x,
+            y,
+            kind=self.get_interpol_kind(),
+            bounds_error=False,
+            fill_value=_fill_value,
+        )
+        return func, "interp1d"
+
     def check_monotonic(self):
         """
         Check if calibration is monotonic.
@@ -325,6 +1752,17 @@ class Xcalibu:
     def get_calib_file_name(self):
         return self._calib_file_name
 
+    def set_calib_source(self, calib_source):
+        """
+        Set file-like object (text or binary) or iterable of lines (str or bytes)
+        to read a calibration from. Used instead of calib file name or string.
+        Source is read by chunks: it can be a stream or a generator.
+        """
+        self._calib_source = calib_source
+
+    def get_calib_source(self):
+        return self._calib_source
+
     def set_calib_string(self, calib_string):
         """
         Set string to use to create a calibration.
@@ -373,16 +1811,86 @@ class Xcalibu:
     def set_fit_order(self, order):
         """
         Fit order used to fit TABLE calibrations.
+        "AUTO": order selected by select_fit_order() at each fit.
+        If the raw data have already been fitted at <order> (fit() or
+        select_fit_order()), the fit is applied without being recomputed.
         """
-        if isinstance(order, int) and order > 0:
+        if isinstance(order, str) and order.upper() == "AUTO":
+            self._fit_order_auto = True
+            log.info("fit order set to: AUTO")
+        elif isinstance(order, int) and order > 0:
+            self._fit_order_auto = False
             self._fit_order = order
             log.info(f"fit order set to: {self.get_fit_order()}")
+            if order in self._order_fits and self._polynomial is not None:
+                self.fit()
         else:
-            log.error("set_fit_order : <fit_order> must be a positive integer.")
+            log.error("set_fit_order : <fit_order> must be a positive integer or 'AUTO'.")
 
     def get_fit_order(self):
         return self._fit_order
 
+    def is_fit_order_auto(self):
+        return self._fit_order_auto
+
+    def get_fit_order_report(self):
+        """
+        Return the selection table of the last select_fit_order(): list of dicts
+        (order, rms, max, bic, time) or None.
+        """
+        return self._fit_order_report
+
+    def select_fit_order(self, orders=None, nb_folds=AUTO_FIT_NB_FOLDS, max_workers=None):
+        """
+        Select the fit order of TABLE raw data among <orders> (default: 1 to
+        AUTO_FIT_MAX_ORDER, limited by the number of points) and set it.
+        Candidate orders are evaluated concurrently in a pool of threads (numpy
+        least squares release the GIL), each one by:
+        * <nb_folds>-fold cross-validation RMS and max error (see cross_validate_fit())
+        * BIC of the fit of all points ; this fit is kept (see _fit_at_order())
+          to switch of order without refitting.
+        Selected order: lowest BIC among the orders whose cross-validation RMS is
+        within AUTO_FIT_RMS_TOLERANCE of the best one. High orders exploding
+        numerically have an infinite RMS and are never selected.
+        """
+        if self._load_pending:
+            self.ensure_loaded()
+        _nb_points = len(self.x_raw)
+        if orders is None:
+            orders = range(1, AUTO_FIT_MAX_ORDER + 1)
+        orders = [_order for _order in orders if 0 < _order < _nb_points - 1]
+        if not orders:
+            raise XCalibError("select_fit_order: not enough points (%d) to select a fit order" % _nb_points, self)
+
+        def _evaluate(order):
+            _t0 = time.perf_counter()
+            _polynomial, _reverse = self._fit_at_order(order)
+            _time = time.perf_counter() - _t0
+            _rms, _max = cross_validate_fit(self.x_raw, self.y_raw, order, nb_folds)
+            _rss = numpy.sum((_polynomial(self.x_raw) - self.y_raw) ** 2) if _polynomial is not None else numpy.inf
+            _bic = _nb_points * numpy.log(max(_rss / _nb_points, numpy.finfo(float).tiny)) + (order + 1) * numpy.log(_nb_points)
+            return (_polynomial, _reverse), {"order": order, "rms": _rms, "max": _max, "bic": float(_bic), "time": _time}
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            _results = list(executor.map(_evaluate, orders))
+
+        _report = []
+        for _fits, _row in _results:
+            if _fits[0] is not None:
+                self._order_fits[_row["order"]] = _fits
+            _report.append(_row)
+
+        _best_rms = min(_row["rms"] for _row in _report)
+        if not numpy.isfinite(_best_rms):
+            raise XCalibError("select_fit_order: no valid fit for orders %s" % orders, self)
+        _candidates = [_row for _row in _report if _row["rms"] <= _best_rms * (1 + AUTO_FIT_RMS_TOLERANCE)]
+        _order = min(_candidates, key=lambda _row: _row["bic"])["order"]
+
+        self._fit_order_report = _report
+        self._fit_order = _order
+        log.info("fit order selected: %d (cross-validation RMS=%g)", _order, _best_rms)
+        return _order
+
     def set_calib_time(self, timestamp):
         """
         time of creation of the calibration (seconds since epoch)
@@ -440,16 +1948,43 @@ class Xcalibu:
     def get_interpol_fill_value(self):
         return self._fill_value
 
+    def set_uniform_grid_tolerance(self, tolerance):
+        """
+        Set tolerance used to detect equally spaced points in INTERPOLATION TABLE
+        calibrations (see compute_interpolation()).
+        <tolerance>: float: max distance of points to the ideal grid, relative to the
+                     grid step (must be < 0.5) or None to never use the uniform grid engine.
+        default : 1e-3
+        """
+        if tolerance is not None and not 0 <= tolerance < 0.5:
+            raise ValueError("uniform grid tolerance must be in [0 ; 0.5[")
+        self._uniform_grid_tolerance = tolerance
+
+    def get_uniform_grid_tolerance(self):
+        return self._uniform_grid_tolerance
+
+    def get_interpol_engine(self):
+        """
+        Return name of the engine used for direct interpolation: "uniform grid",
+        "segment hint", "piecewise poly" or "interp1d"
+        (None if interpolation has not been computed).
+        """
+        return self._interpol_engine
+
     """
     x raw data numpy array.
     """
 
     def set_raw_x(self, arr_x):
         self.x_raw = arr_x
+        self._order_fits = {}
+        self._fitted_points = None
         self.Xmin = self.x_raw.min()
         self.Xmax = self.x_raw.max()
 
     def get_raw_x(self):
+        if self._load_pending:
+            self.ensure_loaded()
         return self.x_raw
 
     def set_raw_y(self, arr_y):
@@ -457,10 +1992,14 @@ class Xcalibu:
         Set y raw data numpy array.
         """
         self.y_raw = arr_y
+        self._order_fits = {}
+        self._fitted_points = None
         self.Ymin = self.y_raw.min()
         self.Ymax = self.y_raw.max()
 
     def get_raw_y(self):
+        if self._load_pending:
+            self.ensure_loaded()
         return self.y_raw
 
     """
@@ -491,32 +2030,66 @@ class Xcalibu:
     def load_calib(self):
         """
         Calibration loading :
-        * read calib file (Table or Poly)
+        * read calib source, file (possibly compressed) or string (Table or Poly)
         * parse header and data
         * fit points if required
+
+        Text is read by chunks of lines (see iter_line_chunks()). Header lines are
+        parsed one by one ; in each chunk, the block of TABLE data lines is
+        parsed at once by _parse_table_block() if it only contains data lines of
+        the format of its first line (and comments or empty lines).
         """
-        _x_min = float("inf")
-        _x_max = -float("inf")
-        _y_min = float("inf")
-        _y_max = -float("inf")
         _nb_points = 0
         _line_nb = 0
         _data_line_nb = 0
         _header_line_nb = 0
         _part_letter = "H"  # letter to indicate (in debug) the section of the calibration file: H(eader) or D(ata)
-        _xvalues = []
+        _xvalues = []  # values of data lines parsed one by one
         _yvalues = []
+        _x_parts = []  # arrays of values parsed (in order)
+        _y_parts = []
+        _xcalibu_re = None
 
         _coeffs_dict = {}
 
         _calib_file_name = self.get_calib_file_name()
         _calib_string = self.get_calib_string()
+        _calib_source = self.get_calib_source()
 
         _t0_loading = time.time()
+        self._order_fits = {}
 
-        if _calib_file_name is not None:
+        _binary = _calib_source is None and _calib_file_name is not None and is_binary_calib_file(_calib_file_name)
+
+        # Parameters to load with must be taken before they are changed by parsing.
+        _cache_params = None
+        if (
+            self._cache is not None
+            and _calib_source is None
+            and _calib_file_name is not None
+            and not _binary  # nothing to parse, data are memory-mapped
+            and not os.path.exists(_calib_file_name + JOURNAL_SUFFIX)  # file being edited
+            and self._cache.is_cached(_calib_file_name)
+        ):
+            _cache_params = self._cache_params()
+            if self._load_from_cache(_cache_params):
+                return
+            # Signature of the file parsed below.
+            _cache_source = self._cache.source_signature(_calib_file_name)
+            if _cache_source is None:
+                _cache_params = None
+        _nb_comments = len(self._comments)
+
+        calib_source = None  # file opened here (to be closed)
+        if _calib_source is not None:
+            log.info(f"load from source: {_calib_source!r}")
+            _lines_source = _calib_source
+        elif _calib_file_name is not None:
             try:
-                calib_source = open(_calib_file_name, mode="r")
+                if _binary:
+                    calib_source = open(_calib_file_name, mode="rb")
+                else:
+                    calib_source = open_calib_file(_calib_file_name)
                 log.info(f"open file: {_calib_file_name}")
             except IOError:
                 raise XCalibError(
@@ -526,207 +2099,189 @@ class Xcalibu:
                 raise XCalibError(
                     "error in calibration loading (file=%s)" % _calib_file_name, self
                 )
+            _lines_source = calib_source
         elif _calib_string is not None:
             # log.info("loading calib from string:")
-            calib_source = _calib_string.split("\n")
+            _lines_source = _calib_string
         else:
             raise RuntimeError(
                 "Unable to load calibration: no string of filename provided."
             )
 
         try:
-            for raw_line in calib_source:
-                _line_nb = _line_nb + 1
-
-                # Remove optional "whitespace" characters :
-                # string.whitespace -> '\t\n\x0b\x0c\r '
-                line = raw_line.strip()
-
-                # Line is empty or full of space(s).
-                if len(line) == 0:
-                    log.debug("line %4d%s : empty" % (_line_nb, _part_letter))
-                    continue
-
-                # Commented line
-                if line[0] == "#":
-                    log.debug(
-                        "line %4d%s : comment    : {%s}"
-                        % (_line_nb, _part_letter, line.rstrip())
-                    )
-                    self._comments.append(line)
-                    continue
-
-                # Match lines like :
-                # CALIB_<info> = <value>
-                matchCalibInfo = re.search(r"CALIB_(\w+)(?: )*=(?: )*(.+)", line)
-                if matchCalibInfo:
-                    _header_line_nb = _header_line_nb + 1
-                    _info = matchCalibInfo.group(1)
-                    _value = matchCalibInfo.group(2)
-
-                    log.debug(
-                        "line %4d%s : calib info : %30s   info={%s} value={%s}"
-                        % (
+            if _binary:
+                # Header only is parsed, data are memory-mapped.
+                _x_mapped, _y_mapped = self._read_binary_calib(calib_source)
+                _x_parts.append(_x_mapped)
+                _y_parts.append(_y_mapped)
+                _nb_points = _data_line_nb = len(_y_mapped)
+                _chunks = []
+            else:
+                _chunks = iter_line_chunks(_lines_source)
+
+            for _chunk in _chunks:
+                # Bulk parsing of TABLE data is tried once per chunk, at first data line of the chunk.
+                _block_tried = False
+
+                for _chunk_index, raw_line in enumerate(_chunk):
+                    _line_nb = _line_nb + 1
+
+                    # Remove optional "whitespace" characters :
+                    # string.whitespace -> '\t\n\x0b\x0c\r '
+                    line = raw_line.strip()
+
+                    # Line is empty or full of space(s).
+                    if len(line) == 0:
+                        log.debug("line %4d%s : empty", _line_nb, _part_letter)
+                        continue
+
+                    # Commented line
+                    if line[0] == "#":
+                        log.debug("line %4d%s : comment    : {%s}", _line_nb, _part_letter, line)
+                        self._comments.append(line)
+                        continue
+
+                    # Match lines like :
+                    # CALIB_<info> = <value>
+                    matchCalibInfo = _CALIB_INFO_RE.search(line)
+                    if matchCalibInfo:
+                        _header_line_nb = _header_line_nb + 1
+                        _info = matchCalibInfo.group(1)
+                        _value = matchCalibInfo.group(2)
+
+                        log.debug(
+                            "line %4d%s : calib info : %30s   info={%s} value={%s}",
                             _line_nb,
                             _part_letter,
                             matchCalibInfo.group(),
                             _info,
                             _value,
                         )
-                    )
 
-                    if _info == "NAME":
-                        self.set_calib_name(_value)
-                    elif _info == "TYPE":
-                        self.set_calib_type(_value)
-                    elif _info == "TIME":
-                        self.set_calib_time(int(_value.split(".")[0]))
-                    elif _info == "ORDER":
-                        self.set_calib_order(int(_value))
-                        self._poly_coeffs = numpy.zeros(self.get_calib_order() + 1)
-                    elif _info == "XMIN":
-                        self.Xmin = float(_value)
-                    elif _info == "XMAX":
-                        self.Xmax = float(_value)
-                    elif _info == "DESC":
-                        self.set_calib_description(_value)
-                    else:
-                        _msg = (
-                            "Parsing Error : unknown calib field {%s} with value {%s} at line %d"
-                            % (_info, _value, _line_nb)
-                        )
-                        raise XCalibError(_msg, self)
+                        self._set_header_field(_info, _value, _line_nb)
 
-                else:
-                    """
-                    Read DATA line.
-                    NdP: https://regex101.com/  :)
-                    """
-                    if self.get_calib_type() == "TABLE":
-
-                        # Match lines like: 13.123000  (1 column format)
-                        # 
-                        matchPoint = re.search(
-                            r"^([+-]?\d+\.?\d*[eE]?[+-]*\d*)$",
-                            line,
-                        )
+                    else:
+                        """
+                        Read DATA line.
+                        NdP: https://regex101.com/  :)
+                        """
+                        if self.get_calib_type() == "TABLE":
+
+                            if not _block_tried:
+                                # First data line of the chunk: try to parse remaining lines of the chunk at once.
+                                _block_tried = True
+                                _block = self._parse_table_block(_chunk[_chunk_index:], _data_line_nb)
+                                if _block is not None:
+                                    _block_x, _block_y, _block_comments = _block
+                                    if _xvalues:
+                                        _x_parts.append(numpy.array(_xvalues))
+                                        _y_parts.append(numpy.array(_yvalues))
+                                        _xvalues, _yvalues = [], []
+                                    _x_parts.append(_block_x)
+                                    _y_parts.append(_block_y)
+                                    _nb_points += len(_block_y)
+                                    _data_line_nb += len(_block_y)
+                                    self._comments.extend(_block_comments)
+                                    _line_nb += len(_chunk) - _chunk_index - 1
+                                    _part_letter = "D"
+                                    log.debug(
+                                        "%d data lines parsed at once (%s)", len(_block_y), self._calib_file_format
+                                    )
+                                    break
 
-                        if matchPoint:
-                            log.debug("matched ONE_COL")
-                            self._calib_file_format = "ONE_COL"
-                        else:
-                            # Match lines like: 13.000000 15.941000 (2 columns format)
-                            # ()      : save recognized group pattern
-                            # [+-]?   : + or - or nothing
-                            # \d      : any digit [0-9]
-                            # (?: re) : Groups regular expressions without remembering matched text.
-                            # \s      : Whitespace, equivalent to [\t\n\r\f].
-                            matchPoint = re.search(
-                                r"^([+-]?\d+\.?\d*[eE]?[+-]*\d*)(?:\s+)([+-]?\d+\.?\d*[eE]?[+-]*\d*)$",
-                                line,
-                            )
+                            # Match lines like: 13.123000  (1 column format)
+                            matchPoint = _ONE_COL_RE.search(line)
 
                             if matchPoint:
-                                log.debug("matched TWO_COLS")
-                                self._calib_file_format = "TWO_COLS"
+                                log.debug("matched ONE_COL")
+                                self._calib_file_format = "ONE_COL"
                             else:
+                                # Match lines like: 13.000000 15.941000 (2 columns format)
+                                matchPoint = _TWO_COLS_RE.search(line)
 
-                                # Match lines like:  U35M [13.000000] = 15.941000 (XCALIBU format)
-                                #                    U35M[0.8e-2] = -0.83e-02
-                                # name of the calib (U35M) must be known.
-                                if self.get_calib_name() is None:
-                                    raise XCalibError(
-                                        "Parsing Error : Line %d : name of the calibration is unknown."
-                                        % _line_nb,
-                                        self,
-                                    )
+                                if matchPoint:
+                                    log.debug("matched TWO_COLS")
+                                    self._calib_file_format = "TWO_COLS"
                                 else:
-                                    # ()      : save recognized group pattern
-                                    # %s      : substitution of the calib name in regex string
-                                    # .       : any character except a newline
-                                    # (?: re) : Groups regular expressions without remembering matched text
-                                    # \s      : Whitespace, equivalent to [\t\n\r\f]
-                                    matchPoint = re.search(
-                                        r"%s(?:\s*)\[(.+)\](?:\s*)=(?:\s*)(.+)"
-                                        % self.get_calib_name(),
-                                        line,
-                                    )
-                                    if matchPoint:
-                                        log.debug("matched XCALIBU")
-                                        self._calib_file_format = "XCALIBU"
-
-                        if matchPoint:
-                            # At least one line of the calib DATA has been read
-                            _data_line_nb = _data_line_nb + 1
-                            # -> no more in header.
-                            _part_letter = "D"
-
-                            try:
-                                _xval = float(matchPoint.group(1))
-                                _yval = float(matchPoint.group(2))
-                            except:
-                                _xval = _data_line_nb
-                                _yval = float(matchPoint.group(1))
-
-                            log.debug(
-                                "line %4d%s : raw calib  : %30s   xval=%8g yval=%8g"
-                                % (
+
+                                    # Match lines like:  U35M [13.000000] = 15.941000 (XCALIBU format)
+                                    #                    U35M[0.8e-2] = -0.83e-02
+                                    # name of the calib (U35M) must be known.
+                                    if self.get_calib_name() is None:
+                                        raise XCalibError(
+                                            "Parsing Error : Line %d : name of the calibration is unknown."
+                                            % _line_nb,
+                                            self,
+                                        )
+                                    else:
+                                        # Pattern is compiled once per calib name.
+                                        if _xcalibu_re is None or _xcalibu_re[0] != self.get_calib_name():
+                                            _xcalibu_re = (
+                                                self.get_calib_name(),
+                                                re.compile(_XCALIBU_PATTERN % self.get_calib_name()),
+                                            )
+                                        matchPoint = _xcalibu_re[1].search(line)
+                                        if matchPoint:
+                                            log.debug("matched XCALIBU")
+                                            self._calib_file_format = "XCALIBU"
+
+                            if matchPoint:
+                                # At least one line of the calib DATA has been read
+                                _data_line_nb = _data_line_nb + 1
+                                # -> no more in header.
+                                _part_letter = "D"
+
+                                try:
+                                    _xval = float(matchPoint.group(1))
+                                    _yval = float(matchPoint.group(2))
+                                except:
+                                    _xval = _data_line_nb
+                                    _yval = float(matchPoint.group(1))
+
+                                log.debug(
+                                    "line %4d%s : raw calib  : %30s   xval=%8g yval=%8g",
                                     _line_nb,
                                     _part_letter,
                                     matchPoint.group(),
                                     _xval,
                                     _yval,
                                 )
-                            )
-                            _nb_points = _nb_points + 1
-
-                            _xvalues.append(_xval)
-                            _yvalues.append(_yval)
+                                _nb_points = _nb_points + 1
 
-                            _x_min = min(_xval, _x_min)
-                            _x_max = max(_xval, _x_max)
-                            _y_min = min(_yval, _y_min)
-                            _y_max = max(_yval, _y_max)
+                                _xvalues.append(_xval)
+                                _yvalues.append(_yval)
 
-                        else:
-                            log.debug(
-                                "line %4d%s : nomatch    : {%s}"
-                                % (_line_nb, _part_letter, line.rstrip())
-                            )
-
-                    elif self.get_calib_type() == "POLY":
-                        # Matches lines like :
-                        # C0 = 28.78
-                        # C3 = 8.93556e-10
-                        matchCoef = re.search(
-                            r"\s*C(\d+)\s*=\s*([+-]?\d+\.?\d*[eE]?[+-]*\d*)", line, re.M | re.I
-                        )
-                        if matchCoef:
-                            _data_line_nb = _data_line_nb + 1
-                            _coeff = int(matchCoef.group(1))
-                            _value = float(matchCoef.group(2))
-
-                            log.debug(
-                                "line %4d%s : raw calib  : %15s   coef=%8g value=%8g"
-                                % (
+                            else:
+                                log.debug("line %4d%s : nomatch    : {%s}", _line_nb, _part_letter, line)
+
+                        elif self.get_calib_type() == "POLY":
+                            # Matches lines like :
+                            # C0 = 28.78
+                            # C3 = 8.93556e-10
+                            matchCoef = _POLY_COEF_RE.search(line)
+                            if matchCoef:
+                                _data_line_nb = _data_line_nb + 1
+                                _coeff = int(matchCoef.group(1))
+                                _value = float(matchCoef.group(2))
+
+                                log.debug(
+                                    "line %4d%s : raw calib  : %15s   coef=%8g value=%8g",
                                     _line_nb,
                                     _part_letter,
                                     matchCoef.group(),
                                     _coeff,
                                     _value,
                                 )
-                            )
 
-                            # Fill temporary dict.
-                            log.debug(f"------ _coeff={_coeff}  _value={_value}")
-                            _coeffs_dict[_coeff] = _value
+                                # Fill temporary dict.
+                                _coeffs_dict[_coeff] = _value
 
-                    else:
-                        raise XCalibError(
-                            "%s line %d : invalid calib type : %s\nraw line : {%s}"
-                            % (calib_source, _line_nb, self.get_calib_type(), line),
-                            self,
-                        )
+                        else:
+                            raise XCalibError(
+                                "%s line %d : invalid calib type : %s\nraw line : {%s}"
+                                % (calib_source or "calib source", _line_nb, self.get_calib_type(), line),
+                                self,
+                            )
 
             # End of parsing of lines.
 
@@ -743,15 +2298,34 @@ class Xcalibu:
             print(sys.exc_info()[1])
             print("-E-----------------------------------------------------")
         finally:
-            if _calib_file_name is not None:
+            if calib_source is not None:
                 calib_source.close()
 
+        if _xvalues or not _x_parts:
+            _x_parts.append(numpy.array(_xvalues))
+            _y_parts.append(numpy.array(_yvalues))
+        if len(_x_parts) == 1:
+            # No copy (memory-mapped data of binary files stay mapped).
+            self.x_raw = numpy.asarray(_x_parts[0])
+            self.y_raw = numpy.asarray(_y_parts[0])
+        else:
+            self.x_raw = numpy.concatenate(_x_parts)
+            self.y_raw = numpy.concatenate(_y_parts)
+
+        if self.get_calib_type() == "TABLE" and _calib_source is None and _calib_file_name is not None:
+            if self._replay_journal():
+                _nb_points = self._data_lines = len(self.x_raw)
+
         if self.get_calib_type() == "TABLE":
             self.nb_calib_points = _nb_points
-            self.Xmin = _x_min
-            self.Xmax = _x_max
-            self.Ymin = _y_min
-            self.Ymax = _y_max
+            if _nb_points > 0:
+                self.Xmin = self.x_raw.min().item()
+                self.Xmax = self.x_raw.max().item()
+                self.Ymin = self.y_raw.min().item()
+                self.Ymax = self.y_raw.max().item()
+            else:
+                self.Xmin = self.Ymin = float("inf")
+                self.Xmax = self.Ymax = -float("inf")
             log.info(
                 " Xmin = %10g  Xmax = %10g  Nb points =%5d"
                 % (self.Xmin, self.Xmax, _nb_points)
@@ -761,9 +2335,6 @@ class Xcalibu:
                 % (self.Ymin, self.Ymax, _nb_points)
             )
 
-        self.x_raw = numpy.array(_xvalues)
-        self.y_raw = numpy.array(_yvalues)
-
         if len(self.x_raw) < 100:
             log.info("Raw X data : %s" % ", ".join(list(map(str, self.x_raw))))
             log.info("Raw Y data : %s" % ", ".join(list(map(str, self.y_raw))))
@@ -799,6 +2370,383 @@ class Xcalibu:
                     f"len(_coeffs_dict)+1={len(_coeffs_dict)+1}  _declared_order={_declared_order}"
                 )
 
+        if _cache_params is not None and self._data_lines > 0:
+            self._store_in_cache(_cache_params, self._comments[_nb_comments:], _cache_source)
+
+    def load_calib_header(self):
+        """
+        Header-only loading (lazy mode) of a text TABLE calibration file or string:
+        * parse comments and CALIB_<info> lines up to the first data line
+        Data, fit and interpolation are built at first use (see ensure_loaded()).
+        X and Y ranges are left to NaN: data are read by min_x() ... (first and
+        last data lines do not give the ranges of unsorted or non monotonic tables).
+
+        Other calibrations (POLY, binary files, sources) are fully loaded: their data
+        are small, memory-mapped or can be read once only.
+        """
+        _calib_file_name = self.get_calib_file_name()
+        _calib_string = self.get_calib_string()
+
+        if self.get_calib_source() is not None or (
+            _calib_file_name is not None and is_binary_calib_file(_calib_file_name)
+        ):
+            self.load_calib()
+            return
+
+        _nb_comments = len(self._comments)
+        _first_line = None
+        _line_nb = 0
+        calib_source = open_calib_file(_calib_file_name) if _calib_file_name is not None else None
+        try:
+            # Small chunks: only header is read.
+            _source = calib_source if calib_source is not None else _calib_string
+            for _chunk in iter_line_chunks(_source, chunk_size=2**12, chunk_lines=2**6):
+                for raw_line in _chunk:
+                    _line_nb += 1
+                    line = raw_line.strip()
+                    if len(line) == 0:
+                        continue
+                    if line[0] == "#":
+                        self._comments.append(line)
+                        continue
+                    matchCalibInfo = _CALIB_INFO_RE.search(line)
+                    if not matchCalibInfo:
+                        _first_line = line
+                        break
+                    self._set_header_field(matchCalibInfo.group(1), matchCalibInfo.group(2), _line_nb)
+                if _first_line is not None:
+                    break
+        except XCalibError:
+            print(f"\n--------------- ERROR IN PARSING ({self.get_calib_name()}) --------------------")
+            print(sys.exc_info()[1])
+            print("-E-----------------------------------------------------")
+        finally:
+            if calib_source is not None:
+                calib_source.close()
+
+        if self.get_calib_type() != "TABLE" or _first_line is None:
+            del self._comments[_nb_comments:]
+            self.load_calib()
+            return
+
+        self._header_only = True
+        self._header_comments = _nb_comments
+
+        # Ranges (possibly read in CALIB_XMIN / CALIB_XMAX lines) are those of the data.
+        self.Xmin = self.Xmax = self.Ymin = self.Ymax = numpy.nan
+        log.info("header loaded (data not read)")
+
+    def is_loaded(self):
+        """
+        Return False if data, fit or interpolation of a lazy calibration are not built yet.
+        """
+        return not self._load_pending
+
+    def ensure_loaded(self):
+        """
+        Build data, fit and interpolation of a lazy calibration (once, thread-safe).
+        Called at first use of data (get_y(), get_x(), get_raw_x()...).
+        """
+        with self._load_lock:
+            # Nested calls (by the loading itself) have nothing to do.
+            if not self._load_pending or self._loading:
+                return
+            self._loading = True
+            try:
+                if self._header_only:
+                    # Header is parsed again with data.
+                    del self._comments[self._header_comments:]
+                    self.load_calib()
+                    self._header_only = False
+                self.check_monotonic()
+                self.compute_interpolation()
+                self._load_pending = False
+            finally:
+                self._loading = False
+
+    """
+    Cache of parsed calibration files
+    """
+
+    def set_cache_dir(self, cache_dir, max_size=None):
+        """
+        Use <cache_dir> to cache parsed calibration files (None: no cache).
+        <max_size>: max size of the cache directory in bytes (default: 256 MB).
+        Default cache directory can be given by XCALIBU_CACHE_DIR environment variable.
+        """
+        if cache_dir is None:
+            self._cache = None
+        else:
+            self._cache = CalibCache(cache_dir, max_size)
+
+    def get_cache_dir(self):
+        return None if self._cache is None else self._cache.cache_dir
+
+    def _cache_params(self):
+        """
+        Return parameters set before loading which change the result of load_calib().
+        """
+        return {
+            "name": self.get_calib_name(),
+            "type": self.get_calib_type(),
+            "limits": [_json_number(self.Xmin), _json_number(self.Xmax)],
+            "rec_method": self.get_reconstruction_method(),
+            "fit_order": "AUTO" if self._fit_order_auto else self.get_fit_order(),
+        }
+
+    def _store_in_cache(self, params, comments, source):
+        """
+        Store the state built by load_calib() in the cache.
+        <comments>: comments read by load_calib().
+        <source>: signature of the file taken before parsing it.
+        """
+        arrays = {"x_raw": self.x_raw, "y_raw": self.y_raw}
+        if self._poly_coeffs is not None:
+            arrays["poly_coeffs"] = numpy.asarray(self._poly_coeffs, dtype=float)
+        _fitted = self.get_calib_type() == "TABLE" and self.get_reconstruction_method() == "POLYFIT"
+        if _fitted:
+            arrays["fit_coef"] = self._polynomial.coef
+            arrays["fit_domain"] = self._polynomial.domain
+            arrays["fit_window"] = self._polynomial.window
+            arrays["coeffR"] = self.coeffR
+            arrays["fitR_coef"], arrays["fitR_domain"] = self._reverse_fit
+
+        metadata = {
+            "name": self.get_calib_name(),
+            "type": self.get_calib_type(),
+            "time": self.get_calib_time(),
+            "order": self.get_calib_order(),
+            "description": self.get_calib_description(),
+            "file_format": self._calib_file_format,
+            "data_lines": self._data_lines,
+            "nb_calib_points": getattr(self, "nb_calib_points", None),
+            "limits": [_json_number(_lim) for _lim in (self.Xmin, self.Xmax, self.Ymin, self.Ymax)],
+            "comments": comments,
+            "poly_coeffs_list": isinstance(self._poly_coeffs, list),
+            "fitted": _fitted,
+        }
+        self._cache.store(self.get_calib_file_name(), params, arrays, metadata, source)
+
+    def _load_from_cache(self, params):
+        """
+        Restore the state built by load_calib() from the cache.
+        Return False if there is no valid cache entry.
+        """
+        _entry = self._cache.load(self.get_calib_file_name(), params)
+        if _entry is None:
+            return False
+        arrays, metadata = _entry
+
+        self.set_calib_name(metadata["name"])
+        if metadata["type"] is not None:
+            self.set_calib_type(metadata["type"])
+        self.set_calib_time(metadata["time"])
+        self._calib_order = metadata["order"]
+        self.set_calib_description(metadata["description"])
+        self._calib_file_format = metadata["file_format"]
+        self._data_lines = metadata["data_lines"]
+        if metadata["nb_calib_points"] is not None:
+            self.nb_calib_points = metadata["nb_calib_points"]
+        self.Xmin, self.Xmax, self.Ymin, self.Ymax = metadata["limits"]
+        self._comments.extend(metadata["comments"])
+        self.x_raw = arrays["x_raw"]
+        self.y_raw = arrays["y_raw"]
+
+        if "poly_coeffs" in arrays:
+            _coeffs = arrays["poly_coeffs"]
+            if self.get_calib_type() == "POLY":
+                self.set_coeffs(_coeffs.tolist())
+            else:
+                self._poly_coeffs = _coeffs.tolist() if metadata["poly_coeffs_list"] else _coeffs
+
+        if metadata["fitted"]:
+            self._polynomial = Polynomial(
+                arrays["fit_coef"], domain=arrays["fit_domain"], window=arrays["fit_window"]
+            )
+            self._poly_coeffs = list(self._polynomial.coef)
+            self.coeffR = arrays["coeffR"]
+            if "fitR_coef" in arrays:
+                self._reverse_fit = (arrays["fitR_coef"], arrays["fitR_domain"])
+            if self._fit_order_auto:
+                self._fit_order = len(self._polynomial.coef) - 1
+            self._fitted_points = None
+
+        log.info(f"DATA lines read from cache : {self._data_lines}")
+        return True
+
+    def _set_header_field(self, info, value, line_nb):
+        """
+        Set calibration parameter read in a header line: CALIB_<info> = <value>
+        """
+        if info == "NAME":
+            self.set_calib_name(value)
+        elif info == "TYPE":
+            self.set_calib_type(value)
+        elif info == "TIME":
+            self.set_calib_time(int(value.split(".")[0]))
+        elif info == "ORDER":
+            self.set_calib_order(int(value))
+            self._poly_coeffs = numpy.zeros(self.get_calib_order() + 1)
+        elif info == "XMIN":
+            self.Xmin = float(value)
+        elif info == "XMAX":
+            self.Xmax = float(value)
+        elif info == "DESC":
+            self.set_calib_description(value)
+        else:
+            _msg = (
+                "Parsing Error : unknown calib field {%s} with value {%s} at line %d"
+                % (info, value, line_nb)
+            )
+            raise XCalibError(_msg, self)
+
+    def _parse_table_block(self, lines, data_line_nb=0):
+        """
+        Parse at once the TABLE data lines <lines> (list of raw lines starting at
+        a data line). The format is sniffed on the first line ; the block
+        is read by numpy if all its lines are data lines of this format, comments
+        or empty lines.
+        <data_line_nb>: number of data lines already read (X values of ONE_COL format follow it).
+
+        Return (x values, y values, comments) or None if the block has to be parsed line by line.
+        """
+        _first_line = lines[0].strip()
+        block = "\n".join(lines)
+
+        if "CALIB_" in block:
+            return None
+
+        comments = []
+        if "#" in block:
+            comments = _COMMENT_LINE_RE.findall(block)
+            block = _COMMENT_LINE_RE.sub("", block)
+            if "#" in block:  # comment at end of a data line
+                return None
+
+        if _ONE_COL_RE.search(_first_line) or _TWO_COLS_RE.search(_first_line):
+            _nb_columns = 1 if _ONE_COL_RE.search(_first_line) else 2
+            if block.translate(_NUMERIC_CHARS) or block.startswith(".") or _LEADING_DOT_RE.search(block):
+                return None
+            # loadtxt ignores empty lines and fails on lines with a different number of columns.
+            try:
+                values = numpy.loadtxt(io.StringIO(block), ndmin=2, comments=None)
+            except ValueError:
+                return None
+            if values.shape[1] != _nb_columns:
+                return None
+            _nb_lines = len(values)
+
+            if _nb_columns == 1:
+                self._calib_file_format = "ONE_COL"
+                x_values = numpy.arange(data_line_nb + 1, data_line_nb + _nb_lines + 1)
+                y_values = values[:, 0]
+            else:
+                self._calib_file_format = "TWO_COLS"
+                x_values = values[:, 0]
+                y_values = values[:, 1]
+
+        elif self.get_calib_name() is not None:
+            # _XCALIBU_PATTERN not matching across lines.
+            _xcalibu_re = re.compile(
+                r"^[^\n]*?%s[^\S\n]*\[([^\n]+)\][^\S\n]*=[^\S\n]*([^\n]+)$" % self.get_calib_name(),
+                re.M,
+            )
+            matches = _xcalibu_re.findall(block)
+            # All non empty lines must match (comment lines are now empty).
+            _nb_lines = len(lines) - lines.count("") - len(comments)
+            if len(matches) != _nb_lines:
+                _nb_lines = block.count("\n") + 1 - len(_EMPTY_LINE_RE.findall(block))
+            if len(matches) == 0 or len(matches) != _nb_lines:
+                return None
+            try:
+                values = numpy.array(matches, dtype=float)
+            except ValueError:
+                return None
+            self._calib_file_format = "XCALIBU"
+            x_values = values[:, 0]
+            y_values = values[:, 1]
+
+        else:
+            return None
+
+        return x_values, y_values, comments
+
+    def _read_binary_calib(self, calib_source):
+        """
+        Parse the header of binary calibration file <calib_source> (opened in binary mode)
+        and return X and Y columns as read-only numpy memmaps.
+
+        File layout (see _save_binary_calib_file()):
+        * text header: BINARY_CALIB_MAGIC line, CALIB_<info>=<value> lines and
+          comments, ended by NUL bytes up to the X column
+        * CALIB_POINTS float64 little-endian X values at offset CALIB_X_OFFSET
+        * CALIB_POINTS float64 little-endian Y values at offset CALIB_Y_OFFSET
+        """
+        _header = b""
+        while b"\0" not in _header:
+            _chunk = calib_source.read(BINARY_CALIB_ALIGNMENT)
+            if not _chunk:
+                raise XCalibError("Parsing Error : no end of binary calibration header", self)
+            _header += _chunk
+
+        _layout = {}
+        _lines = _header[: _header.index(b"\0")].decode().split("\n")
+        for _line_nb, raw_line in enumerate(_lines[1:], start=2):  # skip magic line
+            line = raw_line.strip()
+            if len(line) == 0:
+                continue
+            if line[0] == "#":
+                self._comments.append(line)
+                continue
+            matchCalibInfo = _CALIB_INFO_RE.search(line)
+            if matchCalibInfo is None:
+                raise XCalibError("Parsing Error : invalid binary header line %d: {%s}" % (_line_nb, line), self)
+            _info, _value = matchCalibInfo.groups()
+            if _info in ("POINTS", "X_OFFSET", "Y_OFFSET"):
+                _layout[_info] = int(_value)
+            else:
+                self._set_header_field(_info, _value, _line_nb)
+
+        if self.get_calib_type() != "TABLE":
+            raise XCalibError("binary calibration files are TABLE calibrations only", self)
+
+        self._calib_file_format = "BINARY"
+        _nb_points = _layout["POINTS"]
+        x_values = numpy.memmap(calib_source, dtype="<f8", mode="r", offset=_layout["X_OFFSET"], shape=(_nb_points,))
+        y_values = numpy.memmap(calib_source, dtype="<f8", mode="r", offset=_layout["Y_OFFSET"], shape=(_nb_points,))
+        log.info(f"binary calibration: {_nb_points} points memory-mapped")
+        return x_values, y_values
+
+    def set_calib_file_format(self, file_format):
+        """
+        Set format of TABLE data in saved calibration files:
+        * "XCALIBU": <name>[<x>] = <y> lines (default)
+        * "TWO_COLS": <x> <y> lines
+        * "ONE_COL": <y> lines (loaded with x = 1, 2, ...) (saved as TWO_COLS)
+        * "BINARY": binary float64 columns, memory-mapped on loading
+        Format is set by loading a file.
+        """
+        if file_format not in ["XCALIBU", "TWO_COLS", "ONE_COL", "BINARY"]:
+            raise XCalibError("unknown calib file format : %s " % file_format, self)
+        self._calib_file_format = file_format
+
+    def set_save_precision(self, precision):
+        """
+        Set format of numbers in saved text calibration files:
+        * None: 6 decimals ("%f") (default)
+        * "ROUND_TRIP": shortest representation reloaded as the same float64 values
+        * int: number of significant digits
+        """
+        if not (precision is None or precision == "ROUND_TRIP" or (isinstance(precision, int) and precision > 0)):
+            raise XCalibError("invalid save precision : %s " % precision, self)
+        self._save_precision = precision
+
+    def get_save_precision(self):
+        return self._save_precision
+
+    def get_calib_file_format(self):
+        return self._calib_file_format
+
     def set_coeffs(self, coeffs):
         """
         Set coefficients of a POLY calib
@@ -829,6 +2777,7 @@ class Xcalibu:
         """ """
         self.Xmin = xmin
         self.Xmax = xmax
+        self._fitted_points = None
 
     def set_sampling_nb_points(self, nb_points):
         """
@@ -838,6 +2787,9 @@ class Xcalibu:
         # SAMPLING_NB_POINTS =   40 -> max diff= 0.0363018
         # SAMPLING_NB_POINTS =  400 -> max diff= 0.0003790
         # SAMPLING_NB_POINTS = 4000 -> max diff= 0.0000038 = 3.8e-06
+
+        With NEWTON poly reverse method (default), the sampled table is only used
+        to start Newton iterations: a few points are enough to get exact values.
         """
 
         self._sampling_nb_points = nb_points
@@ -845,6 +2797,39 @@ class Xcalibu:
     def get_sampling_nb_points(self):
         return self._sampling_nb_points
 
+    def set_sampling_tolerance(self, tolerance):
+        """
+        Set the maximum error of POLY reverse calibration via sampled table
+        (INTERPOLATION reconstruction method) instead of a number of points.
+        Points are then sampled adaptively: more points where curvature is high.
+        <tolerance>: float (in X unit) or None to use <sampling nb points> equally spaced points.
+        """
+        if tolerance is not None and tolerance <= 0:
+            raise ValueError("sampling tolerance must be positive")
+        self._sampling_tolerance = tolerance
+
+    def get_sampling_tolerance(self):
+        return self._sampling_tolerance
+
+    def get_sampling_max_error(self):
+        """
+        Return max reverse error reached by adaptive sampling (None if not used).
+        """
+        return self._sampling_max_error
+
+    def set_poly_reverse_method(self, method):
+        """
+        Set method used to calculate reverse values (get_x()) of monotonic POLY calibrations:
+        * "NEWTON": Newton solver seeded by a table of <sampling nb points> points (default)
+        * "INTERPOLATION": interpolation of the sampled table (if reconstruction method is INTERPOLATION)
+        """
+        if method not in ["NEWTON", "INTERPOLATION"]:
+            raise XCalibError("unknown poly reverse method : %s " % method, self)
+        self._poly_reverse_method = method
+
+    def get_poly_reverse_method(self):
+        return self._poly_reverse_method
+
     def fit(self):
         """
         Fit raw data if needed.
@@ -860,10 +2845,39 @@ class Xcalibu:
             )
             return
 
+        _time0 = time.perf_counter()
+
+        if self._fit_order_auto:
+            self.select_fit_order()
+
         _order = self.get_fit_order()
         self._poly_coeffs = numpy.zeros(_order + 1)
+        self._incremental_fit = None  # built at first insert / delete (see _update_fit())
+
+        # Fits already computed at this order (select_fit_order() or previous fit()) are reused.
+        if _order not in self._order_fits:
+            self._order_fits[_order] = self._fit_at_order(_order)
+        _polynomial, _reverse = self._order_fits[_order]
+        self._set_reverse_fit(_reverse)
+        if _polynomial is not None:
+            self._polynomial = _polynomial
+            self._poly_coeffs = list(self._polynomial.coef)
 
-        _time0 = time.perf_counter()
+        self._fitted_points = None  # see x_fitted ...
+
+        # Fit duration display.
+        _fit_duration = time.perf_counter() - _time0
+
+        log.info("Fitting tooks %s" % _fit_duration)
+
+    def _fit_at_order(self, order):
+        """
+        Return (direct Polynomial, (coefficients, domain) of reverse Chebyshev series)
+        fitting raw data at <order>
+        (Polynomial is None if the fit failed).
+        Only reads raw data: can be called concurrently (see select_fit_order()).
+        """
+        _polynomial = None
 
         # Fit direct conversion.
         try:
@@ -873,38 +2887,185 @@ class Xcalibu:
             # log.info("NUMPY POLYFIT=", self._poly_coeffs)
 
             # Calculate Numpy Polynomial and fit coeffs.
-            self._polynomial = numpy.polynomial.polynomial.Polynomial.fit(
-                self.x_raw, self.y_raw, _order, window=[self.Xmin, self.Xmax]
+            _polynomial = numpy.polynomial.polynomial.Polynomial.fit(
+                self.x_raw, self.y_raw, order, window=[self.Xmin, self.Xmax]
             )
-            self._poly_coeffs = list(self._polynomial.coef)
 
-        except numpy.RankWarning:
-            print(f"XCALIBU ({self.get_calib_name()}): ERROR: not enough data")
+        except numpy.RankWarning:
+            print(f"XCALIBU ({self.get_calib_name()}): ERROR: not enough data")
+
+        # Fit reciprocal conversion: in the scaled domain [Ymin ; Ymax] -> [-1 ; 1]
+        # (a fit of raw Y values is ill-conditioned for large offsets or orders).
+        _reverse = Chebyshev.fit(self.y_raw, self.x_raw, order)
+
+        return _polynomial, (_reverse.coef, _reverse.domain)
+
+    @property
+    def _polynomial(self):
+        if self._polynomial_coeffs is not None:
+            # Fit of raw data set by _set_fit(): same domain and window as in fit().
+            _window = [self.Xmin, self.Xmax]
+            self._polynomial_obj = Polynomial(self._polynomial_coeffs, domain=_window, window=_window)
+            self._polynomial_coeffs = None
+        return self._polynomial_obj
+
+    @_polynomial.setter
+    def _polynomial(self, polynomial):
+        self._polynomial_obj = polynomial
+        self._polynomial_coeffs = None
 
-        self.x_fitted = numpy.linspace(self.Xmin, self.Xmax, 50)
-        self.y_fitted = numpy.linspace(-100, 100, 50)
-        self.y_fitted = list(map(self.calc_poly_value, self.x_fitted))
+    def _set_fit(self, coeffs, reverse, coeffR):
+        """
+        Set fits of raw data computed outside of fit() (see fit_tables()): direct
+        polynomial <coeffs> (increasing degrees ; Polynomial object built when needed),
+        <reverse> (coefficients, domain) of Chebyshev series and <coeffR> (see
+        _set_reverse_fit()).
+        """
+        self._incremental_fit = None
+        self._polynomial_obj = None
+        self._polynomial_coeffs = coeffs
+        self._poly_coeffs = list(coeffs)
+        self._set_reverse_fit(reverse, coeffR)
+        self._fitted_points = None
+
+    def _set_reverse_fit(self, reverse, coeffR=None):
+        """
+        Set <reverse> (coefficients, domain) of Chebyshev series used by calc_reverse_value()
+        and coeffR: its coefficients as a polynomial of y (decreasing degrees, numpy.polyfit
+        rule), converted from <reverse> if not given.
+        """
+        self._reverse_fit = reverse
+        if coeffR is None:
+            coeffR = chebyshev_to_power(*reverse)[::-1]
+        self.coeffR = coeffR
 
-        # Fit reciprocal conversion ???
-        self.coeffR = numpy.polyfit(self.y_raw, self.x_raw, _order)
+    def get_reverse_fit_info(self):
+        """
+        Return a dict about the reverse fit of a TABLE + POLYFIT calibration (None if not fitted):
+        * "condition": condition number of the least squares matrix of the fit (Chebyshev
+          polynomials of the scaled Y)
+        * "raw_condition": condition number of the matrix of a fit of raw Y values
+          (numpy.polyfit, columns normalized)
+        * "round_trip_error": max |x - calc_reverse_value(calc_poly_value(x))| over raw X values
+        """
+        if self._reverse_fit is None or self.get_calib_type() != "TABLE":
+            return None
+        _coeffs, _domain = self._reverse_fit
+        _order = len(_coeffs) - 1
+        _off, _scl = numpy.polynomial.polyutils.mapparms(_domain, [-1, 1])
+        _t = _off + _scl * self.y_raw
+        _raw_vander = numpy.polynomial.polynomial.polyvander(self.y_raw, _order)
+        _raw_vander /= numpy.sqrt(numpy.sum(_raw_vander**2, axis=0))
+        _round_trip = self.calc_reverse_value(self.calc_poly_value(self.x_raw)) - self.x_raw
+        return {
+            "condition": float(numpy.linalg.cond(numpy.polynomial.chebyshev.chebvander(_t, _order))),
+            "raw_condition": float(numpy.linalg.cond(_raw_vander)),
+            "round_trip_error": float(numpy.nanmax(numpy.abs(_round_trip))),
+        }
+
+    def _update_fit(self, added=(), removed=()):
+        """
+        Update POLYFIT fits of a TABLE after insertion of points <added> and removal
+        of points <removed> ((x, y) pairs): direct and reverse fits are updated point by
+        point (see IncrementalPolyFit) ; full fit if first update or if not stable.
+        """
+        if self.get_calib_type() != "TABLE" or self.get_reconstruction_method() != "POLYFIT":
+            return
+        if self._replaying_journal:  # fitted once loaded
+            return
 
-        self.x_fittedR = numpy.linspace(self.Ymin, self.Ymax, 50)
-        self.y_fittedR = numpy.linspace(-100, 100, 50)
-        self.y_fittedR = list(map(self.calc_reverse_value, self.x_fittedR))
+        if self._incremental_fit is None or self._incremental_fit[0].order != self.get_fit_order():
+            self.fit()
+            _order = self.get_fit_order()
+            self._incremental_fit = (
+                IncrementalPolyFit(self.x_raw, self.y_raw, _order),
+                IncrementalPolyFit(self.y_raw, self.x_raw, _order),
+            )
+            return
 
-        # Fit duration display.
-        _fit_duration = time.perf_counter() - _time0
+        _direct, _reverse = self._incremental_fit
+        for x, y in added:
+            _direct.add(x, y)
+            _reverse.add(y, x)
+        for x, y in removed:
+            _direct.remove(x, y)
+            _reverse.remove(y, x)
+
+        _coeffs = _direct.coefficients()
+        _chebyshevR = _reverse.chebyshev()
+        if _coeffs is None or _chebyshevR is None:
+            log.info("incremental fit not stable: full fit")
+            self.fit()
+            return
 
-        log.info("Fitting tooks %s" % _fit_duration)
+        self._poly_coeffs = list(_coeffs)
+        self._polynomial = Polynomial(_coeffs)
+        self._set_reverse_fit(_chebyshevR)
+        self._fitted_points = None
+
+    def set_fitted_nb_points(self, nb_points):
+        """
+        Set the number of fitted points (x_fitted, y_fitted, x_fittedR, y_fittedR)
+        used to plot fits.
+        """
+        if isinstance(nb_points, int) and nb_points > 1:
+            self._fitted_nb_points = nb_points
+            self._fitted_points = None
+        else:
+            log.error("set_fitted_nb_points : <nb_points> must be an integer > 1.")
+
+    def get_fitted_nb_points(self):
+        return self._fitted_nb_points
 
-    def calc_poly_value(self, x):
+    def _compute_fitted_points(self):
+        """
+        Calculate fitted points (direct and reverse) used to plot fits.
+        Called when first needed after a fit or a change of data (see x_fitted ...).
+        """
+        _nb_points = self.get_fitted_nb_points()
+        x_fitted = numpy.linspace(self.Xmin, self.Xmax, _nb_points)
+        x_fittedR = numpy.linspace(self.Ymin, self.Ymax, _nb_points)
+        self._fitted_points = (
+            x_fitted,
+            self.calc_poly_value(x_fitted),
+            x_fittedR,
+            self.calc_reverse_value(x_fittedR),
+        )
+        return self._fitted_points
+
+    def _get_fitted_points(self):
+        if self._fitted_points is None:
+            return self._compute_fitted_points()
+        return self._fitted_points
+
+    @property
+    def x_fitted(self):
+        """X values of the fitted points (direct fit), computed when first needed."""
+        return self._get_fitted_points()[0]
+
+    @property
+    def y_fitted(self):
+        """Y values of the fitted points (direct fit), computed when first needed."""
+        return self._get_fitted_points()[1]
+
+    @property
+    def x_fittedR(self):
+        """Y values of the reverse fitted points, computed when first needed."""
+        return self._get_fitted_points()[2]
+
+    @property
+    def y_fittedR(self):
+        """X values of the reverse fitted points, computed when first needed."""
+        return self._get_fitted_points()[3]
+
+    def calc_poly_value(self, x, out=None):
         """
         x : float or numpy array of floats
+        out : optional numpy array to store the result in (see poly_horner())
 
         Return the Y value(s) for given X value(s) calculated using the polynom coefficients.
         Used for POLY and TABLE (once fitted) calibrations.
         """
-        y = 0
         if self.get_calib_type() == "POLY":
             _order = self.get_calib_order()
         elif self.get_calib_type() == "TABLE":
@@ -912,34 +3073,29 @@ class Xcalibu:
         else:
             print(f"XCALIBU ({self.get_calib_name()}): ERROR in calib type")
 
-        for ii in range(_order + 1):
-            y = y + self._poly_coeffs[ii] * pow(x, ii)
-
-        return y
+        return poly_horner(self._poly_coeffs[: _order + 1], x, out=out)
 
     def calc_reverse_value(self, y):
         """
         Calculate reverse value if possible (ie: monotonic)
 
         TABLE: use reverse interpolation function (ifuncR)
-        POLY: use reverse poly  or reverse interpolation function
+        POLY: use Newton solver, reverse poly or reverse interpolation function
 
         """
-        x = 0
-
         if self.get_calib_type() == "POLY":
-            if (
+            if self.is_monotonic and self.get_poly_reverse_method() == "NEWTON":
+                return self.calc_newton_reverse_value(y)
+            elif (
                 self.get_reconstruction_method() == "INTERPOLATION"
                 and self.is_monotonic
             ):
                 return self.ifuncR(y)
             else:
                 if self.coeffR is not None:
-                    # Calculate with reverse poly.
+                    # Calculate with reverse poly (coeffR are in decreasing degree order).
                     _order = self.get_calib_order()
-                    for ii in range(_order + 1):
-                        x = x + self.coeffR[_order - ii] * pow(y, ii)
-                    return x
+                    return poly_horner(self.coeffR[_order::-1], y)
                 else:
                     print(f"XCALIBU ({self.get_calib_name()}): ERROR: should try alternative method...")
 
@@ -951,10 +3107,11 @@ class Xcalibu:
                 return self.ifuncR(y)
             else:
                 _order = self.get_fit_order()
-                if self.coeffR is not None:
-                    for ii in range(_order + 1):
-                        x = x + self.coeffR[_order - ii] * pow(y, ii)
-                    return x
+                if self._reverse_fit is not None:
+                    # Chebyshev series of the scaled y (stable for large offsets / orders).
+                    return poly_clenshaw(self._reverse_fit[0], y, domain=self._reverse_fit[1])
+                elif self.coeffR is not None:
+                    return poly_horner(self.coeffR[_order::-1], y)
                 else:
                     raise RuntimeError(f"XCALIBU ({self.get_calib_name()}): ERROR: coeffR is None: no reverse poly calculated")
                     print(f"XCALIBU ({self.get_calib_name()}): ERROR: coeffR is None: no reverse poly calculated")
@@ -962,6 +3119,119 @@ class Xcalibu:
         else:
             print(f"XCALIBU ({self.get_calib_name()}): ERROR: calc_reverse_value : ERROR in calib type")
 
+    def calc_newton_reverse_value(self, y, return_iterations=False, max_iterations=100):
+        """
+        Calculate X value(s) of a monotonic POLY calibration for given Y value(s) by
+        solving poly(x) = y with Newton iterations.
+
+        * each value is bracketed by a segment of a table of <sampling nb points>
+          points sampled on [Xmin ; Xmax], and the iterations start from the linear
+          interpolation of the segment.
+        * a Newton step leaving the bracket is replaced by a bisection step.
+        * iterations stop when the step is below machine precision (of x, or of poly(x)
+          evaluation transferred to x by the derivative).
+
+        <y>: float or numpy array of floats
+        Return a float or a numpy array of floats (nan for Y values out of the calibration)
+        If <return_iterations> is True, return also the number of iterations done for each value.
+        """
+        x_seed, y_seed = self._get_reverse_seed()
+        _coeffs = self._poly_coeffs[: self.get_calib_order() + 1]
+        _deriv_coeffs = list(self._polynomial.deriv().coef)
+        _abs_coeffs = numpy.abs(_coeffs)
+        _eps = numpy.finfo(float).eps
+
+        _scalar = not isinstance(y, numpy.ndarray)
+        y = numpy.asarray(y, dtype=float)
+        y_flat = y.ravel()
+
+        x = numpy.full(y_flat.shape, numpy.nan)
+        iterations = numpy.zeros(y_flat.shape, dtype=int)
+
+        # Bracketing segment [x_lo ; x_hi] in the sampled table (y_seed is increasing).
+        valid = (y_flat >= y_seed[0]) & (y_flat <= y_seed[-1])
+        active = numpy.flatnonzero(valid)
+        y_act = y_flat[active]
+        idx = numpy.searchsorted(y_seed, y_act, side="right") - 1
+        idx = idx.clip(0, len(y_seed) - 2)
+
+        x_lo = x_seed[idx]
+        x_hi = x_seed[idx + 1]
+        x_act = x_lo + (y_act - y_seed[idx]) * (x_hi - x_lo) / (y_seed[idx + 1] - y_seed[idx])
+        # sign of poly(x) - y at x_lo: a new bracket bound replaces the bound of same sign.
+        sign_lo = numpy.sign(y_seed[idx] - y_act)
+
+        for ii in range(max_iterations):
+            if len(active) == 0:
+                break
+
+            g = poly_horner(_coeffs, x_act) - y_act
+            d = poly_horner(_deriv_coeffs, x_act)
+
+            same_sign = numpy.sign(g) == sign_lo
+            x_lo = numpy.where(same_sign, x_act, x_lo)
+            x_hi = numpy.where(same_sign, x_hi, x_act)
+
+            with numpy.errstate(divide="ignore", invalid="ignore"):
+                x_new = x_act - g / d
+            outside = ~(
+                (x_new >= numpy.minimum(x_lo, x_hi)) & (x_new <= numpy.maximum(x_lo, x_hi))
+            )
+            x_new[outside] = 0.5 * (x_lo[outside] + x_hi[outside])
+
+            iterations[active] += 1
+            # rounding error bound of poly(x) evaluation, as an error on x.
+            with numpy.errstate(divide="ignore", invalid="ignore"):
+                noise = _eps * poly_horner(_abs_coeffs, numpy.abs(x_act)) / numpy.abs(d)
+            done = (g == 0) | (
+                numpy.abs(x_new - x_act) <= 2 * (_eps * numpy.abs(x_new) + noise)
+            )
+            x_act = numpy.where(g == 0, x_act, x_new)
+
+            x[active[done]] = x_act[done]
+            keep = ~done
+            active = active[keep]
+            y_act, x_act = y_act[keep], x_act[keep]
+            x_lo, x_hi, sign_lo = x_lo[keep], x_hi[keep], sign_lo[keep]
+
+        # Values not converged after <max_iterations>: keep best estimate.
+        x[active] = x_act
+
+        log.debug(
+            "calc_newton_reverse_value(): %d value(s), max iterations=%d",
+            y_flat.size,
+            iterations.max(initial=0),
+        )
+
+        x = x.reshape(y.shape)
+        iterations = iterations.reshape(y.shape)
+        if _scalar:
+            x, iterations = float(x), int(iterations)
+
+        if return_iterations:
+            return x, iterations
+        return x
+
+    def _get_reverse_seed(self):
+        """
+        Return (x, y) table sampled on the POLY calibration and sorted by increasing y,
+        used to bracket and seed NEWTON reverse calculation.
+        Table is re-calculated if coefficients, limits or number of points have changed.
+        """
+        _nb_points = max(self.get_sampling_nb_points(), 2)
+        _key = (self.Xmin, self.Xmax, _nb_points, tuple(self._poly_coeffs))
+
+        if self._reverse_seed is None or self._reverse_seed[0] != _key:
+            if not (numpy.isfinite(self.Xmin) and numpy.isfinite(self.Xmax)):
+                raise XCalibError("X limits are needed to calculate reverse values", self)
+            x_seed = numpy.linspace(self.Xmin, self.Xmax, _nb_points)
+            y_seed = poly_horner(self._poly_coeffs, x_seed)
+            if y_seed[-1] < y_seed[0]:
+                x_seed, y_seed = x_seed[::-1].copy(), y_seed[::-1].copy()
+            self._reverse_seed = (_key, x_seed, y_seed)
+
+        return self._reverse_seed[1], self._reverse_seed[2]
+
     def calc_interpolated_value(self, x):
         """
         Return interpolated Y value
@@ -974,23 +3244,57 @@ class Xcalibu:
         """
         return self.ifuncR(y)
 
-    def save(self):
+    def save(self, fsync=False):
         """
         Saves current calibration into file.
+        Text files named *.gz, *.bz2 or *.xz are compressed with gzip, bzip2 or xz.
+        File is written in a temporary file then renamed: an interrupted save
+        leaves the previous file unchanged. If <fsync> is True, data are flushed
+        to disk before save() returns.
         """
         _file_name = self.get_calib_file_name()
 
         if _file_name is None:
             print(f"XCALIBU ({self.get_calib_name()}): ERROR: unable to save : no calib file defined")
         else:
-            self._save_calib_file()
+            if self._load_pending:
+                self.ensure_loaded()
+            self._save_calib_file(fsync)
+            # Saved file contains journal edits.
+            try:
+                os.remove(_file_name + JOURNAL_SUFFIX)
+            except FileNotFoundError:
+                pass
 
-    def _save_calib_file(self):
+    def _save_calib_file(self, fsync=False):
         _calib_name = self.get_calib_name()
         _file_name = self.get_calib_file_name()
 
+        if self._calib_file_format == "BINARY":
+            self._save_binary_calib_file(fsync)
+            return
+
         log.info("Saving calib %s in file:%s" % (_calib_name, _file_name))
-        _sf = open(_file_name, mode="w+")
+        _module = _COMPRESSION_EXTENSIONS.get(os.path.splitext(_file_name)[1])
+        if _module is None:
+            with atomic_open(_file_name, mode="w", fsync=fsync) as _sf:
+                self._write_calib_text(_sf)
+        else:
+            with atomic_open(_file_name, mode="wb", fsync=fsync) as _raw_file:
+                with _module.open(_raw_file, mode="wt") as _sf:
+                    self._write_calib_text(_sf)
+
+    def _write_calib_text(self, _sf):
+        """
+        Write calibration in text format in file <_sf>.
+        TABLE data are formatted SAVE_CHUNK_POINTS points at a time.
+        """
+        _calib_name = self.get_calib_name()
+        _precision = self.get_save_precision()
+
+        def _fmt(value):
+            return format_numbers([value], _precision)[0]
+
         _sf.write("# XCALIBU CALIBRATION\n\n")
         if _calib_name:
             _sf.write("CALIB_NAME=%s\n" % _calib_name)
@@ -1001,8 +3305,8 @@ class Xcalibu:
         if self.get_calib_description():
             _sf.write("CALIB_DESC=%s\n" % self.get_calib_description())
         if self.get_calib_type() == "POLY":
-            _sf.write("CALIB_XMIN=%f\n" % self.min_x())
-            _sf.write("CALIB_XMAX=%f\n" % self.max_x())
+            _sf.write("CALIB_XMIN=%s\n" % _fmt(self.min_x()))
+            _sf.write("CALIB_XMAX=%s\n" % _fmt(self.max_x()))
             _sf.write("CALIB_ORDER=%d\n" % self.get_calib_order())
         _sf.write("\n")
 
@@ -1017,24 +3321,79 @@ class Xcalibu:
             _xxx = self.get_raw_x()
             _yyy = self.get_raw_y()
 
+            # Numbers of a whole chunk are formatted by a single % operation.
+            if _precision == "ROUND_TRIP":
+                _number = "%s"
+            elif _precision is None:
+                _number = "%f"
+            else:
+                _number = "%%.%dg" % _precision
             if self._calib_file_format == "XCALIBU":
-                for ii in range(_xxx.size):
-                    _sf.write("%s[%f] = %f\n" % (_calib_name, _xxx[ii], _yyy[ii]))
+                _line = "%s[%s] = %s\n" % (_calib_name.replace("%", "%%"), _number, _number)
             else:
-                for ii in range(_xxx.size):
-                    _sf.write("%f %f\n" % (_xxx[ii], _yyy[ii]))
+                _line = "%s %s\n" % (_number, _number)
+
+            for _start in range(0, _xxx.size, SAVE_CHUNK_POINTS):
+                _nb = len(_xxx[_start:_start + SAVE_CHUNK_POINTS])
+                _values = numpy.empty(2 * _nb)
+                _values[0::2] = _xxx[_start:_start + SAVE_CHUNK_POINTS]
+                _values[1::2] = _yyy[_start:_start + SAVE_CHUNK_POINTS]
+                if _precision == "ROUND_TRIP":
+                    _values = format_numbers(_values, _precision)
+                else:
+                    _values = _values.tolist()
+                _sf.write((_line * _nb) % tuple(_values))
 
         elif self.get_calib_type() == "POLY":
-            _sf.write("CALIB_XMIN=%f\n" % self.min_x())
-            _sf.write("CALIB_XMAX=%f\n" % self.max_x())
+            _sf.write("CALIB_XMIN=%s\n" % _fmt(self.min_x()))
+            _sf.write("CALIB_XMAX=%s\n" % _fmt(self.max_x()))
             _sf.write("CALIB_ORDER=%d\n" % self.get_calib_order())
 
             for ii in range(self.get_calib_order() + 1):
-                _sf.write("C%d = %f\n" % (ii, self._poly_coeffs[ii]))
+                _sf.write("C%d = %s\n" % (ii, _fmt(self._poly_coeffs[ii])))
         else:
             print(f"XCALIBU ({self.get_calib_name()}): _save_calib_file ERROR: ???")
 
-        _sf.close()
+    def _save_binary_calib_file(self, fsync=False):
+        """
+        Save TABLE calibration in binary format (see _read_binary_calib()).
+        File is written in a temporary file then renamed: memory-mapped data
+        of the previous file stay valid.
+        """
+        _file_name = self.get_calib_file_name()
+        if self.get_calib_type() != "TABLE":
+            raise XCalibError("binary calibration files are TABLE calibrations only", self)
+
+        log.info("Saving calib %s in binary file:%s" % (self.get_calib_name(), _file_name))
+        _xxx = numpy.ascontiguousarray(self.get_raw_x(), dtype="<f8")
+        _yyy = numpy.ascontiguousarray(self.get_raw_y(), dtype="<f8")
+
+        _lines = [BINARY_CALIB_MAGIC.decode()]
+        if self.get_calib_name():
+            _lines.append("CALIB_NAME=%s" % self.get_calib_name())
+        _lines.append("CALIB_TYPE=TABLE")
+        if self.get_calib_time():
+            _lines.append("CALIB_TIME=%s" % self.get_calib_time())
+        if self.get_calib_description():
+            _lines.append("CALIB_DESC=%s" % self.get_calib_description())
+        _lines.extend(c for c in self._comments if c not in ("# XCALIBU CALIBRATION", BINARY_CALIB_MAGIC.decode()))
+        _lines.append("CALIB_POINTS=%d" % len(_xxx))
+
+        def _align(offset):
+            return -(-offset // BINARY_CALIB_ALIGNMENT) * BINARY_CALIB_ALIGNMENT
+
+        # Offsets are written with a fixed width: header size does not depend on them.
+        _header_size = len("\n".join(_lines + ["CALIB_X_OFFSET=%020d" % 0, "CALIB_Y_OFFSET=%020d" % 0]).encode()) + 2
+        _x_offset = _align(_header_size)
+        _y_offset = _align(_x_offset + _xxx.nbytes)
+        _lines += ["CALIB_X_OFFSET=%020d" % _x_offset, "CALIB_Y_OFFSET=%020d" % _y_offset]
+        _header = ("\n".join(_lines) + "\n").encode()
+
+        with atomic_open(_file_name, mode="wb", fsync=fsync) as _sf:
+            _sf.write(_header.ljust(_x_offset, b"\0"))
+            _xxx.tofile(_sf)
+            _sf.write(b"\0" * (_y_offset - _x_offset - _xxx.nbytes))
+            _yyy.tofile(_sf)
 
     def plot(self, *param, display=True, save=False, file_name=None):
         """
@@ -1043,6 +3402,8 @@ class Xcalibu:
         * saved in pdf files (save=True)
         * plotted (excepte if display=False)
         """
+        if self._load_pending:
+            self.ensure_loaded()
         # Load matplotlib but get rid of matplotlib debug.
         logging.getLogger().setLevel("INFO")
         import matplotlib.pyplot as plt
@@ -1174,6 +3535,8 @@ class Xcalibu:
             print(f"XCALIBU ({self.get_calib_name()}): ERROR: OH OH do not know this calib type :(")
 
     def print_table(self):
+        if self._load_pending:
+            self.ensure_loaded()
         for x, y in zip(self.x_raw, self.y_raw):
             print(x, y)
 
@@ -1182,15 +3545,23 @@ class Xcalibu:
     """
 
     def min_x(self):
+        if self._load_pending and numpy.isnan(self.Xmin):
+            self.ensure_loaded()
         return self.Xmin
 
     def max_x(self):
+        if self._load_pending and numpy.isnan(self.Xmax):
+            self.ensure_loaded()
         return self.Xmax
 
     def min_y(self):
+        if self._load_pending and numpy.isnan(self.Ymin):
+            self.ensure_loaded()
         return self.Ymin
 
     def max_y(self):
+        if self._load_pending and numpy.isnan(self.Ymax):
+            self.ensure_loaded()
         return self.Ymax
 
     """
@@ -1198,27 +3569,33 @@ class Xcalibu:
     """
 
     def dataset_size(self):
+        if self._load_pending:
+            self.ensure_loaded()
         return self._data_lines
 
     def is_in_valid_x_range(self, x):
         """
         x: float
-        Return True if <x> is in calibration boundaries or if there is not boundaries
+        Return True if <x> is in calibration boundaries (+/- range tolerance) or if there is not boundaries
 
         If limits are None AND fill_value is None => return FALSE
         """
+        if self._load_pending:
+            self.ensure_loaded()
         if self.get_calib_type() == "POLY":
             return True
 
+        _tolerance = self.get_range_tolerance()
+
         if self.Xmin is not None:
-            if x < (self.Xmin - 0.00001):
+            if x < (self.Xmin - _tolerance):
                 return False
         else:
             if self.get_interpol_fill_value() is None:
                 return False
 
         if self.Xmax is not None:
-            if x > (self.Xmax + 0.00001):
+            if x > (self.Xmax + _tolerance):
                 return False
         else:
             if self.get_interpol_fill_value() is None:
@@ -1227,43 +3604,308 @@ class Xcalibu:
         return True
 
     def is_in_valid_y_range(self, y):
-        # humm bad : would be better to define Ymin Ymax as bounds of
-        # a monoton portion of the poly...
-        # but how ???
-        if self.get_calib_type() == "POLY":
+        """
+        y: float
+        Return True if <y> is in calibration boundaries (+/- range tolerance).
+        """
+        _ymin, _ymax = self._y_limits()
+        if _ymin is None:
             return True
 
-        if (y < (self.Ymin - 0.00001)) or (y > (self.Ymax + 0.00001)):
+        _tolerance = self.get_range_tolerance()
+
+        if (y < (_ymin - _tolerance)) or (y > (_ymax + _tolerance)):
             log.info("Ymin=%f Ymax=%f" % (self.Ymin, self.Ymax))
             return False
         else:
             return True
 
+    def valid_x_range_mask(self, x_arr, tolerance=None):
+        """
+        x_arr: numpy array of floats
+        tolerance: float: margin allowed outside of [Xmin ; Xmax] (default: range tolerance)
+        Return a numpy array of booleans: True for values in calibration boundaries.
+        Vectorized version of is_in_valid_x_range().
+        """
+        if self._load_pending:
+            self.ensure_loaded()
+        if tolerance is None:
+            tolerance = self.get_range_tolerance()
+
+        valid = numpy.ones(numpy.shape(x_arr), dtype=bool)
+
+        if self.get_calib_type() == "POLY":
+            return valid
+
+        if self.Xmin is not None:
+            valid &= ~(x_arr < (self.Xmin - tolerance))
+        elif self.get_interpol_fill_value() is None:
+            valid[...] = False
+
+        if self.Xmax is not None:
+            valid &= ~(x_arr > (self.Xmax + tolerance))
+        elif self.get_interpol_fill_value() is None:
+            valid[...] = False
+
+        return valid
+
+    def valid_y_range_mask(self, y_arr, tolerance=None):
+        """
+        y_arr: numpy array of floats
+        tolerance: float: margin allowed outside of [Ymin ; Ymax] (default: range tolerance)
+        Return a numpy array of booleans: True for values in calibration boundaries.
+        Vectorized version of is_in_valid_y_range().
+        """
+        if tolerance is None:
+            tolerance = self.get_range_tolerance()
+
+        _ymin, _ymax = self._y_limits()
+        if _ymin is None:
+            return numpy.ones(numpy.shape(y_arr), dtype=bool)
+
+        return ~((y_arr < (_ymin - tolerance)) | (y_arr > (_ymax + tolerance)))
+
+    def _y_limits(self):
+        """
+        Return (min, max) of Y values reachable by the calibration or (None, None) if
+        Y values are not bounded (non monotonic POLY).
+        """
+        if self._load_pending:
+            self.ensure_loaded()
+        if self.get_calib_type() == "POLY":
+            # humm bad : would be better to define Ymin Ymax as bounds of
+            # a monoton portion of the poly...
+            # but how ???
+            if not self.is_monotonic:
+                return None, None
+            return min(self.Ymin, self.Ymax), max(self.Ymin, self.Ymax)
+
+        return self.Ymin, self.Ymax
+
+    def set_range_tolerance(self, tolerance):
+        """
+        Set margin allowed outside of calibration limits before applying out of range policy.
+        <tolerance>: float
+        default : 0.00001
+        """
+        self._range_tolerance = tolerance
+
+    def get_range_tolerance(self):
+        return self._range_tolerance
+
+    def set_out_of_range_policy(self, policy, fill_value=None):
+        """
+        Set what get_y() / get_x() return for values out of calibration limits:
+        * "NAN": nan (default)
+        * "CLIP": value of the nearest limit
+        * "FILL": <fill_value>
+        * "EXTRAPOLATE": linear extrapolation from the nearest limit (slope of the calibration at the limit)
+        * "RAISE": raise an XCalibError giving number and indices of out of range values
+        """
+        if policy not in ["NAN", "CLIP", "FILL", "EXTRAPOLATE", "RAISE"]:
+            raise XCalibError("unknown out of range policy : %s " % policy, self)
+        self._out_of_range_policy = policy
+        self._out_of_range_fill_value = numpy.nan if fill_value is None else fill_value
+
+    def get_out_of_range_policy(self):
+        return self._out_of_range_policy
+
+    def set_preserve_float32(self, preserve):
+        """
+        If <preserve> is True, get_y() / get_x() return float32 results for float32
+        inputs (calculation is still done in float64). Default: False (float64 results).
+        """
+        self._preserve_float32 = bool(preserve)
+
+    def get_preserve_float32(self):
+        return self._preserve_float32
+
+    def _evaluate(self, values, valid, limits, calc, func_name, out=None, shape=None):
+        """
+        Calculate calc(values) for 1D numpy array <values> and apply out of range policy
+        where <valid> is False (single log record per call).
+        <limits>: (min, max) of valid values.
+        <out>: optional 1D numpy array to store the result in ; can be <values> (in place).
+        <shape>: shape of the user input (to report indices of out of range values).
+        """
+        if out is not None and numpy.shares_memory(out, values):
+            values = values.copy()  # values are read after result is (partly) written
+        nb_invalid = valid.size - numpy.count_nonzero(valid)
+
+        if nb_invalid == 0:
+            # No buffer to allocate and copy from if calc() returns a new array.
+            return calc(values, out=out)
+
+        result = numpy.empty(values.shape) if out is None else out
+
+        _policy = self.get_out_of_range_policy()
+        _low, _high = limits
+
+        if _policy == "RAISE":
+            _indices = numpy.flatnonzero(~valid)[:10]
+            if shape is not None and len(shape) > 1:
+                _unravelled = numpy.unravel_index(_indices, shape)
+                _indices = list(zip(*(_idx.tolist() for _idx in _unravelled)))
+            else:
+                _indices = _indices.tolist()
+            raise XCalibError(
+                f"{func_name}: {nb_invalid} value(s) out of range [{_low} ; {_high}] "
+                f"at indices {_indices}{' ...' if nb_invalid > 10 else ''}",
+                self,
+            )
+
+        log.warning(
+            f"XCALIBU ({self.get_calib_name()}): {func_name}: {nb_invalid} value(s) "
+            f"out of range [{_low} ; {_high}] -> {_policy}"
+        )
+
+        if _policy == "CLIP":
+            calc(numpy.clip(values, _low, _high), out=result)
+            return result
+
+        result[~valid] = numpy.nan
+        if nb_invalid < valid.size:
+            result[valid] = calc(values[valid])
+
+        if _policy == "FILL":
+            result[~valid] = self._out_of_range_fill_value
+        elif _policy == "EXTRAPOLATE":
+            _h = 1e-6 * (_high - _low)
+            _ends = numpy.array([_low, _low + _h, _high - _h, _high])
+            f_low, f_low_h, f_high_h, f_high = calc(_ends)
+            below = values < _low
+            above = values > _high
+            if _h > 0:
+                result[below] = f_low + (f_low_h - f_low) / _h * (values[below] - _low)
+                result[above] = f_high + (f_high - f_high_h) / _h * (values[above] - _high)
+            else:
+                result[below] = f_low
+                result[above] = f_high
+
+        return result
+
     """
     Values readout
     """
 
-    def get_y(self, x):
+    def get_y(self, x, out=None):
         """
-        x: int or float or numpy array of floats.
-        Return a float or a numpy array of floats.
+        x: int or float or numpy array of floats (any shape) or buffer-protocol object
+           (array.array, memoryview...) or sequence of numbers (list, tuple).
+        out: optional numpy array or writable buffer of the shape of <x> to store the result in.
+             TypeError is raised for other kinds of <out> (list, read-only buffer...).
+        Return a float or a numpy array of floats of the shape of <x>
+        (a list / tuple / array.array for such a <x>, <out> if given).
         """
-        log.debug("xcalibu - get_y(x) - type of x is: %s" % type(x))
+        log.debug("xcalibu - get_y(x) - type of x is: %s", type(x))
+        if self._watched:
+            return self._snapshot().get_y(x, out)
+        if self._load_pending:
+            self.ensure_loaded()
 
-        if type(x) == numpy.ndarray:
-            return self.get_y_array(x)
-        elif isinstance(x, numbers.Number):  # int float numpy.int* numpy.float*
-            return self.get_y_scalar(x)
-        else:
-            raise TypeError(f"Type of input is invalid: {type(x)}")
+        if isinstance(x, numbers.Number) and out is None:  # int float numpy.int* numpy.float*
+            return self._restore_scalar(x, self.get_y_scalar(float(x)))
 
-    def get_y_array(self, x_arr):
+        return self._evaluate_any(x, out, self.get_y_array)
+
+    def _evaluate_any(self, values, out, array_func):
         """
-        x_arr: numpy array of floats
-        Return a numpy array of floats
+        Evaluate <values> of any accepted kind with <array_func> (get_y_array or get_x_array).
+        Buffers are wrapped without copy, the result is converted back to the container
+        kind of <values> and to float32 for float32 inputs if preserve_float32 is set.
+        """
+        arr, restore = _as_input_array(values)
+
+        if out is not None:
+            array_func(arr, out=out)
+            return out
+
+        result = array_func(arr)
+        if self._preserve_float32 and arr.dtype == numpy.float32:
+            result = result.astype(numpy.float32)
+        if restore is not None:
+            return restore(result)
+        return result
+
+    def _restore_scalar(self, value, result):
+        """
+        Return <result> as a numpy.float32 for a numpy.float32 <value> if preserve_float32 is set.
+        """
+        if self._preserve_float32 and isinstance(value, numpy.float32) and result is not None:
+            return numpy.float32(result)
+        return result
+
+    def get_y_array(self, x_arr, out=None):
+        """
+        x_arr: numpy array of floats (any shape, 0-d included)
+        out: optional numpy array of the shape of <x_arr> to store the result in
+             (a preallocated buffer can then be reused call after call).
+        Return a numpy array of floats of the shape of <x_arr> (<out> if given).
+
+        Whole-array evaluation: range check, dispatch and calculation are
+        done once for all values. Out of range values follow the out of range policy.
+        """
+        if self._watched:
+            return self._snapshot().get_y_array(x_arr, out)
+        if self._load_pending:
+            self.ensure_loaded()
+        x_arr = numpy.asarray(x_arr, dtype=float)
+        return self._evaluate_nd(
+            x_arr, self.valid_x_range_mask, (self.Xmin, self.Xmax), self._calc_y, "get_y", out
+        )
+
+    def _evaluate_nd(self, values, mask_func, limits, calc, func_name, out):
+        """
+        Evaluate numpy array <values> of any shape as a flat array and return the
+        result with the shape of <values> (in <out> if given).
+        """
+        _shape = values.shape
+        _flat = values.reshape(-1)
+
+        _out_flat = None
+        if out is not None:
+            out = _as_output_array(out)
+            if out.shape != _shape:
+                raise ValueError(f"out array shape {out.shape} does not match input shape {_shape}")
+            if out.flags.c_contiguous and out.dtype == numpy.float64:
+                _out_flat = out.reshape(-1)  # view on out
+
+        result = self._evaluate(
+            _flat, mask_func(_flat), limits, calc, func_name, out=_out_flat, shape=_shape
+        )
+
+        if out is None:
+            return result.reshape(_shape)
+        if _out_flat is None:
+            out[...] = result.reshape(_shape)
+        return out
+
+    def _calc_y(self, x, out=None):
+        """
+        x: float or numpy array of floats (already checked to be in valid range)
+        out: optional numpy array to store the result in.
+        Return Y value(s) calculated according to calib type and reconstruction method.
         """
-        y_arr = numpy.array(list(map(self.get_y_scalar, x_arr)))
-        return y_arr
+        if self.get_calib_type() == "TABLE":
+            _rec_method = self.get_reconstruction_method()
+            if _rec_method == "POLYFIT":
+                return self.calc_poly_value(x, out=out)
+            elif _rec_method == "INTERPOLATION":
+                y = self.calc_interpolated_value(x)
+            else:
+                raise XCalibError(
+                    "Unknown or not available reconstruction method : %s" % _rec_method,
+                    self,
+                )
+        elif self.get_calib_type() == "POLY":
+            return self.calc_poly_value(x, out=out)
+        else:
+            raise XCalibError("Unknown calibration type: %s" % self.get_calib_type(), self)
+
+        if out is None:
+            return y
+        out[...] = y
+        return out
 
     def get_y_scalar(self, x):
         """
@@ -1271,88 +3913,274 @@ class Xcalibu:
         Return a float
         """
         # log.debug("xcalibu - %s - get y of %f" % (self.get_calib_name(), x))
+        if self._watched:
+            return self._snapshot().get_y_scalar(x)
+        if self._load_pending:
+            self.ensure_loaded()
 
         if self.is_in_valid_x_range(x):
-            if self.get_calib_type() == "TABLE":
-                _rec_method = self.get_reconstruction_method()
-                if _rec_method == "POLYFIT":
-                    y = self.calc_poly_value(x)
-                elif _rec_method == "INTERPOLATION":
-                    y = self.calc_interpolated_value(x)
-                else:
-                    log.error(
-                        "Unknown or not available reconstruction method : %s"
-                        % _rec_method
-                    )
-            elif self.get_calib_type() == "POLY":
-                y = self.calc_poly_value(x)
-            else:
-                log.error("Unknown calibration type: %s" % self.get_calib_type())
-
-            log.debug(f"y={y}")
+            y = self._calc_y(x)
+            log.debug("y=%s", y)
             return y
 
-        else:
-            print(f"XCALIBU ({self.get_calib_name()}): Warning:get_y_scalar({x}) -> nan")
-            return numpy.nan
-#        else:
-#            log.error(
-#                f"xcalibu - Error : x={x} is not in valid range for calibration {self.get_calib_name()}"
-#            )
-#
-#            raise XCalibError(
-#                "X value %g is out of limits [%g;%g]" % (x, self.Xmin, self.Xmax), self
-#            )
+        return float(self.get_y_array(numpy.array([x]))[0])
 
     """
     Reciprocal calibration
     """
-    def get_x(self, y):
+    def get_x(self, y, out=None):
         """
-        y: int or float or numpy array of floats.
-        Return a float or a numpy array of floats.
+        y: int or float or numpy array of floats (any shape) or buffer-protocol object
+           or sequence of numbers (see get_y()).
+        out: optional numpy array or writable buffer of the shape of <y> to store the result in.
+             TypeError is raised for other kinds of <out> (list, read-only buffer...).
+        Return a float or a numpy array of floats of the shape of <y>
+        (a list / tuple / array.array for such a <y>, <out> if given).
         """
-        log.debug("xcalibu - get_x(y) - type of y is: %s" % type(y))
+        log.debug("xcalibu - get_x(y) - type of y is: %s", type(y))
+        if self._watched:
+            return self._snapshot().get_x(y, out)
+        if self._load_pending:
+            self.ensure_loaded()
 
-        if type(y) == numpy.ndarray:
-            return self.get_x_array(y)
-        elif isinstance(
-            y, numbers.Number
-        ):  # test ok for : int float numpy.int* numpy.float*
-            return self.get_x_scalar(y)
-        else:
-            raise TypeError(f"Type of input is invalid: {type(y)}")
+        if isinstance(y, numbers.Number) and out is None:  # int float numpy.int* numpy.float*
+            return self._restore_scalar(y, self.get_x_scalar(float(y)))
 
-    def get_x_array(self, y_arr):
+        return self._evaluate_any(y, out, self.get_x_array)
+
+    def get_x_array(self, y_arr, out=None):
         """
-        y_arr: numpy array of floats
-        Return a numpy array of floats
+        y_arr: numpy array of floats (any shape, 0-d included)
+        out: optional numpy array of the shape of <y_arr> to store the result in.
+        Return a numpy array of floats of the shape of <y_arr> (<out> if given).
+
+        Whole-array evaluation (see get_y_array()).
+        """
+        if self._watched:
+            return self._snapshot().get_x_array(y_arr, out)
+        if self._load_pending:
+            self.ensure_loaded()
+        y_arr = numpy.asarray(y_arr, dtype=float)
+        return self._evaluate_nd(
+            y_arr, self.valid_y_range_mask, self._y_limits(), self._calc_x, "get_x", out
+        )
+
+    def _calc_x(self, y, out=None):
         """
-        x_arr = numpy.array(list(map(self.get_x_scalar, y_arr)))
-        return x_arr
+        Reverse calculation returning nan (instead of None) if not possible.
+        """
+        x = self.calc_reverse_value(y)
+        if x is None:
+            x = numpy.nan
+        if out is None:
+            return x
+        out[...] = x
+        return out
 
     def get_x_scalar(self, y):
         """
         <y>: float or int
         Return a float
         """
-        log.debug("xcalibu - %s - get x of %f" % (self.get_calib_name(), y))
+        log.debug("xcalibu - %s - get x of %f", self.get_calib_name(), y)
+        if self._watched:
+            return self._snapshot().get_x_scalar(y)
+        if self._load_pending:
+            self.ensure_loaded()
 
         # Check validity range
         if self.is_in_valid_y_range(y):
             x = self.calc_reverse_value(y)
-            log.debug(f"x={x}")
+            log.debug("x=%s", x)
             return x
-#        else:
-#            # raise XCalibError("YValue out of limits [%g;%g]"%(self.Ymin,self.Ymax), self)
-#            log.error(
-#                f"xcalibu - Error : y={y} is not in valid range for this R calibration ({self.get_calib_name()})"
-#            )
-#            return -1
-        else:
-            print(f"XCALIBU ({self.get_calib_name()}): Warning:get_x_scalar({y}) -> nan")
-            return numpy.nan
 
+        return float(self.get_x_array(numpy.array([y]))[0])
+
+    """
+    Journal of edits
+    """
+
+    def set_journal(self, enabled, max_size=None):
+        """
+        Enable / disable journal of edits: insert() and delete() are appended
+        to <calib file name>.journal instead of requiring a save() of the whole file.
+        Journal is replayed when the calibration file is loaded and compacted
+        (calibration saved, journal removed) by compact_journal() or when
+        its size exceeds <max_size> bytes (default: JOURNAL_MAX_SIZE).
+        Compaction saves numbers with "ROUND_TRIP" precision (see set_save_precision()):
+        values of the journal (and of the file) are kept exactly.
+        """
+        self._journal = bool(enabled)
+        self._journal_max_size = JOURNAL_MAX_SIZE if max_size is None else max_size
+
+    def get_journal(self):
+        return self._journal
+
+    def get_journal_file_name(self):
+        _file_name = self.get_calib_file_name()
+        return None if _file_name is None else _file_name + JOURNAL_SUFFIX
+
+    def compact_journal(self):
+        """
+        Save calibration (including journal edits) with "ROUND_TRIP" precision,
+        whatever the save precision, and remove journal.
+        """
+        _journal_file_name = self.get_journal_file_name()
+        if _journal_file_name is not None and os.path.exists(_journal_file_name):
+            log.info(f"compacting journal {_journal_file_name}")
+            _precision = self._save_precision
+            self._save_precision = "ROUND_TRIP"
+            try:
+                self.save()
+            finally:
+                self._save_precision = _precision
+
+    def _append_to_journal(self, operation, x_values, y_values):
+        """
+        Append <operation> ("INSERT" or "DELETE") of points (<x_values>, <y_values>)
+        to journal ("-" for a None value).
+        """
+        if not self._journal or self._replaying_journal:
+            return
+        _journal_file_name = self.get_journal_file_name()
+        if _journal_file_name is None:
+            raise XCalibError("unable to journal edits : no calib file defined", self)
+
+        def _fmt(value):
+            return "-" if value is None else repr(float(value))
+
+        _lines = "".join(
+            f"{operation} {_fmt(x)} {_fmt(y)}\n" for x, y in zip(x_values, y_values)
+        )
+        with open(_journal_file_name, mode="a") as _journal_file:
+            _journal_file.write(_lines)
+            _size = _journal_file.tell()
+
+        if self._journal_max_size is not None and _size > self._journal_max_size:
+            self.compact_journal()
+
+    def _replay_journal(self):
+        """
+        Apply edits of the journal of the calibration file (if any) to loaded data.
+        Return True if edits have been applied.
+        """
+        try:
+            with open(self.get_journal_file_name()) as _journal_file:
+                _lines = _journal_file.read().splitlines()
+        except FileNotFoundError:
+            return False
+
+        def _value(field):
+            return None if field == "-" else float(field)
+
+        self._replaying_journal = True
+        try:
+            for _line_nb, _line in enumerate(_lines, 1):
+                try:
+                    operation, x, y = _line.split()
+                    if operation == "INSERT":
+                        self.insert(_value(x), _value(y))
+                    elif operation == "DELETE":
+                        self.delete(_value(x), _value(y))
+                    else:
+                        raise ValueError(f"unknown operation {operation}")
+                except (ValueError, XCalibError) as err:
+                    log.error(f"{self.get_journal_file_name()} line {_line_nb} ignored ({_line}): {err}")
+        finally:
+            self._replaying_journal = False
+
+        log.info(f"{len(_lines)} journal edits replayed")
+        return True
+
+    """
+    Hot reload
+    """
+
+    def reload(self):
+        """
+        Load calibration file again and swap new data, fit and interpolators in at once
+        (replacement of the attributes dict): get_y() / get_x() calls in progress end
+        with the previous state, without waiting for the reload.
+        Return True if reloaded ; on error, the previous state is kept.
+        """
+        with self._load_lock:
+            state = dict(self.__dict__)
+            state.update(
+                x_raw=None, y_raw=None, _comments=[], _data_lines=0, _reverse_seed=None,
+                _load_pending=False, _header_only=False,
+            )
+            calib = object.__new__(Xcalibu)
+            calib.__dict__ = state
+            try:
+                calib.load_calib()
+                if calib.get_calib_type() == "TABLE" and calib.dataset_size() == 0:
+                    raise XCalibError("no data line read", calib)
+                calib.check_monotonic()
+                calib.compute_interpolation()
+            except Exception as err:
+                log.error(f"reload of {self.get_calib_file_name()} failed, calibration not changed: {err}")
+                return False
+
+            self.__dict__ = state
+        log.info(f"{self.get_calib_file_name()} reloaded")
+        return True
+
+    def watch(self, interval=1.0):
+        """
+        Watch calibration file (and its journal) in a background thread: calibration
+        is reloaded (see reload()) once a modification of the file is finished (same
+        modification time and size for <interval> seconds).
+        get_y() / get_x() are then evaluated on a snapshot of the state: a reload never
+        gives them a partially updated calibration.
+        """
+        if self.get_calib_file_name() is None:
+            raise XCalibError("unable to watch calibration : no calib file defined", self)
+        self.unwatch()
+        with self._load_lock:
+            stop = threading.Event()
+            thread = threading.Thread(
+                target=_watch_calib_file,
+                args=(weakref.ref(self), self._file_signature(), stop, interval),
+                name=f"xcalibu watcher {self.get_calib_name()}",
+                daemon=True,
+            )
+            self._watcher = (thread, stop)
+            self._watched = True
+            thread.start()
+
+    def unwatch(self):
+        """
+        Stop watching calibration file.
+        """
+        with self._load_lock:
+            if self._watcher is not None:
+                self._watcher[1].set()
+            self._watcher = None
+            self._watched = False
+
+    def is_watched(self):
+        return self._watched
+
+    def _file_signature(self):
+        """
+        Return (mtime, size) of calib file and of its journal (None if missing).
+        """
+        signature = []
+        for file_name in (self.get_calib_file_name(), self.get_journal_file_name()):
+            try:
+                _stat = os.stat(file_name)
+                signature.append((_stat.st_mtime_ns, _stat.st_size))
+            except (OSError, TypeError):
+                signature.append(None)
+        return tuple(signature)
+
+    def _snapshot(self):
+        """
+        Return an object evaluating with the current attributes dict of the calibration.
+        """
+        snapshot = object.__new__(_XcalibuSnapshot)
+        snapshot.__dict__ = self.__dict__
+        return snapshot
 
     def delete(self, x=None, y=None):
         """
@@ -1360,6 +4188,8 @@ class Xcalibu:
         """
         if x is None and y is None:
             return
+        if self._load_pending:
+            self.ensure_loaded()
 
         criteria = numpy.full(len(self.x_raw), True)
         if x is not None:
@@ -1388,10 +4218,14 @@ class Xcalibu:
             f"xcalibu - {self.get_calib_name()} - delete point ({self.x_raw[index]}, {self.y_raw[index]})"
         )
 
+        _removed = list(zip(numpy.atleast_1d(self.x_raw[index]), numpy.atleast_1d(self.y_raw[index])))
         self.x_raw = numpy.delete(self.x_raw, index)
         self.y_raw = numpy.delete(self.y_raw, index)
 
         self._update_min_max_len()
+        self._update_fit(removed=_removed)
+
+        self._append_to_journal("DELETE", [x], [y])
 
     def insert(self, x, y):
         """
@@ -1401,6 +4235,8 @@ class Xcalibu:
         """
         if self._calib_type != "TABLE":
             raise TypeError("Xcalibu: calibration must be of TABLE type")
+        if self._load_pending:
+            self.ensure_loaded()
 
         x = numpy.atleast_1d(x)
         y = numpy.atleast_1d(y)
@@ -1412,16 +4248,56 @@ class Xcalibu:
         self.y_raw = numpy.insert(self.y_raw, index, y)
 
         self._update_min_max_len()
+        self._update_fit(added=zip(x, y))
 
-        log.debug(f"xcalibu - {self.get_calib_name()} - insert point ({x}, {y})")
+        log.debug("xcalibu - %s - insert point (%s, %s)", self.get_calib_name(), x, y)
+
+        self._append_to_journal("INSERT", x, y)
 
     def _update_min_max_len(self):
         self._data_lines = self.nb_calib_points = len(self.x_raw)
+        self._order_fits = {}  # raw data changed
+        self._fitted_points = None
 
         self.Xmin = self.x_raw[0]  # x_raw is sorted
         self.Xmax = self.x_raw[-1]
-        self.Ymin = min(self.y_raw)
-        self.Ymax = max(self.y_raw)
+        self.Ymin = self.y_raw.min()
+        self.Ymax = self.y_raw.max()
+
+
+class _XcalibuSnapshot(Xcalibu):
+    """
+    Xcalibu sharing the attributes dict of a watched calibration at the time of
+    a call (see Xcalibu._snapshot()): a reload replacing the dict is not seen.
+    """
+
+    # Class property: has priority over the (shared) "_watched" attribute.
+    _watched = property(lambda self: False)
+
+
+def _watch_calib_file(calib_ref, loaded, stop, interval):
+    """
+    Poll the calib file of the weakly referenced calibration every <interval> seconds
+    until <stop> is set or the calibration is deleted, and reload it when modified
+    (signature different from <loaded>).
+    """
+    changed = None
+
+    while not stop.wait(interval):
+        calib = calib_ref()
+        if calib is None:
+            return
+        signature = calib._file_signature()
+        if signature == loaded:
+            changed = None
+        elif signature != changed:
+            # Modification in progress: wait for a stable file.
+            changed = signature
+        else:
+            calib.reload()
+            loaded = signature
+            changed = None
+        del calib
 
 
 def main():
@@ -1453,9 +4329,8 @@ def main():
         "-f",
         "--fit_order",
         dest="fit_order",
-        type=int,
-        default=3,
-        help="Fit order for data fitting",
+        default="3",
+        help="Fit order for data fitting (AUTO: selected by cross-validation)",
     )
 
     parser.add_option(
@@ -1512,6 +4387,22 @@ def main():
         help="Type of calibration: TABLE or POLYNOM",
     )
 
+    parser.add_option(
+        "--pack",
+        dest="pack",
+        type="string",
+        default=None,
+        help="Pack calibration files given as arguments in bundle file PACK",
+    )
+
+    parser.add_option(
+        "--extract",
+        dest="extract",
+        type="string",
+        default=None,
+        help="Extract calibrations of bundle file EXTRACT in directory given as argument (default: .)",
+    )
+
     # Gather options and arguments.
     (options, args) = parser.parse_args()
 
@@ -1535,7 +4426,13 @@ def main():
     )
     logging.basicConfig(format=LOG_FORMAT, level=loglevel)
 
-    if len(args) == 0:
+    if options.pack is not None:
+        bundle = CalibBundle.pack(options.pack, args)
+        print(f"{len(bundle)} calibrations packed in {options.pack}: {', '.join(bundle.names())}")
+    elif options.extract is not None:
+        file_names = CalibBundle(options.extract).extract(args[0] if args else ".")
+        print(f"{len(file_names)} calibrations extracted: {', '.join(file_names)}")
+    elif len(args) == 0:
         parser.print_help()
         print("")
         print("Argument:")
@@ -1563,7 +4460,7 @@ def main():
                 calib_type=options.type,
                 calib_name=options.name,
                 calib_file_name=file_name,
-                fit_order=options.fit_order,
+                fit_order=int(options.fit_order) if options.fit_order.isdigit() else options.fit_order,
                 reconstruction_method=options.reconstruction_method,
                 interpol_kind=options.kind_interpol,
                 samp_nbp=options.sampnbp,